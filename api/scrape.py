@@ -11,9 +11,13 @@ from homeharvest import (
     get_wholesale_friendly_agents,
     analyze_agent_specialization,
     rank_by_investment_potential,
-    get_contact_export
+    get_contact_export,
+    score_agent_frustration,
+    ScrapeStats,
+    MarketStatsCube
 )
 from datetime import datetime
+import time
 import traceback
 import pandas as pd
 
@@ -55,6 +59,8 @@ class Handler(BaseHTTPRequestHandler):
                 self.send_error(400, "Location (ZIP code or city) is required")
                 return
 
+            stats = ScrapeStats()
+
             print(f"[AgentRadar Elite] Scraping location: {zip_code}")
             print(f"[AgentRadar Elite] Preset: {preset}")
             if price_min or price_max:
@@ -105,7 +111,7 @@ class Handler(BaseHTTPRequestHandler):
             print(f"[AgentRadar Elite] Fetching properties...")
             print(f"[AgentRadar Elite] Scrape params: {scrape_params}")
             try:
-                properties = scrape_property(**scrape_params)
+                properties = scrape_property(**scrape_params, stats=stats)
                 print(f"[AgentRadar Elite] Scrape successful, got {len(properties)} properties")
             except Exception as scrape_error:
                 print(f"[AgentRadar Elite] Scrape error: {str(scrape_error)}")
@@ -122,6 +128,7 @@ class Handler(BaseHTTPRequestHandler):
                     'total_properties': 0,
                     'agents': [],
                     'market_stats': {},
+                    'stats': stats.summary(),
                     'scraped_at': datetime.now().isoformat()
                 }).encode())
                 return
@@ -151,15 +158,17 @@ class Handler(BaseHTTPRequestHandler):
             try:
                 # First get all agents to debug
                 from homeharvest.agent_broker import get_agent_activity
-                all_agents = get_agent_activity(properties)
+                with stats.span("get_agent_activity"):
+                    all_agents = get_agent_activity(properties)
                 print(f"[AgentRadar Elite] All agents before filtering: {len(all_agents)}")
                 if not all_agents.empty:
                     print(f"[AgentRadar Elite] Sample agents: {all_agents[['agent_name', 'listing_count', 'agent_email', 'primary_phone']].head(3).to_dict('records')}")
 
-                wholesale_agents = get_wholesale_friendly_agents(
-                    properties,
-                    min_listings=min_listings
-                )
+                with stats.span("get_wholesale_friendly_agents"):
+                    wholesale_agents = get_wholesale_friendly_agents(
+                        properties,
+                        min_listings=min_listings
+                    )
                 print(f"[AgentRadar Elite] Found {len(wholesale_agents)} wholesale agents after filtering")
                 if wholesale_agents.empty:
                     print(f"[AgentRadar Elite] DEBUG - wholesale_agents is empty!")
@@ -172,15 +181,22 @@ class Handler(BaseHTTPRequestHandler):
 
             # Get agent specialization
             try:
-                specialization = analyze_agent_specialization(properties)
+                with stats.span("analyze_agent_specialization"):
+                    specialization = analyze_agent_specialization(properties)
                 print(f"[AgentRadar Elite] Specialization analysis complete")
             except Exception as spec_error:
                 print(f"[AgentRadar Elite] Specialization error: {str(spec_error)}")
                 raise
 
+            # Stale-listing frustration scores
+            with stats.span("score_agent_frustration"):
+                frustration = score_agent_frustration(properties)
+            frustration = frustration.set_index('agent_name') if not frustration.empty else frustration
+
             # Rank properties by investment potential
             try:
-                ranked_props = rank_by_investment_potential(properties)
+                with stats.span("rank_by_investment_potential"):
+                    ranked_props = rank_by_investment_potential(properties)
                 print(f"[AgentRadar Elite] Property ranking complete")
             except Exception as rank_error:
                 print(f"[AgentRadar Elite] Ranking error: {str(rank_error)}")
@@ -188,6 +204,7 @@ class Handler(BaseHTTPRequestHandler):
 
             # Build agent data with ALL the details
             agents_list = []
+            build_started = time.perf_counter()
 
             for idx, agent in wholesale_agents.iterrows():
                 try:
@@ -199,6 +216,13 @@ class Handler(BaseHTTPRequestHandler):
                     # Get specialization data
                     spec = specialization[specialization['agent_name'] == agent_name]
 
+                    # Get frustration data
+                    agent_frustration = (
+                        frustration.loc[agent_name]
+                        if not frustration.empty and agent_name in frustration.index
+                        else None
+                    )
+
                     # Build listings array
                     listings = []
                     for _, prop in agent_props.iterrows():
@@ -326,6 +350,11 @@ class Handler(BaseHTTPRequestHandler):
                         # Days on market
                         'avg_days_on_market': float(agent_props['days_on_mls'].mean()) if 'days_on_mls' in agent_props.columns and not agent_props['days_on_mls'].isna().all() else None,
 
+                        # Stale listings
+                        'stale_count': int(agent_frustration['stale_count']) if agent_frustration is not None else 0,
+                        'price_cut_listings': int(agent_frustration['price_cut_listings']) if agent_frustration is not None else 0,
+                        'frustration_score': float(agent_frustration['frustration_score']) if agent_frustration is not None else 0.0,
+
                         # Listings
                         'listings': listings
                     }
@@ -338,20 +367,26 @@ class Handler(BaseHTTPRequestHandler):
                     traceback.print_exc()
                     continue
 
+            stats.record("build_agent_payload", time.perf_counter() - build_started)
             print(f"[AgentRadar Elite] Found {len(agents_list)} wholesale-friendly agents")
 
-            # Calculate market statistics
+            # Market statistics of the returned listings only (a cube per request: no state
+            # carried over from earlier requests with other filters)
+            with stats.span("market_stats"):
+                area_stats = MarketStatsCube().update(properties).stats()
             market_stats = {
                 'total_properties': len(properties),
-                'avg_price': float(properties['list_price'].mean()) if 'list_price' in properties.columns else None,
-                'median_price': float(properties['list_price'].median()) if 'list_price' in properties.columns else None,
-                'avg_price_per_sqft': float(properties['price_per_sqft'].mean()) if 'price_per_sqft' in properties.columns else None,
-                'avg_days_on_market': float(properties['days_on_mls'].mean()) if 'days_on_mls' in properties.columns and not properties['days_on_mls'].isna().all() else None,
+                'avg_price': area_stats['avg_price'],
+                'median_price': area_stats['median_price'],
+                'avg_price_per_sqft': area_stats['avg_price_per_sqft'],
+                'avg_days_on_market': area_stats['avg_days_on_market'],
                 'total_agents': len(agents_list),
                 'avg_wholesale_score': float(sum(a['wholesale_score'] for a in agents_list) / len(agents_list)) if agents_list else 0,
                 'high_potential_agents': len([a for a in agents_list if a['wholesale_score'] >= 70])
             }
 
+            print(f"[AgentRadar Elite] Timings: {stats.summary()}")
+
             # Send response
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
@@ -364,6 +399,7 @@ class Handler(BaseHTTPRequestHandler):
                 'preset': preset,
                 'agents': agents_list,
                 'market_stats': market_stats,
+                'stats': stats.summary(),
                 'scraped_at': datetime.now().isoformat()
             }
 
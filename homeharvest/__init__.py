@@ -8,32 +8,52 @@ from .utils import (
     validate_tag_filters, convert_to_datetime_string, extract_timedelta_hours, extract_timedelta_days, detect_precision_and_convert
 )
 from .core.scrapers.realtor import RealtorScraper
+from .core.scrapers.realtor.compact import CompactProperties, HEAVY_FIELDS
 from .core.scrapers.models import ListingType, SearchPropertyType, ReturnType, Property
+from .instrumentation import ScrapeStats, register_metrics_hook, unregister_metrics_hook
+from .dates import parse_datetime, parse_naive_datetime, parse_utc_datetime, parse_datetime_series, format_datetime
 from .tag_utils import (
     discover_tags, normalize_tags, get_tag_category, get_tags_by_category,
-    fuzzy_match_tag, expand_tag_search, get_all_categories, get_category_info,
+    fuzzy_match_tag, expand_tag_search, get_all_categories, get_category_info, add_known_tags,
     TAG_CATEGORIES, TAG_ALIASES
 )
+from .tag_index import TagIndex, TagQuery, TAG_INDEX
+from .tag_stats import TagStats, CountMinSketch
+from .change_tracker import ChangeTracker, EVENT_KINDS, PRICE_CHANGE, STATUS_CHANGE, RELISTED
+from .market_stats import MarketStatsCube, MarketCell, QuantileSketch, week_of
 from .presets import (
     get_available_presets, get_preset_info, get_all_presets_info,
-    apply_preset, combine_presets, list_presets_by_category,
-    FILTER_PRESETS
+    apply_preset, combine_presets, list_presets_by_category, compile_presets,
+    CompiledPreset, FILTER_PRESETS, PRESET_FIELDS
 )
+from .preset_views import PresetViews, scrape_presets
 from .data_cleaning import (
     clean_dataframe, validate_property_data, get_data_quality_report,
     clean_price, clean_sqft, clean_beds_baths, clean_year, clean_tags
 )
 from .sorting import (
-    sort_properties, get_best_deals, get_newest_listings, get_recently_updated,
+    sort_properties, get_best_deals, get_newest_listings, get_recently_updated, get_price_drops,
     rank_by_investment_potential, create_custom_score, get_available_sort_fields,
-    SORTABLE_FIELDS
+    investment_score_params, compute_investment_score, SORTABLE_FIELDS
+)
+from .scoring import (
+    compute_score, score_components, eval_score, rank_by_score,
+    INVESTMENT_SCORE_SPEC, WHOLESALE_SCORE_SPEC, TRANSFORMS, NUMEXPR_AVAILABLE
+)
+from .chunked import (
+    iter_chunks, map_chunks, clean_chunks, investment_params, score_chunks,
+    rank_by_investment_potential_chunked, write_chunks
 )
 from .agent_broker import (
     get_agent_activity, get_broker_activity, get_office_activity,
     find_most_active_agents, find_properties_by_agent, find_properties_by_broker,
     get_contact_export, analyze_agent_specialization, get_wholesale_friendly_agents,
-    filter_by_agent_contact, format_contact_info, extract_phone_numbers
+    filter_by_agent_contact, format_contact_info, extract_phone_numbers,
+    extract_primary_phones, normalize_phones, normalize_contacts, count_price_cuts, score_agent_frustration,
+    categorize_prices, STALE_DAYS
 )
+from .agent_index import AgentIndex
+from .spatial_index import SpatialIndex, haversine_miles, local_comps, record_comps
 from typing import Union, Optional, List, Dict
 
 def scrape_property(
@@ -101,7 +121,19 @@ def scrape_property(
     require_agent_phone: bool = False,
     # Pagination control
     parallel: bool = True,
-) -> Union[pd.DataFrame, list[dict], list[Property]]:
+    exhaustive: bool = False,
+    # Transport
+    max_workers: int = 10,
+    http2: bool = False,
+    # Compact results
+    compact: bool = False,
+    drop_fields: Optional[List[str]] = None,
+    # Instrumentation
+    stats: ScrapeStats = None,
+    return_stats: bool = False,
+    # Local comps
+    spatial_index: SpatialIndex = None,
+) -> Union[pd.DataFrame, list[dict], list[Property], tuple]:
     """
     Scrape properties from Realtor.com based on a given location and listing type.
 
@@ -179,79 +211,44 @@ def scrape_property(
     :param parallel: Controls pagination strategy. True (default) = fetch all pages in parallel for maximum speed.
         False = fetch pages sequentially with early termination checks (useful for rate limiting or narrow time windows).
         Sequential mode will stop paginating as soon as time-based filters indicate no more matches are possible.
+    :param exhaustive: If True, fetch every matching listing past the 10,000 result cap. The search is split into
+        date windows, price bands and property types until each part fits under the cap; the parts are fetched
+        concurrently and deduplicated by property_id. limit and offset are ignored. Listings without a list price
+        may be missed when a price split is needed. Default is False.
+    :param max_workers: Maximum number of pages fetched concurrently in parallel mode. The shared connection pool
+        is sized to match, so workers never wait on or discard pooled connections. Default is 10.
+    :param http2: If True and httpx with HTTP/2 support is installed (pip install "httpx[http2]"), multiplex
+        requests over a single HTTP/2 connection. Falls back to HTTP/1.1 keep-alive otherwise.
+    :param compact: If True, agents, offices, brokers and builders are shared by id across the returned properties
+        (treat them as read-only), repeated strings are interned and the heavy fields in drop_fields are left empty.
+        Cuts the memory of large return_type="pydantic" results severalfold. Default is False.
+    :param drop_fields: Fields left empty in compact mode, any of HEAVY_FIELDS and "property_history",
+        e.g. ["photos", "alt_photos", "tax_history"]. Defaults to HEAVY_FIELDS; pass [] to keep every field and
+        only share the advertiser records. Shared agents and offices keep the contact details of the first
+        listing seen with their id and MLS set.
+    :param stats: Optional ScrapeStats to record stage timings and request counters into (e.g. one shared across
+        several scrapes, or one carrying metric hooks). A new one is created when omitted.
+    :param return_stats: If True, return a (results, ScrapeStats) tuple instead of just the results.
+    :param spatial_index: Optional SpatialIndex for comps (radius) searches with return_type="pandas". A search
+        whose area a previous scrape into the same index already covered is answered locally, without network
+        calls; otherwise the results are added to the index and the area is recorded as covered.
 
     Note: past_days and past_hours also accept timedelta objects for more Pythonic usage.
     """
-    # Apply preset if specified
-    preset_params = {}
+    # Apply preset if specified: preset values fill in any filter not passed explicitly
+    compiled_preset = None
     if preset:
-        preset_params = apply_preset(preset)
-
-        # Apply preset parameters if not explicitly overridden
-        # Build a dictionary of all explicit parameters
-        explicit_params = {
-            k: v for k, v in locals().items()
-            if v is not None and k not in ['location', 'listing_type', 'return_type', 'preset', 'preset_params']
-        }
-
-        # For each preset parameter, use it if not explicitly provided
-        for param_name, param_value in preset_params.items():
-            if param_name not in explicit_params:
-                locals()[param_name] = param_value
-
-        # Update the local variables with preset values
-        if 'property_type' in preset_params and property_type is None:
-            property_type = preset_params['property_type']
-        if 'beds_min' in preset_params and beds_min is None:
-            beds_min = preset_params['beds_min']
-        if 'beds_max' in preset_params and beds_max is None:
-            beds_max = preset_params['beds_max']
-        if 'baths_min' in preset_params and baths_min is None:
-            baths_min = preset_params['baths_min']
-        if 'baths_max' in preset_params and baths_max is None:
-            baths_max = preset_params['baths_max']
-        if 'sqft_min' in preset_params and sqft_min is None:
-            sqft_min = preset_params['sqft_min']
-        if 'sqft_max' in preset_params and sqft_max is None:
-            sqft_max = preset_params['sqft_max']
-        if 'price_min' in preset_params and price_min is None:
-            price_min = preset_params['price_min']
-        if 'price_max' in preset_params and price_max is None:
-            price_max = preset_params['price_max']
-        if 'lot_sqft_min' in preset_params and lot_sqft_min is None:
-            lot_sqft_min = preset_params['lot_sqft_min']
-        if 'lot_sqft_max' in preset_params and lot_sqft_max is None:
-            lot_sqft_max = preset_params['lot_sqft_max']
-        if 'year_built_min' in preset_params and year_built_min is None:
-            year_built_min = preset_params['year_built_min']
-        if 'year_built_max' in preset_params and year_built_max is None:
-            year_built_max = preset_params['year_built_max']
-        if 'hoa_fee_min' in preset_params and hoa_fee_min is None:
-            hoa_fee_min = preset_params['hoa_fee_min']
-        if 'hoa_fee_max' in preset_params and hoa_fee_max is None:
-            hoa_fee_max = preset_params['hoa_fee_max']
-        if 'stories_min' in preset_params and stories_min is None:
-            stories_min = preset_params['stories_min']
-        if 'stories_max' in preset_params and stories_max is None:
-            stories_max = preset_params['stories_max']
-        if 'garage_spaces_min' in preset_params and garage_spaces_min is None:
-            garage_spaces_min = preset_params['garage_spaces_min']
-        if 'garage_spaces_max' in preset_params and garage_spaces_max is None:
-            garage_spaces_max = preset_params['garage_spaces_max']
-        if 'has_pool' in preset_params and has_pool is None:
-            has_pool = preset_params['has_pool']
-        if 'has_garage' in preset_params and has_garage is None:
-            has_garage = preset_params['has_garage']
-        if 'waterfront' in preset_params and waterfront is None:
-            waterfront = preset_params['waterfront']
-        if 'has_view' in preset_params and has_view is None:
-            has_view = preset_params['has_view']
-        if 'tag_filters' in preset_params and tag_filters is None:
-            tag_filters = preset_params['tag_filters']
-        if 'tag_match_type' in preset_params and tag_match_type == "any":  # Only override if default
-            tag_match_type = preset_params['tag_match_type']
-        if 'tag_exclude' in preset_params and tag_exclude is None:
-            tag_exclude = preset_params['tag_exclude']
+        compiled_preset = compile_presets(preset)
+        arguments = locals()
+        merged = compiled_preset.merge({name: arguments[name] for name in PRESET_FIELDS})
+        (
+            property_type,
+            beds_min, beds_max, baths_min, baths_max, sqft_min, sqft_max,
+            price_min, price_max, lot_sqft_min, lot_sqft_max, year_built_min, year_built_max,
+            tag_filters, tag_match_type, tag_exclude,
+            hoa_fee_min, hoa_fee_max, stories_min, stories_max, garage_spaces_min, garage_spaces_max,
+            has_pool, has_garage, waterfront, has_view,
+        ) = (merged[name] for name in PRESET_FIELDS)
 
     validate_input(listing_type)
     validate_limit(limit)
@@ -268,7 +265,11 @@ def scrape_property(
     expanded_tag_filters = None
     expanded_tag_exclude = None
 
-    if tag_filters:
+    preset_tags = compiled_preset.tag_filters if compiled_preset else None
+    if tag_filters and preset_tags and tuple(tag_filters) == preset_tags and tag_use_aliases and not tag_use_fuzzy:
+        # Preset tags were alias-expanded when the preset was compiled
+        expanded_tag_filters = list(compiled_preset.expanded_tag_filters)
+    elif tag_filters:
         expanded_tag_filters = expand_tag_search(
             tag_filters,
             use_aliases=tag_use_aliases,
@@ -276,7 +277,10 @@ def scrape_property(
             fuzzy_threshold=tag_fuzzy_threshold
         )
 
-    if tag_exclude:
+    preset_exclude = compiled_preset.tag_exclude if compiled_preset else None
+    if tag_exclude and preset_exclude and tuple(tag_exclude) == preset_exclude and tag_use_aliases:
+        expanded_tag_exclude = list(compiled_preset.expanded_tag_exclude)
+    elif tag_exclude:
         expanded_tag_exclude = expand_tag_search(
             tag_exclude,
             use_aliases=tag_use_aliases,
@@ -382,35 +386,72 @@ def scrape_property(
         has_view=has_view,
         # Pagination control
         parallel=parallel,
+        exhaustive=exhaustive,
+        # Transport
+        max_workers=max_workers,
+        http2=http2,
+        # Compact results
+        compact=compact,
+        drop_fields=drop_fields,
     )
 
-    site = RealtorScraper(scraper_input)
-    results = site.search()
+    if stats is None:
+        stats = ScrapeStats()
 
-    if scraper_input.return_type != ReturnType.pandas:
-        return results
+    def _finish(results):
+        return (results, stats) if return_stats else results
 
-    properties_dfs = [df for result in results if not (df := process_result(result)).empty]
-    if not properties_dfs:
-        return pd.DataFrame()
+    use_spatial_index = spatial_index is not None and radius and scraper_input.return_type == ReturnType.pandas
+    local_df = None
+    if use_spatial_index:
+        with stats.span("spatial_index"):
+            local_df = local_comps(spatial_index, scraper_input)
 
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", category=FutureWarning)
 
-        result_df = pd.concat(properties_dfs, ignore_index=True, axis=0)[ordered_properties].replace(
-            {"None": pd.NA, None: pd.NA, "": pd.NA}
-        )
+        if local_df is not None:
+            # Comps area already covered by the index: no network calls
+            result_df = local_df
+        else:
+            site = RealtorScraper(scraper_input, stats=stats)
+            with stats.span("search"):
+                results = site.search()
+
+            if scraper_input.return_type != ReturnType.pandas:
+                return _finish(results)
+
+            with stats.span("process_result"):
+                properties_dfs = [df for result in results if not (df := process_result(result)).empty]
+
+            if properties_dfs:
+                with stats.span("concat"):
+                    result_df = pd.concat(properties_dfs, ignore_index=True, axis=0)[ordered_properties].replace(
+                        {"None": pd.NA, None: pd.NA, "": pd.NA}
+                    )
+
+                # Apply data cleaning if enabled
+                if clean_data:
+                    with stats.span("clean_dataframe"):
+                        result_df = clean_dataframe(result_df, add_derived_fields=add_derived_fields)
+            else:
+                result_df = pd.DataFrame()
+
+            if use_spatial_index:
+                with stats.span("spatial_index"):
+                    record_comps(spatial_index, site.location_info, scraper_input, result_df, len(results))
 
-        # Apply data cleaning if enabled
-        if clean_data:
-            result_df = clean_dataframe(result_df, add_derived_fields=add_derived_fields)
+            if result_df.empty:
+                return _finish(result_df)
 
         # Apply agent/broker contact filtering if enabled
         if require_agent_email or require_agent_phone:
-            result_df = filter_by_agent_contact(result_df, require_agent_email, require_agent_phone)
+            with stats.span("filter_by_agent_contact"):
+                result_df = filter_by_agent_contact(result_df, require_agent_email, require_agent_phone)
 
         # Apply advanced sorting if enabled and sort_by is specified
         if enable_advanced_sort and sort_by:
-            result_df = sort_properties(result_df, sort_by, sort_direction)
+            with stats.span("sort_properties"):
+                result_df = sort_properties(result_df, sort_by, sort_direction)
 
-        return result_df
+        return _finish(result_df)
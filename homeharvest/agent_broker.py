@@ -3,9 +3,13 @@ Agent and broker data extraction and analysis utilities.
 
 Provides enhanced agent/broker filtering, contact extraction, and activity analysis.
 """
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 import re
+from itertools import repeat
+
+from .dates import parse_datetime_series
 
 
 def extract_phone_numbers(phone_data) -> List[str]:
@@ -76,6 +80,101 @@ def extract_primary_phone(phone_data) -> Optional[str]:
     return phones[0] if phones else None
 
 
+def _flatten_phones(phones: pd.Series) -> pd.Series:
+    """
+    Flatten a phones column into one normalized number per entry.
+
+    Entries are indexed by row position, in the order extract_phone_numbers
+    returns them. Each distinct raw number is cleaned once.
+    """
+    values = pd.Series(phones.to_numpy(dtype=object), dtype=object)
+    kinds = values.map(type)
+
+    # Lists of phone objects or strings, one entry per item
+    listed = values[kinds == list].explode()
+    listed = listed.map(
+        lambda item: (item.get('number') or item.get('phone')) if isinstance(item, dict)
+        else item if isinstance(item, str) else None
+    )
+
+    # Single strings, split on commas/semicolons
+    raw = values[kinds == str].str.split(r'[,;]', regex=True).explode()
+
+    items = pd.concat([listed, raw]).sort_index(kind='stable')
+    items = items[items.notna() & (items != '')].astype(str)
+    if items.empty:
+        return items
+
+    codes, uniques = pd.factorize(items)
+    cleaned = pd.Series(uniques, dtype=object).str.replace(r'[^\d+]', '', regex=True)
+    valid = (cleaned.str.len() >= 10).to_numpy()[codes]
+    return pd.Series(cleaned.to_numpy()[codes], index=items.index)[valid]
+
+
+def normalize_phones(phones: pd.Series) -> pd.Series:
+    """
+    Vectorized extract_phone_numbers over a phones column.
+
+    Args:
+        phones: Series of phone data (lists of phone dicts/strings, strings, or NA)
+
+    Returns:
+        Series of lists of formatted phone numbers, aligned with phones
+    """
+    flat = _flatten_phones(phones)
+    numbers = flat.to_numpy()
+    bounds = np.searchsorted(flat.index.to_numpy(), np.arange(len(phones) + 1))
+    return pd.Series(
+        [numbers[start:end].tolist() for start, end in zip(bounds[:-1], bounds[1:])],
+        index=phones.index, dtype=object,
+    )
+
+
+def extract_primary_phones(phones: pd.Series) -> pd.Series:
+    """
+    Vectorized extract_primary_phone over a phones column.
+
+    Args:
+        phones: Series of phone data
+
+    Returns:
+        Series of the first formatted phone number (None when there is none), aligned with phones
+    """
+    flat = _flatten_phones(phones)
+    flat = flat[~flat.index.duplicated()]
+    first = np.full(len(phones), None, dtype=object)
+    first[flat.index.to_numpy()] = flat.to_numpy()
+    return pd.Series(first, index=phones.index, dtype=object)
+
+
+def normalize_contacts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize agent and office contact columns in one pass.
+
+    Args:
+        df: DataFrame with property data
+
+    Returns:
+        DataFrame aligned with df with agent_phone_numbers, agent_primary_phone,
+        office_phone_numbers, office_primary_phone, agent_email and office_email
+        (empty emails as None)
+    """
+    contacts = pd.DataFrame(index=df.index)
+    for prefix in ('agent', 'office'):
+        phones_column = f'{prefix}_phones'
+        phones = df[phones_column] if phones_column in df.columns else pd.Series(None, index=df.index, dtype=object)
+        numbers = normalize_phones(phones)
+        contacts[f'{prefix}_phone_numbers'] = numbers
+        contacts[f'{prefix}_primary_phone'] = numbers.map(lambda values: values[0] if values else None)
+
+        email_column = f'{prefix}_email'
+        emails = df[email_column] if email_column in df.columns else pd.Series(None, index=df.index, dtype=object)
+        emails = emails.astype(object)
+        contacts[email_column] = emails.where(emails.notna() & (emails != ''), None)
+
+    return contacts
+
+
 def format_contact_info(row: pd.Series) -> Dict[str, any]:
     """
     Format contact information from a property row.
@@ -148,24 +247,25 @@ def filter_by_agent_contact(df: pd.DataFrame, require_email: bool = False, requi
     if require_phone:
         filtered = filtered[filtered['agent_phones'].notna()]
         # Additional check for valid phones
-        filtered = filtered[filtered.apply(lambda row: bool(extract_phone_numbers(row['agent_phones'])), axis=1)]
+        filtered = filtered[extract_primary_phones(filtered['agent_phones']).notna()]
 
     return filtered.reset_index(drop=True)
 
 
-def get_agent_activity(df: pd.DataFrame) -> pd.DataFrame:
+def _top_groups(df: pd.DataFrame, column: str, top_k: Optional[int]) -> pd.DataFrame:
     """
-    Analyze agent activity and listing counts.
+    Rows of the top_k groups of column by listing count.
 
-    Args:
-        df: DataFrame with property data
-
-    Returns:
-        DataFrame with agent activity stats
+    The groups are picked with a partial selection (nlargest) on the per-group
+    counts, so only their rows go through the full aggregation.
     """
-    if df.empty or 'agent_name' not in df.columns:
-        return pd.DataFrame()
+    if top_k is None:
+        return df
+    counts = df.groupby(column, sort=False)['property_id'].count()
+    return df[df[column].isin(counts.nlargest(top_k).index)]
+
 
+def _agent_stats(df: pd.DataFrame) -> pd.DataFrame:
     # Group by agent
     agent_stats = df.groupby('agent_name').agg({
         'property_id': 'count',
@@ -191,21 +291,46 @@ def get_agent_activity(df: pd.DataFrame) -> pd.DataFrame:
         'office_name'
     ]
 
+    return agent_stats
+
+
+def get_agent_activity(df: pd.DataFrame, top_k: Optional[int] = None, index=None) -> pd.DataFrame:
+    """
+    Analyze agent activity and listing counts.
+
+    Args:
+        df: DataFrame with property data
+        top_k: Only the top_k agents by listing count (all agents when None)
+        index: Optional AgentIndex built from df; agents are then grouped by their
+            resolved identity (with an agent_key column) instead of by agent_name
+
+    Returns:
+        DataFrame with agent activity stats
+    """
+    if index is not None:
+        return index.activity(top_k)
+
+    if df.empty or 'agent_name' not in df.columns:
+        return pd.DataFrame()
+
+    agent_stats = _agent_stats(_top_groups(df, 'agent_name', top_k))
+
     # Sort by listing count
     agent_stats = agent_stats.sort_values('listing_count', ascending=False).reset_index(drop=True)
 
     # Add primary phone
-    agent_stats['primary_phone'] = agent_stats['agent_phones'].apply(extract_primary_phone)
+    agent_stats['primary_phone'] = extract_primary_phones(agent_stats['agent_phones'])
 
     return agent_stats
 
 
-def get_broker_activity(df: pd.DataFrame) -> pd.DataFrame:
+def get_broker_activity(df: pd.DataFrame, top_k: Optional[int] = None) -> pd.DataFrame:
     """
     Analyze broker activity and listing counts.
 
     Args:
         df: DataFrame with property data
+        top_k: Only the top_k brokers by listing count (all brokers when None)
 
     Returns:
         DataFrame with broker activity stats
@@ -213,6 +338,8 @@ def get_broker_activity(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or 'broker_name' not in df.columns:
         return pd.DataFrame()
 
+    df = _top_groups(df, 'broker_name', top_k)
+
     # Group by broker
     broker_stats = df.groupby('broker_name').agg({
         'property_id': 'count',
@@ -238,12 +365,13 @@ def get_broker_activity(df: pd.DataFrame) -> pd.DataFrame:
     return broker_stats
 
 
-def get_office_activity(df: pd.DataFrame) -> pd.DataFrame:
+def get_office_activity(df: pd.DataFrame, top_k: Optional[int] = None) -> pd.DataFrame:
     """
     Analyze office activity and listing counts.
 
     Args:
         df: DataFrame with property data
+        top_k: Only the top_k offices by listing count (all offices when None)
 
     Returns:
         DataFrame with office activity stats
@@ -251,6 +379,8 @@ def get_office_activity(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or 'office_name' not in df.columns:
         return pd.DataFrame()
 
+    df = _top_groups(df, 'office_name', top_k)
+
     # Group by office
     office_stats = df.groupby('office_name').agg({
         'property_id': 'count',
@@ -278,37 +408,42 @@ def get_office_activity(df: pd.DataFrame) -> pd.DataFrame:
     office_stats = office_stats.sort_values('listing_count', ascending=False).reset_index(drop=True)
 
     # Add primary phone
-    office_stats['primary_phone'] = office_stats['office_phones'].apply(extract_primary_phone)
+    office_stats['primary_phone'] = extract_primary_phones(office_stats['office_phones'])
 
     return office_stats
 
 
-def find_most_active_agents(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
+def find_most_active_agents(df: pd.DataFrame, limit: int = 10, index=None) -> pd.DataFrame:
     """
     Find the most active agents by listing count.
 
     Args:
         df: DataFrame with property data
         limit: Number of agents to return
+        index: Optional AgentIndex built from df (see get_agent_activity)
 
     Returns:
         DataFrame with top agents
     """
-    agent_stats = get_agent_activity(df)
-    return agent_stats.head(limit)
+    return get_agent_activity(df, top_k=limit, index=index)
 
 
-def find_properties_by_agent(df: pd.DataFrame, agent_name: str) -> pd.DataFrame:
+def find_properties_by_agent(df: pd.DataFrame, agent_name: str, index=None) -> pd.DataFrame:
     """
     Find all properties listed by a specific agent.
 
     Args:
         df: DataFrame with property data
         agent_name: Name of the agent
+        index: Optional AgentIndex built from df; the lookup then uses its posting
+            lists instead of scanning the agent_name column
 
     Returns:
         DataFrame with agent's properties
     """
+    if index is not None:
+        return index.find_properties_by_agent(agent_name)
+
     if df.empty or 'agent_name' not in df.columns:
         return pd.DataFrame()
 
@@ -317,17 +452,22 @@ def find_properties_by_agent(df: pd.DataFrame, agent_name: str) -> pd.DataFrame:
     return df[mask].reset_index(drop=True)
 
 
-def find_properties_by_broker(df: pd.DataFrame, broker_name: str) -> pd.DataFrame:
+def find_properties_by_broker(df: pd.DataFrame, broker_name: str, index=None) -> pd.DataFrame:
     """
     Find all properties listed by a specific broker.
 
     Args:
         df: DataFrame with property data
         broker_name: Name of the broker
+        index: Optional AgentIndex built from df; the lookup then uses its posting
+            lists instead of scanning the broker_name column
 
     Returns:
         DataFrame with broker's properties
     """
+    if index is not None:
+        return index.find_properties_by_broker(broker_name)
+
     if df.empty or 'broker_name' not in df.columns:
         return pd.DataFrame()
 
@@ -354,8 +494,8 @@ def get_contact_export(df: pd.DataFrame) -> pd.DataFrame:
                    'broker_name', 'office_name', 'office_phones', 'office_email']].drop_duplicates(subset=['agent_id'])
 
     # Add formatted phones
-    contacts['agent_primary_phone'] = contacts['agent_phones'].apply(extract_primary_phone)
-    contacts['office_primary_phone'] = contacts['office_phones'].apply(extract_primary_phone)
+    contacts['agent_primary_phone'] = extract_primary_phones(contacts['agent_phones'])
+    contacts['office_primary_phone'] = extract_primary_phones(contacts['office_phones'])
 
     # Remove rows without any contact info
     contacts = contacts[
@@ -378,75 +518,105 @@ def get_contact_export(df: pd.DataFrame) -> pd.DataFrame:
     return contacts[export_cols].reset_index(drop=True)
 
 
-def analyze_agent_specialization(df: pd.DataFrame) -> pd.DataFrame:
+#: price category bins (lower bound inclusive) and labels
+PRICE_CATEGORY_BINS = [-np.inf, 200000, 500000, 1000000, np.inf]
+PRICE_CATEGORY_LABELS = ['Budget', 'Mid-Range', 'Upper-Mid', 'Luxury']
+
+
+def categorize_prices(prices: pd.Series) -> pd.Series:
+    """
+    Categorize prices as Budget (< 200k), Mid-Range (< 500k), Upper-Mid (< 1M) or Luxury.
+
+    Args:
+        prices: Series of prices
+
+    Returns:
+        Series of category names ("Unknown" for missing prices)
+    """
+    categories = pd.cut(pd.to_numeric(prices, errors='coerce'), PRICE_CATEGORY_BINS,
+                        labels=PRICE_CATEGORY_LABELS, right=False)
+    return categories.astype(object).where(categories.notna(), 'Unknown')
+
+
+def _group_mode(values: pd.Series, groups: pd.Series) -> pd.Series:
+    """
+    Most common non-missing value per group, the smallest one on ties (like Series.mode()[0]).
+
+    Counts every (group, value) pair in one groupby instead of calling mode() per group.
+    """
+    pairs = pd.DataFrame({'group': groups.to_numpy(), 'value': values.to_numpy()}).dropna()
+    counts = pairs.groupby(['group', 'value'], sort=False).size().reset_index(name='count')
+    counts = counts.sort_values(['count', 'value'], ascending=[False, True], kind='stable')
+    return counts.drop_duplicates('group').set_index('group')['value']
+
+
+def analyze_agent_specialization(df: pd.DataFrame, top_k: Optional[int] = None, index=None) -> pd.DataFrame:
     """
     Analyze what types of properties each agent specializes in.
 
     Args:
         df: DataFrame with property data
+        top_k: Only the top_k agents by listing count (all agents when None)
+        index: Optional AgentIndex built from df; agents are then grouped by their
+            resolved identity (with an agent_key column) instead of by agent_name
 
     Returns:
         DataFrame with agent specialization info
     """
-    if df.empty or 'agent_name' not in df.columns:
+    if index is not None:
+        df, agents = index.df, index.agent_keys.rename('agent_key')
+        if df.empty:
+            return pd.DataFrame()
+    elif df.empty or 'agent_name' not in df.columns:
         return pd.DataFrame()
-
-    # Build aggregation dict dynamically based on available columns
-    agg_dict = {
-        'property_id': 'count',
-        'list_price': ['mean', 'median'],
-        'agent_email': 'first',
+    else:
+        agents = df['agent_name']
+
+    if top_k is not None:
+        counts = df.groupby(agents, sort=False)['property_id'].count()
+        keep = agents.isin(counts.nlargest(top_k).index)
+        df, agents = df[keep], agents[keep]
+
+    # Build aggregation dynamically based on available columns
+    aggregations = {
+        'agent_name': ('agent_name', 'first'),
+        'listing_count': ('property_id', 'count'),
+        'avg_price': ('list_price', 'mean'),
+        'median_price': ('list_price', 'median'),
     }
 
     # Add optional columns if they exist
     if 'sqft' in df.columns:
-        agg_dict['sqft'] = 'mean'
+        aggregations['avg_sqft'] = ('sqft', 'mean')
     if 'beds' in df.columns:
-        agg_dict['beds'] = 'mean'
+        aggregations['avg_beds'] = ('beds', 'mean')
     if 'full_baths' in df.columns:
-        agg_dict['full_baths'] = 'mean'
-    if 'style' in df.columns:  # Use style instead of property_type
-        agg_dict['style'] = lambda x: x.mode()[0] if not x.mode().empty else None
+        aggregations['avg_baths'] = ('full_baths', 'mean')
 
-    # Group by agent and calculate stats
-    specialization = df.groupby('agent_name').agg(agg_dict).reset_index()
+    aggregations['agent_email'] = ('agent_email', 'first')
 
-    # Flatten column names dynamically
-    new_cols = ['agent_name', 'listing_count', 'avg_price', 'median_price']
+    if index is None:
+        del aggregations['agent_name']  # the group key itself
 
-    # Add optional columns in order
-    if 'sqft' in agg_dict:
-        new_cols.append('avg_sqft')
-    if 'beds' in agg_dict:
-        new_cols.append('avg_beds')
-    if 'full_baths' in agg_dict:
-        new_cols.append('avg_baths')
-    if 'style' in agg_dict:
-        new_cols.append('common_style')
+    # Group by agent and calculate stats
+    specialization = df.groupby(agents).agg(**aggregations)
 
-    new_cols.append('agent_email')
+    if 'style' in df.columns:  # Use style instead of property_type
+        common_style = _group_mode(df['style'], agents)
+        specialization.insert(
+            specialization.columns.get_loc('agent_email'), 'common_style', common_style.reindex(specialization.index)
+        )
 
-    specialization.columns = new_cols
+    specialization = specialization.reset_index()
 
     # Categorize price range
-    def categorize_price(price):
-        if pd.isna(price):
-            return 'Unknown'
-        elif price < 200000:
-            return 'Budget'
-        elif price < 500000:
-            return 'Mid-Range'
-        elif price < 1000000:
-            return 'Upper-Mid'
-        else:
-            return 'Luxury'
-
-    specialization['price_category'] = specialization['avg_price'].apply(categorize_price)
+    specialization['price_category'] = categorize_prices(specialization['avg_price'])
 
     return specialization.sort_values('listing_count', ascending=False).reset_index(drop=True)
 
 
-def get_wholesale_friendly_agents(df: pd.DataFrame, min_listings: int = 3) -> pd.DataFrame:
+def get_wholesale_friendly_agents(df: pd.DataFrame, min_listings: int = 3,
+                                  top_k: Optional[int] = None) -> pd.DataFrame:
     """
     Find agents who may be wholesale-friendly based on their listing patterns.
 
@@ -458,17 +628,24 @@ def get_wholesale_friendly_agents(df: pd.DataFrame, min_listings: int = 3) -> pd
     Args:
         df: DataFrame with property data
         min_listings: Minimum number of listings
+        top_k: Only the top_k agents by wholesale score (all agents when None)
 
     Returns:
         DataFrame with wholesale-friendly agents
     """
-    # Get agent activity
-    agent_stats = get_agent_activity(df)
+    if df.empty or 'agent_name' not in df.columns:
+        return pd.DataFrame()
+
+    # Get agent activity (primary phones are extracted below, only where needed)
+    agent_stats = _agent_stats(df)
 
     # Filter by minimum listings
-    agent_stats = agent_stats[agent_stats['listing_count'] >= min_listings]
+    agent_stats = agent_stats[agent_stats['listing_count'] >= min_listings].copy()
 
-    # Filter by having contact info
+    # Filter by having contact info (phones are only needed for agents without email)
+    agent_stats['primary_phone'] = None
+    no_email = agent_stats['agent_email'].isna()
+    agent_stats.loc[no_email, 'primary_phone'] = extract_primary_phones(agent_stats.loc[no_email, 'agent_phones'])
     agent_stats = agent_stats[
         ((agent_stats['agent_email'].notna()) |
         (agent_stats['primary_phone'].notna()))
@@ -496,7 +673,162 @@ def get_wholesale_friendly_agents(df: pd.DataFrame, min_listings: int = 3) -> pd
             agent_stats['inventory_score'] * 0.4
         ) * 100
 
-        # Sort by wholesale score
-        agent_stats = agent_stats.sort_values('wholesale_score', ascending=False)
+        # Sort by wholesale score (partial selection for top_k)
+        if top_k is not None:
+            agent_stats = agent_stats.nlargest(top_k, 'wholesale_score')
+        else:
+            agent_stats = agent_stats.sort_values('wholesale_score', ascending=False)
+    elif top_k is not None:
+        agent_stats = agent_stats.head(top_k)
+
+    # Primary phones of the remaining agents that have an email
+    has_email = agent_stats['agent_email'].notna()
+    agent_stats.loc[has_email, 'primary_phone'] = extract_primary_phones(agent_stats.loc[has_email, 'agent_phones'])
 
     return agent_stats.reset_index(drop=True)
+
+
+#: listings on the market at least this many days count as stale
+STALE_DAYS = 90
+
+#: property_history events that set the asking price
+PRICE_EVENTS = ('Listed', 'Price Changed')
+
+
+def _dict_field(events: np.ndarray, key: str) -> np.ndarray:
+    """Object array of one field of an array of dicts (None where missing)."""
+    return np.fromiter(map(dict.get, events, repeat(key)), dtype=object, count=len(events))
+
+
+def count_price_cuts(df: pd.DataFrame) -> pd.Series:
+    """
+    Count asking-price reductions per property.
+
+    Uses the property_history column when present: price drops between
+    consecutive "Listed"/"Price Changed" events since the latest listing.
+    Otherwise falls back to the is_price_reduced flag (0 or 1).
+
+    Args:
+        df: DataFrame with property data
+
+    Returns:
+        Integer Series aligned with df
+    """
+    cuts = pd.Series(0, index=df.index, dtype='int64')
+
+    if 'property_history' in df.columns:
+        # One explode; event fields are then read with dict.get mapped in C, never per-row Python code
+        events = pd.Series(df['property_history'].to_numpy(dtype=object), dtype=object).explode()
+        present = ~pd.isna(events.to_numpy())
+        rows, events = events.index.to_numpy()[present], events.to_numpy()[present]
+        try:
+            names = _dict_field(events, 'event_name')
+        except TypeError:  # not a list of event dicts (e.g. a history read back from CSV as text)
+            is_event = (pd.Series(events).map(type) == dict).to_numpy()
+            rows, events = rows[is_event], events[is_event]
+            names = _dict_field(events, 'event_name')
+
+        # Compare the few distinct event names, not every event
+        name_codes, distinct_names = pd.factorize(names)
+        is_price_event = np.isin(name_codes, np.flatnonzero(pd.Index(distinct_names).isin(PRICE_EVENTS)))
+        listed = np.isin(name_codes[is_price_event], np.flatnonzero(distinct_names == 'Listed'))
+        rows, events = rows[is_price_event], events[is_price_event]
+        prices = _dict_field(events, 'price')
+        try:
+            prices = prices.astype('float64')  # None becomes NaN
+        except (TypeError, ValueError):
+            prices = pd.to_numeric(pd.Series(prices), errors='coerce').to_numpy(dtype='float64')
+
+        # Parse each distinct date once
+        date_codes, distinct_dates = pd.factorize(_dict_field(events, 'date'))
+        dates = np.append(parse_datetime_series(pd.Series(distinct_dates, dtype=object)).to_numpy(),
+                          np.datetime64('NaT', 'ns'))[date_codes]
+
+        priced = ~np.isnan(prices)
+        rows, dates, prices, listed = rows[priced], dates[priced], prices[priced], listed[priced]
+        if not len(rows):
+            return cuts
+
+        # Only the current listing cycle: events on or after the latest "Listed" event
+        latest_listed = pd.Series(np.where(listed, dates, np.datetime64('NaT'))).groupby(rows).transform('max')
+        cycle = dates >= latest_listed.fillna(pd.Timestamp.min).to_numpy()
+        rows, dates, prices = rows[cycle], dates[cycle], prices[cycle]
+
+        # Price drops between consecutive events of the same row, counted per row
+        order = np.lexsort((dates, rows))
+        rows, prices = rows[order], prices[order]
+        dropped = (rows[1:] == rows[:-1]) & (prices[1:] < prices[:-1])
+        cuts[:] = np.bincount(rows[1:][dropped], minlength=len(df))
+        return cuts
+
+    if 'is_price_reduced' in df.columns:
+        return df['is_price_reduced'].eq(True).astype('int64')
+
+    return cuts
+
+
+def score_agent_frustration(df: pd.DataFrame, stale_days: int = STALE_DAYS,
+                            group_by: str = 'agent_name') -> pd.DataFrame:
+    """
+    Score how frustrated each agent is likely to be, from their stale listings.
+
+    Frustration Score (0-100) = Listing Score + DOM Score, where
+    Listing Score = min(50, 10 * stale_count) and
+    DOM Score = min(50, 0.25 * average days on market of the stale listings).
+
+    All statistics are computed in one grouped pass.
+
+    Args:
+        df: DataFrame with property data
+        stale_days: Days on market from which a listing counts as stale
+        group_by: Column identifying the agent (e.g. "agent_name", "agent_id")
+
+    Returns:
+        DataFrame with one row per agent: listing_count, stale_count, stale_ratio,
+        avg_days_on_market, median_days_on_market, p90_days_on_market,
+        stale_avg_days_on_market, max_days_on_market, price_cut_listings,
+        price_cuts, listing_score, dom_score and frustration_score,
+        most frustrated first
+    """
+    if df.empty or group_by not in df.columns or 'days_on_mls' not in df.columns:
+        return pd.DataFrame()
+
+    days = pd.to_numeric(df['days_on_mls'], errors='coerce')
+    stale = days >= stale_days
+    cuts = count_price_cuts(df)
+
+    # Group on integer codes: the agent column is factorized once
+    codes, agents = pd.factorize(df[group_by])
+    work = pd.DataFrame({
+        'agent': codes,
+        'days': days.to_numpy(),
+        'stale': stale.to_numpy(),
+        'stale_days': days.where(stale).to_numpy(),
+        'cuts': cuts.to_numpy(),
+        'cut_listing': (cuts > 0).to_numpy(),
+    })
+    grouped = work[codes >= 0].groupby('agent', sort=True)
+
+    scores = grouped.agg(
+        listing_count=('days', 'size'),
+        stale_count=('stale', 'sum'),
+        avg_days_on_market=('days', 'mean'),
+        stale_avg_days_on_market=('stale_days', 'mean'),
+        max_days_on_market=('days', 'max'),
+        price_cut_listings=('cut_listing', 'sum'),
+        price_cuts=('cuts', 'sum'),
+    )
+    percentiles = grouped['days'].quantile([0.5, 0.9]).unstack()
+    scores.insert(3, 'median_days_on_market', percentiles[0.5])
+    scores.insert(4, 'p90_days_on_market', percentiles[0.9])
+    scores.insert(2, 'stale_ratio', scores['stale_count'] / scores['listing_count'])
+    scores.index = agents[scores.index]
+
+    scores['listing_score'] = (scores['stale_count'] * 10).clip(upper=50)
+    scores['dom_score'] = (scores['stale_avg_days_on_market'].fillna(0) * 0.25).clip(upper=50)
+    scores['frustration_score'] = scores['listing_score'] + scores['dom_score']
+
+    scores = scores.rename_axis(group_by).reset_index()
+    return scores.sort_values(
+        ['frustration_score', 'stale_count'], ascending=False, kind='stable'
+    ).reset_index(drop=True)
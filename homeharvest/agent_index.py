@@ -0,0 +1,327 @@
+"""
+Agent identity resolution across listings.
+
+Provides an index of agent, broker and office entities keyed by agent_id /
+agent_nrds_id with email and name fallbacks, holding posting lists of the
+property rows of each entity. Batches from several searches (e.g. one per ZIP
+code) can be added to the same index.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .agent_broker import extract_primary_phones
+
+#: identifier columns in resolution order, with the key prefix each one gets
+AGENT_IDENTIFIERS = (
+    ("agent_id", "id"),
+    ("agent_nrds_id", "nrds"),
+    ("agent_email", "email"),
+    ("agent_name", "name"),
+)
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+_NORMALIZERS = {
+    "id": str.strip,
+    "nrds": str.strip,
+    "email": lambda email: email.strip().lower(),
+    "name": _normalize_name,
+}
+
+
+def _normalized(values: Optional[pd.Series], how, index: pd.Index) -> pd.Series:
+    """Apply a normalizer once per distinct value; missing and empty values become None."""
+    if values is None:
+        return pd.Series(None, index=index, dtype=object)
+    codes, uniques = pd.factorize(values)
+    normalized = np.array([how(str(value)) or None for value in uniques] + [None], dtype=object)
+    return pd.Series(normalized[codes], index=index, dtype=object)
+
+
+def _coalesce(*columns: pd.Series) -> pd.Series:
+    """First non-missing value of each row across the columns."""
+    result = columns[0]
+    for column in columns[1:]:
+        result = result.where(result.notna(), column)
+    return result
+
+
+def _key_column(df: pd.DataFrame, column: str, prefix: str) -> pd.Series:
+    values = _normalized(df.get(column), _NORMALIZERS[prefix], df.index)
+    return (prefix + ":") + values
+
+
+class AgentIndex:
+    """
+    Agent, broker and office entities with posting lists of their property rows.
+
+    An agent is identified by agent_id, else agent_nrds_id, else email, else name.
+    Identifiers seen together on one listing are linked, so a later listing that
+    only carries the agent's NRDS id or email resolves to the same agent. Names
+    are never linked: two agents with the same name stay separate when they have
+    different ids. Brokers and offices are keyed by id, else name.
+
+    Example:
+        index = AgentIndex()
+        for zip_code in zip_codes:
+            index.add(scrape_property(zip_code, listing_type="for_sale"))
+        index.find_properties_by_agent("jane doe")
+        index.activity().head(10)
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        self._frames: List[pd.DataFrame] = []
+        self._df: Optional[pd.DataFrame] = None
+        #: alias (NRDS id or email key) -> agent key, and the reverse map of each agent's aliases
+        self._aliases: Dict[str, str] = {}
+        self._alias_lists: Dict[str, List[str]] = {}
+        self._agent_keys: List[np.ndarray] = []
+        self._agent_keys_series: Optional[pd.Series] = None
+        self._postings: Dict[str, Dict[str, np.ndarray]] = {"agent": {}, "broker": {}, "office": {}}
+        self._names: Dict[str, Dict[str, set]] = {"agent": {}, "broker": {}, "office": {}}
+        self._agent_names: Dict[str, set] = {}
+        self._size = 0
+        if df is not None:
+            self.add(df)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """All indexed rows; posting lists hold positions in this frame."""
+        if self._df is None:
+            self._df = pd.concat(self._frames, ignore_index=True) if self._frames else pd.DataFrame()
+        return self._df
+
+    def _resolve_agents(self, df: pd.DataFrame) -> pd.Series:
+        keys = {prefix: _key_column(df, column, prefix) for column, prefix in AGENT_IDENTIFIERS}
+
+        # Link the NRDS ids and emails of this batch to the strongest identifier on the same row
+        strongest = _coalesce(keys["id"], keys["nrds"], keys["email"])
+        relinked: Dict[str, str] = {}
+        for prefix in ("nrds", "email"):
+            linked = pd.DataFrame({"alias": keys[prefix], "key": strongest}).dropna()
+            linked = linked[linked["alias"] != linked["key"]].drop_duplicates("alias")
+            linked = linked[self._canonical(linked["alias"]).isna()]
+            for alias, key in zip(linked["alias"], linked["key"]):
+                self._link(alias, key, relinked)
+        if relinked:
+            self._move_agents({alias: self._aliases[alias] for alias in relinked})
+
+        resolved = _coalesce(
+            keys["id"],
+            self._canonical(keys["nrds"]), keys["nrds"],
+            self._canonical(keys["email"]), keys["email"],
+            keys["name"],
+        )
+        return resolved.where(resolved.notna(), None)
+
+    def _canonical(self, aliases: pd.Series) -> pd.Series:
+        """Agent key of each alias (None when not linked), looked up once per distinct value."""
+        # Series.map(dict) would copy the whole alias table into a Series on every batch
+        codes, uniques = pd.factorize(aliases)
+        canonical = np.array([self._aliases.get(alias) for alias in uniques] + [None], dtype=object)
+        return pd.Series(canonical[codes], index=aliases.index, dtype=object)
+
+    def _link(self, alias: str, key: str, relinked: Dict[str, str]) -> None:
+        """
+        Point alias (and the aliases it had gathered) at the agent key resolves to.
+
+        Aliases only ever point at a stronger identifier (email -> NRDS id -> agent_id),
+        so each alias is re-pointed at most twice and linking stays linear overall.
+        """
+        key = self._aliases.get(key, key)
+        if key == alias:
+            return
+        aliases = self._alias_lists.pop(alias, [])
+        aliases.append(alias)
+        for linked in aliases:
+            self._aliases[linked] = key
+        self._alias_lists.setdefault(key, []).extend(aliases)
+        relinked[alias] = key
+
+    def _move_agents(self, moves: Dict[str, str]) -> None:
+        """Move the postings and names of agents indexed under keys that became aliases."""
+        postings = self._postings["agent"]
+        names = self._names["agent"]
+        for alias, key in moves.items():
+            positions = postings.pop(alias, None)
+            if positions is None:
+                continue
+            existing = postings.get(key)
+            postings[key] = positions if existing is None else np.union1d(existing, positions)
+            for name in self._agent_names.pop(alias, ()):
+                names[name].discard(alias)
+                names[name].add(key)
+                self._agent_names.setdefault(key, set()).add(name)
+        # Stored batch keys are remapped lazily, in one pass, by agent_keys
+        self._agent_keys_series = None
+
+    def _add_postings(self, kind: str, keys: pd.Series, names: Optional[pd.Series], offset: int) -> None:
+        postings = self._postings[kind]
+        keys = keys.reset_index(drop=True)
+        for key, positions in keys.groupby(keys, sort=False).indices.items():
+            positions = positions + offset
+            existing = postings.get(key)
+            postings[key] = positions if existing is None else np.concatenate([existing, positions])
+
+        if names is not None:
+            pairs = pd.DataFrame({"name": _normalized(names, _normalize_name, keys.index), "key": keys}).dropna()
+            for name, key in pairs.drop_duplicates().itertuples(index=False):
+                self._names[kind].setdefault(name, set()).add(key)
+                if kind == "agent":
+                    self._agent_names.setdefault(key, set()).add(name)
+
+    def add(self, df: pd.DataFrame) -> "AgentIndex":
+        """
+        Index a batch of properties (e.g. the results of one search).
+
+        Args:
+            df: DataFrame produced by scrape_property
+
+        Returns:
+            self
+        """
+        if df is None or df.empty:
+            return self
+
+        df = df.reset_index(drop=True)
+        offset = self._size
+
+        agent_keys = self._resolve_agents(df)
+        self._add_postings("agent", agent_keys, df.get("agent_name"), offset)
+        self._agent_keys.append(agent_keys.to_numpy())
+        self._agent_keys_series = None
+
+        for kind in ("broker", "office"):
+            keys = _coalesce(_key_column(df, f"{kind}_id", "id"), _key_column(df, f"{kind}_name", "name"))
+            self._add_postings(kind, keys, df.get(f"{kind}_name"), offset)
+
+        self._frames.append(df)
+        self._df = None
+        self._size += len(df)
+        return self
+
+    def resolve(self, agent_id: Optional[str] = None, nrds_id: Optional[str] = None,
+                email: Optional[str] = None) -> Optional[str]:
+        """
+        Get the entity key of an agent from one of its identifiers.
+
+        Returns:
+            Entity key, or None if no indexed listing carries the identifier
+        """
+        candidates = []
+        if agent_id:
+            candidates.append(f"id:{str(agent_id).strip()}")
+        if nrds_id:
+            candidates.append(f"nrds:{str(nrds_id).strip()}")
+        if email:
+            candidates.append(f"email:{email.strip().lower()}")
+
+        for candidate in candidates:
+            key = self._aliases.get(candidate, candidate)
+            if key in self._postings["agent"]:
+                return key
+        return None
+
+    def keys_by_name(self, name: str, kind: str = "agent", partial: bool = True) -> List[str]:
+        """
+        Entity keys whose name matches, case-insensitively.
+
+        Exact names are a dictionary lookup; partial matching scans the distinct
+        names only, never the rows.
+
+        Args:
+            name: Name or part of a name
+            kind: "agent", "broker" or "office"
+            partial: Match names containing the text (like str.contains)
+        """
+        names = self._names[kind]
+        needle = " ".join(name.strip().lower().split())
+        if not partial:
+            return sorted(names.get(needle, ()))
+
+        keys = set()
+        for candidate, candidate_keys in names.items():
+            if needle in candidate:
+                keys.update(candidate_keys)
+        return sorted(keys)
+
+    def positions(self, keys: Iterable[str], kind: str = "agent") -> np.ndarray:
+        """Sorted row positions of the given entities."""
+        postings = self._postings[kind]
+        arrays = [postings[key] for key in keys if key in postings]
+        if not arrays:
+            return np.array([], dtype=np.intp)
+        return np.unique(np.concatenate(arrays))
+
+    def properties(self, key: str, kind: str = "agent") -> pd.DataFrame:
+        """Properties of one entity, in index order."""
+        return self.df.iloc[self.positions([key], kind)].reset_index(drop=True)
+
+    def find_properties_by_agent(self, agent_name: str) -> pd.DataFrame:
+        """Properties of every agent whose name contains agent_name (case-insensitive)."""
+        return self.df.iloc[self.positions(self.keys_by_name(agent_name, "agent"), "agent")].reset_index(drop=True)
+
+    def find_properties_by_broker(self, broker_name: str) -> pd.DataFrame:
+        """Properties of every broker whose name contains broker_name (case-insensitive)."""
+        return self.df.iloc[self.positions(self.keys_by_name(broker_name, "broker"), "broker")].reset_index(drop=True)
+
+    @property
+    def agent_keys(self) -> pd.Series:
+        """Entity key of each indexed row's agent (None when the row has no agent)."""
+        if self._agent_keys_series is None:
+            if not self._agent_keys:
+                return pd.Series([], dtype=object)
+            # Rows indexed before a link was known: one map over the distinct keys
+            codes, uniques = pd.factorize(np.concatenate(self._agent_keys))
+            canonical = np.array([self._aliases.get(key, key) for key in uniques] + [None], dtype=object)
+            self._agent_keys_series = pd.Series(canonical[codes], dtype=object)
+            self._agent_keys = [self._agent_keys_series.to_numpy()]
+        return self._agent_keys_series
+
+    def activity(self, top_k: Optional[int] = None) -> pd.DataFrame:
+        """
+        Agent activity per resolved agent (see agent_broker.get_agent_activity).
+
+        Args:
+            top_k: Only the top_k agents by listing count (all agents when None)
+
+        Returns:
+            DataFrame with agent_key, agent_name, listing_count, avg/min/max price,
+            contact columns and primary_phone, most listings first
+        """
+        df = self.df
+        if df.empty:
+            return pd.DataFrame()
+        agent_keys = self.agent_keys.rename("agent_key")
+        if top_k is not None:
+            counts = agent_keys.value_counts(sort=False)
+            keep = agent_keys.isin(counts.nlargest(top_k).index)
+            df, agent_keys = df[keep], agent_keys[keep]
+
+        columns = {
+            "agent_name": "first", "agent_email": "first", "agent_phones": "first", "agent_id": "first",
+            "agent_nrds_id": "first", "broker_name": "first", "office_name": "first",
+        }
+        columns = {column: how for column, how in columns.items() if column in df.columns}
+
+        grouped = df.groupby(agent_keys, sort=False)
+        stats = grouped.agg(**{column: (column, how) for column, how in columns.items()})
+        stats["listing_count"] = grouped.size()
+        if "list_price" in df.columns:
+            prices = grouped["list_price"]
+            stats["avg_price"] = prices.mean()
+            stats["min_price"] = prices.min()
+            stats["max_price"] = prices.max()
+
+        stats = stats.reset_index().sort_values("listing_count", ascending=False, kind="stable")
+        if "agent_phones" in stats.columns:
+            stats["primary_phone"] = extract_primary_phones(stats["agent_phones"])
+        return stats.reset_index(drop=True)
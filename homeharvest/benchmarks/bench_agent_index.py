@@ -0,0 +1,60 @@
+"""
+Benchmark building an AgentIndex from per-ZIP batches as the number of agents
+grows: identifier linking must stay linear for metros with tens of thousands
+of agents.
+
+Run from the repository root:
+    python -m homeharvest.benchmarks.bench_agent_index [agents ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from homeharvest.agent_index import AgentIndex
+
+ROWS_PER_AGENT = 5
+BATCH_ROWS = 2_000
+
+
+def make_listings(agents: int, seed: int = 0) -> pd.DataFrame:
+    """Listings whose agents carry a random subset of their id, NRDS id and email."""
+    rng = np.random.default_rng(seed)
+    rows = agents * ROWS_PER_AGENT
+    agent = rng.integers(0, agents, rows)
+    present = rng.random((rows, 3)) < (0.5, 0.7, 0.7)
+
+    def column(template, mask):
+        values = pd.Series(agent).map(template.format)
+        return values.where(mask, None)
+
+    return pd.DataFrame({
+        'property_id': np.arange(rows).astype(str),
+        'agent_id': column('a{}', present[:, 0]),
+        'agent_nrds_id': column('n{}', present[:, 1]),
+        'agent_email': column('agent{}@example.com', present[:, 2]),
+        'agent_name': pd.Series(agent).map('Agent {}'.format),
+        'list_price': rng.lognormal(13, 0.4, rows),
+    })
+
+
+def build(df: pd.DataFrame) -> AgentIndex:
+    index = AgentIndex()
+    for start in range(0, len(df), BATCH_ROWS):
+        index.add(df.iloc[start:start + BATCH_ROWS])
+    return index
+
+
+def main(sizes=(2_000, 8_000, 16_000, 32_000)):
+    for agents in sizes:
+        df = make_listings(agents)
+        start = time.perf_counter()
+        index = build(df)
+        elapsed = time.perf_counter() - start
+        resolved = index.agent_keys.nunique()
+        print(f"{agents:>7,} agents, {len(df):>8,} rows: {elapsed:6.2f} s ({resolved:,} resolved agents)")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or (2_000, 8_000, 16_000, 32_000))
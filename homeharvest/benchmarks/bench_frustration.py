@@ -0,0 +1,109 @@
+"""
+Benchmark agent frustration scoring on a synthetic whole-state snapshot:
+a per-row Python accumulation (as the API did it) against the grouped,
+vectorized score_agent_frustration, and price cuts counted from the
+property_history column (as scraped frames carry it) against a per-row loop.
+
+Run from the repository root:
+    python -m homeharvest.benchmarks.bench_frustration [rows]
+"""
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from homeharvest.agent_broker import PRICE_EVENTS, STALE_DAYS, count_price_cuts, score_agent_frustration
+
+AGENTS = 50_000
+
+
+def make_snapshot(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = rng.gamma(2.0, 35.0, rows).round()
+    days[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        'agent_name': pd.Series(rng.integers(0, AGENTS, rows)).map('Agent {}'.format),
+        'days_on_mls': days,
+        'is_price_reduced': rng.random(rows) < 0.2,
+        'property_history': make_histories(rng, rows),
+    })
+
+
+def make_histories(rng, rows: int) -> list:
+    """Up to 6 events per listing: an optional earlier sale, a listing, then price changes."""
+    events = rng.integers(0, 6, rows)
+    sold = rng.random(rows) < 0.3
+    steps = rng.normal(-0.01, 0.03, (rows, 5))
+    histories = []
+    for row in range(rows):
+        history = [{'date': '2022-05-01', 'event_name': 'Sold', 'price': 350_000}] if sold[row] else []
+        price = 400_000.0
+        history.append({'date': '2025-01-01', 'event_name': 'Listed', 'price': price})
+        for step in range(events[row]):
+            price = round(price * (1 + steps[row, step]))
+            history.append({'date': f'2025-{step + 2:02d}-01', 'event_name': 'Price Changed', 'price': price})
+        histories.append(history if events[row] or sold[row] else None)
+    return histories
+
+
+def legacy_price_cuts(df: pd.DataFrame) -> list:
+    """Per-row walk of each listing's history since its latest "Listed" event."""
+    counts = []
+    for history in df['property_history']:
+        events = sorted(
+            (event for event in history or () if event['event_name'] in PRICE_EVENTS and event['price'] is not None),
+            key=lambda event: event['date'],
+        )
+        listed = [index for index, event in enumerate(events) if event['event_name'] == 'Listed']
+        events = events[listed[-1]:] if listed else events
+        counts.append(sum(later['price'] < earlier['price'] for earlier, later in zip(events, events[1:])))
+    return counts
+
+
+def legacy_scores(df: pd.DataFrame) -> dict:
+    """Row-by-row accumulation of stale counts and days, then the score per agent."""
+    stale = defaultdict(list)
+    for agent, days in zip(df['agent_name'], df['days_on_mls']):
+        if agent is not None and days == days and days >= STALE_DAYS:
+            stale[agent].append(days)
+    return {
+        agent: min(50, len(values) * 10) + min(50, sum(values) / len(values) * 0.25)
+        for agent, values in stale.items()
+    }
+
+
+def main(rows: int = 1_000_000):
+    df = make_snapshot(rows)
+
+    start = time.perf_counter()
+    expected = legacy_scores(df)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_agent_frustration(df)
+    vectorized = time.perf_counter() - start
+
+    got = scores[scores['stale_count'] > 0].set_index('agent_name')['frustration_score']
+    assert len(got) == len(expected)
+    assert np.allclose(got.loc[list(expected)].to_numpy(), list(expected.values()))
+
+    start = time.perf_counter()
+    expected_cuts = legacy_price_cuts(df)
+    legacy_cuts = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cuts = count_price_cuts(df)
+    vectorized_cuts = time.perf_counter() - start
+    assert cuts.tolist() == expected_cuts
+
+    print(f"{rows:,} rows, {scores.shape[0]:,} agents, scores and price cuts identical")
+    print(f"before (row loop, stale score only):  {legacy:7.2f} s")
+    print(f"after (grouped, all statistics):      {vectorized:7.2f} s")
+    print(f"price cuts, per-row history walk:     {legacy_cuts:7.2f} s")
+    print(f"price cuts, exploded history:         {vectorized_cuts:7.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,79 @@
+"""
+Benchmark fuzzy tag matching: per-term latency of the previous full scan
+(rebuild the tag universe, SequenceMatcher against every tag) against the
+prebuilt index, with and without the LRU cache.
+
+Run from the repository root:
+    python -m homeharvest.benchmarks.bench_fuzzy_tags
+"""
+import time
+from difflib import SequenceMatcher
+
+from homeharvest.tag_utils import TAG_CATEGORIES, TAG_ALIASES, fuzzy_match_tag, _fuzzy_match_cached
+
+TERMS = [
+    "pools", "swiming pool", "hot tub", "garge", "mountian view", "waterfrnt", "fire place",
+    "hardwood", "big yard", "gated comunity", "solar panel", "new roof", "corner lot", "tenis",
+    "open floor", "basment", "guest house", "golf course", "horse", "rv parking",
+]
+THRESHOLDS = (0.4, 0.6, 0.8)
+REPEAT = 20
+
+
+def legacy_fuzzy_match_tag(search_term, threshold=0.6):
+    """The full-scan implementation the index replaces."""
+    search_lower = search_term.lower().strip().replace(" ", "_")
+    if search_lower in TAG_ALIASES:
+        return [(TAG_ALIASES[search_lower], 1.0)]
+
+    all_tags = set()
+    for category_tags in TAG_CATEGORIES.values():
+        all_tags.update(category_tags)
+    all_tags.update(TAG_ALIASES.keys())
+    all_tags.update(TAG_ALIASES.values())
+
+    matches = []
+    for tag in all_tags:
+        ratio = SequenceMatcher(None, search_lower, tag).ratio()
+        if ratio >= threshold:
+            matches.append((TAG_ALIASES.get(tag, tag), ratio))
+    matches.sort(key=lambda x: x[1], reverse=True)
+
+    seen = set()
+    unique_matches = []
+    for tag, score in matches:
+        if tag not in seen:
+            seen.add(tag)
+            unique_matches.append((tag, score))
+    return unique_matches
+
+
+def per_term_us(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for term in TERMS:
+            for threshold in THRESHOLDS:
+                func(term, threshold)
+    return (time.perf_counter() - start) / (REPEAT * len(TERMS) * len(THRESHOLDS)) * 1e6
+
+
+def uncached(term, threshold):
+    _fuzzy_match_cached.cache_clear()
+    return fuzzy_match_tag(term, threshold)
+
+
+def main():
+    for term in TERMS:
+        for threshold in THRESHOLDS:
+            legacy = {tag: round(score, 9) for tag, score in legacy_fuzzy_match_tag(term, threshold)}
+            indexed = {tag: round(score, 9) for tag, score in fuzzy_match_tag(term, threshold)}
+            assert legacy == indexed, (term, threshold)
+
+    print(f"{len(TERMS)} terms x {len(THRESHOLDS)} thresholds, results identical")
+    print(f"before (full scan):   {per_term_us(legacy_fuzzy_match_tag):8.1f} us/term")
+    print(f"after (index):        {per_term_us(uncached):8.1f} us/term")
+    print(f"after (index + LRU):  {per_term_us(fuzzy_match_tag):8.1f} us/term")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Listing change tracking across scrapes.
+
+Provides a tracker that diffs successive snapshots per property_id and appends
+price changes, status changes and relists to a compact columnar event log
+(interned ids, integer event codes, numpy columns), seeded with the
+property_history of listings seen for the first time. Queries such as "price
+drops in a ZIP in the last N days" are vectorized scans of the log.
+"""
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .agent_broker import PRICE_EVENTS
+from .dates import parse_datetime_series
+
+#: event kinds of the log, in code order
+PRICE_CHANGE = "price_change"
+STATUS_CHANGE = "status_change"
+RELISTED = "relisted"
+EVENT_KINDS = (PRICE_CHANGE, STATUS_CHANGE, RELISTED)
+
+#: property_history events that change the listing status, and the status they set
+HISTORY_STATUSES = {
+    "Sold": "SOLD",
+    "Pending": "PENDING",
+    "Contingent": "CONTINGENT",
+    "Listing removed": "OFF_MARKET",
+}
+
+#: snapshot columns kept per property to diff the next snapshot against
+STATE_COLUMNS = ("zip_code", "status", "list_price", "list_date")
+
+#: columns of the event log and their storage types
+LOG_COLUMNS = {
+    "property": np.int32,
+    "zip_code": np.int32,
+    "kind": np.int8,
+    "date": "datetime64[s]",
+    "old_price": np.float64,
+    "new_price": np.float64,
+    "old_status": np.int16,
+    "new_status": np.int16,
+}
+
+#: code of missing interned values
+MISSING = -1
+
+Day = Union[date, datetime, str]
+
+
+class _Vocabulary:
+    """Interned strings and their integer codes."""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = list(values or [])
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, values) -> np.ndarray:
+        """Codes of values (MISSING for None/NaN), interning the new ones."""
+        positions, uniques = pd.factorize(pd.Series(values, dtype=object))
+        codes = np.array([self._intern(value) for value in uniques] + [MISSING], dtype=np.int64)
+        return codes[positions]
+
+    def _intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Hashable) -> int:
+        return self.codes.get(value, MISSING)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        values = np.array(self.values + [None], dtype=object)
+        return values[np.where(codes == MISSING, len(self.values), codes)]
+
+
+class ChangeTracker:
+    """
+    Append-only log of listing changes, built by diffing successive snapshots.
+
+    Each update compares the snapshot with the last known zip_code, status,
+    list_price and list_date of every property_id and logs:
+
+    - price_change: list_price differs from the last snapshot
+    - status_change: status differs from the last snapshot
+    - relisted: list_date is later than in the last snapshot
+
+    Listings seen for the first time contribute the events of their
+    property_history column instead ("Price Changed", relisting "Listed"
+    events and status events of HISTORY_STATUSES), so price drops are known
+    from the first scrape on.
+
+    Example:
+        tracker = ChangeTracker()
+        tracker.update(monday_df)
+        tracker.update(friday_df)
+        tracker.price_drops(zip_code="85004", days=7)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._properties = _Vocabulary()
+        self._zip_codes = _Vocabulary()
+        self._statuses = _Vocabulary()
+        self._state = pd.DataFrame(
+            {"zip_code": pd.Series(dtype=object), "status": pd.Series(dtype=object),
+             "list_price": pd.Series(dtype=float), "list_date": pd.Series(dtype="datetime64[ns]")},
+            index=pd.Index([], dtype=object, name="property_id"),
+        )
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        self._log: Optional[Dict[str, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        """Number of logged events."""
+        return len(self._columns()["kind"])
+
+    def _append(self, property_ids, zip_codes, kind: str, dates, old_price=np.nan, new_price=np.nan,
+                old_status=None, new_status=None) -> None:
+        rows = len(property_ids)
+        if not rows:
+            return
+
+        def statuses(values):
+            if values is None:
+                return np.full(rows, MISSING)
+            return self._statuses.encode(list(values))
+
+        self._chunks.append({
+            "property": self._properties.encode(list(property_ids)).astype(np.int32),
+            "zip_code": self._zip_codes.encode(list(zip_codes)).astype(np.int32),
+            "kind": np.full(rows, EVENT_KINDS.index(kind), dtype=np.int8),
+            "date": np.asarray(dates, dtype="datetime64[s]"),
+            "old_price": np.broadcast_to(np.asarray(old_price, dtype=np.float64), rows).copy(),
+            "new_price": np.broadcast_to(np.asarray(new_price, dtype=np.float64), rows).copy(),
+            "old_status": statuses(old_status).astype(np.int16),
+            "new_status": statuses(new_status).astype(np.int16),
+        })
+        self._log = None
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """The log as one array per column (chunks are concatenated on first read)."""
+        with self._lock:
+            if self._log is None:
+                if self._chunks:
+                    self._log = {column: np.concatenate([chunk[column] for chunk in self._chunks])
+                                 for column in LOG_COLUMNS}
+                    self._chunks = [self._log]
+                else:
+                    self._log = {column: np.empty(0, dtype=dtype) for column, dtype in LOG_COLUMNS.items()}
+            return self._log
+
+    @staticmethod
+    def _snapshot(df: pd.DataFrame) -> pd.DataFrame:
+        snapshot = pd.DataFrame(index=df.index)
+        snapshot["property_id"] = df["property_id"].astype(str)
+        snapshot["zip_code"] = df["zip_code"].astype(str).where(df["zip_code"].notna()) if "zip_code" in df.columns else None
+        snapshot["status"] = df["status"].astype(object) if "status" in df.columns else None
+        snapshot["list_price"] = pd.to_numeric(df["list_price"], errors="coerce") if "list_price" in df.columns else np.nan
+        snapshot["list_date"] = parse_datetime_series(df["list_date"]) if "list_date" in df.columns else pd.NaT
+        snapshot = snapshot[df["property_id"].notna()].drop_duplicates("property_id", keep="last")
+        return snapshot.set_index("property_id")[list(STATE_COLUMNS)]
+
+    def _diff(self, current: pd.DataFrame, when: np.datetime64) -> None:
+        previous = self._state.reindex(current.index)
+        ids, zip_codes = current.index, current["zip_code"].fillna(previous["zip_code"])
+
+        changed = current["list_price"].notna() & previous["list_price"].notna() & (
+            current["list_price"] != previous["list_price"])
+        self._append(ids[changed], zip_codes[changed], PRICE_CHANGE, np.full(changed.sum(), when),
+                     previous["list_price"][changed].to_numpy(), current["list_price"][changed].to_numpy())
+
+        changed = current["status"].notna() & previous["status"].notna() & (current["status"] != previous["status"])
+        self._append(ids[changed], zip_codes[changed], STATUS_CHANGE, np.full(changed.sum(), when),
+                     old_status=previous["status"][changed], new_status=current["status"][changed])
+
+        relisted = current["list_date"].notna() & previous["list_date"].notna() & (
+            current["list_date"] > previous["list_date"])
+        self._append(ids[relisted], zip_codes[relisted], RELISTED, current["list_date"][relisted].to_numpy(),
+                     previous["list_price"][relisted].to_numpy(), current["list_price"][relisted].to_numpy())
+
+    def _import_history(self, df: pd.DataFrame, current: pd.DataFrame) -> None:
+        histories = df.loc[df["property_id"].astype(str).isin(current.index) & df["property_id"].notna()]
+        histories = histories.drop_duplicates("property_id", keep="last")
+        events = pd.Series(histories["property_history"].to_numpy(dtype=object),
+                           index=histories["property_id"].astype(str).to_numpy()).explode()
+        events = events[events.map(lambda event: isinstance(event, dict))]
+        if events.empty:
+            return
+
+        history = pd.DataFrame(events.tolist(), columns=["date", "event_name", "price"])
+        history["property_id"] = events.index.to_numpy()
+        history["date"] = parse_datetime_series(history["date"])
+        history["price"] = pd.to_numeric(history["price"], errors="coerce")
+        history = history[history["date"].notna()].sort_values(["property_id", "date"], kind="stable")
+        history["zip_code"] = current["zip_code"].reindex(history["property_id"]).to_numpy()
+
+        # Asking price before each event: the last "Listed"/"Price Changed" price so far
+        prices = history["price"].where(history["event_name"].isin(PRICE_EVENTS))
+        previous_price = prices.groupby(history["property_id"]).shift().groupby(history["property_id"]).ffill()
+        first = history.groupby("property_id").cumcount() == 0
+
+        def append(mask, kind, **columns):
+            rows = history[mask]
+            self._append(rows["property_id"], rows["zip_code"], kind, rows["date"].to_numpy(), **{
+                name: value[mask].to_numpy() for name, value in columns.items()
+            })
+
+        price_changed = (history["event_name"] == "Price Changed") & history["price"].notna() & previous_price.notna()
+        append(price_changed, PRICE_CHANGE, old_price=previous_price, new_price=history["price"])
+        append((history["event_name"] == "Listed") & ~first, RELISTED,
+               old_price=previous_price, new_price=history["price"])
+        status = history["event_name"].map(HISTORY_STATUSES)
+        append(status.notna(), STATUS_CHANGE, new_status=status)
+
+    def update(self, df: pd.DataFrame, as_of: Optional[Day] = None) -> "ChangeTracker":
+        """
+        Diff a snapshot against the last known state and log the changes.
+
+        Args:
+            df: Listings with property_id and any of zip_code, status, list_price,
+                list_date and property_history
+            as_of: Time of the snapshot, the date of price and status changes
+                (now when None)
+
+        Returns:
+            self
+        """
+        if df is None or df.empty or "property_id" not in df.columns:
+            return self
+
+        when = np.datetime64(pd.Timestamp(as_of or datetime.now()).to_pydatetime(), "s")
+        current = self._snapshot(df)
+
+        with self._lock:
+            known = current.index.isin(self._state.index)
+            if known.any():
+                self._diff(current[known], when)
+            if "property_history" in df.columns and not known.all():
+                self._import_history(df, current[~known])
+
+            # New values replace the state; missing ones keep the last known value
+            current = current.fillna(self._state.reindex(current.index))
+            if known.all():
+                self._state.loc[current.index] = current
+            else:
+                self._state = pd.concat([self._state.drop(current.index[known]), current])
+        return self
+
+    def events(self, kind: Optional[str] = None, zip_code: Optional[Hashable] = None,
+               property_id: Optional[Hashable] = None, since: Optional[Day] = None,
+               until: Optional[Day] = None) -> pd.DataFrame:
+        """
+        Logged events, filtered by a scan of the log columns.
+
+        Args:
+            kind: One of EVENT_KINDS (all when None)
+            zip_code: Only events of this ZIP code
+            property_id: Only events of this property
+            since: Only events on or after this date
+            until: Only events before this date
+
+        Returns:
+            DataFrame with property_id, zip_code, event, date, old_price, new_price,
+            old_status and new_status, in log order
+        """
+        log = self._columns()
+        return self._frame(log, self._mask(log, kind, zip_code, property_id, since, until))
+
+    def _mask(self, log: Dict[str, np.ndarray], kind: Optional[str], zip_code: Optional[Hashable],
+              property_id: Optional[Hashable], since: Optional[Day], until: Optional[Day]) -> np.ndarray:
+        mask = np.ones(len(log["kind"]), dtype=bool)
+        if kind is not None:
+            mask &= log["kind"] == EVENT_KINDS.index(kind)
+        if zip_code is not None:
+            mask &= log["zip_code"] == self._zip_codes.lookup(str(zip_code))
+        if property_id is not None:
+            mask &= log["property"] == self._properties.lookup(str(property_id))
+        if since is not None:
+            mask &= log["date"] >= np.datetime64(pd.Timestamp(since).to_pydatetime(), "s")
+        if until is not None:
+            mask &= log["date"] < np.datetime64(pd.Timestamp(until).to_pydatetime(), "s")
+        return mask
+
+    def _frame(self, log: Dict[str, np.ndarray], mask: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            "property_id": self._properties.decode(log["property"][mask]),
+            "zip_code": self._zip_codes.decode(log["zip_code"][mask]),
+            "event": np.array(EVENT_KINDS, dtype=object)[log["kind"][mask]],
+            "date": log["date"][mask].astype("datetime64[ns]"),
+            "old_price": log["old_price"][mask],
+            "new_price": log["new_price"][mask],
+            "old_status": self._statuses.decode(log["old_status"][mask]),
+            "new_status": self._statuses.decode(log["new_status"][mask]),
+        })
+
+    def history(self, property_id: Hashable) -> pd.DataFrame:
+        """All events of one property, oldest first."""
+        return self.events(property_id=property_id).sort_values("date", kind="stable", ignore_index=True)
+
+    def price_drops(self, zip_code: Optional[Hashable] = None, days: Optional[int] = 30,
+                    min_drop_percent: float = 0.0, as_of: Optional[Day] = None) -> pd.DataFrame:
+        """
+        Price reductions from the log.
+
+        Args:
+            zip_code: Only this ZIP code (all when None)
+            days: Only reductions in the last days before as_of (all when None)
+            min_drop_percent: Only reductions of at least this percentage
+            as_of: End of the period (now when None)
+
+        Returns:
+            DataFrame of events with drop and drop_percent columns, most recent first
+        """
+        log = self._columns()
+        since = None if days is None else pd.Timestamp(as_of or datetime.now()) - timedelta(days=days)
+        mask = self._mask(log, PRICE_CHANGE, zip_code, None, since, None)
+        mask &= log["new_price"] < log["old_price"]
+        if min_drop_percent:
+            mask &= (log["old_price"] - log["new_price"]) >= log["old_price"] * (min_drop_percent / 100)
+
+        drops = self._frame(log, mask)
+        drops["drop"] = drops["old_price"] - drops["new_price"]
+        drops["drop_percent"] = (drops["drop"] / drops["old_price"] * 100).round(2)
+        return drops.sort_values("date", ascending=False, kind="stable", ignore_index=True)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Write the log, the interned vocabularies and the last known state to a .npz file."""
+        log = self._columns()
+        state = self._state
+        np.savez_compressed(
+            path,
+            **{f"log_{column}": values for column, values in log.items()},
+            properties=np.array(self._properties.values, dtype=str),
+            zip_codes=np.array(self._zip_codes.values, dtype=str),
+            statuses=np.array(self._statuses.values, dtype=str),
+            state_property_id=state.index.to_numpy(dtype=str),
+            state_zip_code=state["zip_code"].fillna("").to_numpy(dtype=str),
+            state_status=state["status"].fillna("").to_numpy(dtype=str),
+            state_list_price=state["list_price"].to_numpy(dtype=np.float64),
+            state_list_date=state["list_date"].to_numpy(dtype="datetime64[s]"),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "ChangeTracker":
+        """Read a tracker written by save()."""
+        tracker = cls()
+        with np.load(path) as data:
+            tracker._properties = _Vocabulary(data["properties"].tolist())
+            tracker._zip_codes = _Vocabulary(data["zip_codes"].tolist())
+            tracker._statuses = _Vocabulary(data["statuses"].tolist())
+            tracker._chunks = [{column: data[f"log_{column}"] for column in LOG_COLUMNS}]
+            tracker._state = pd.DataFrame({
+                "zip_code": pd.Series(data["state_zip_code"], dtype=object).replace("", None),
+                "status": pd.Series(data["state_status"], dtype=object).replace("", None),
+                "list_price": data["state_list_price"],
+                "list_date": data["state_list_date"].astype("datetime64[ns]"),
+            }, index=pd.Index(data["state_property_id"].astype(object), name="property_id"))
+        return tracker
@@ -0,0 +1,271 @@
+"""
+Chunked processing for state-scale property snapshots.
+
+Provides row-block iteration over DataFrames and stored snapshots (CSV, Parquet),
+streaming cleaning and per-row scoring, and two-pass investment scoring: the
+global statistics (min/max, median) are gathered in a first pass with bounded
+memory and applied chunk by chunk in the second.
+"""
+import os
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_cleaning import clean_dataframe
+from .sorting import compute_investment_score
+
+try:
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pq = None
+    PARQUET_AVAILABLE = False
+
+DEFAULT_CHUNKSIZE = 50_000
+
+#: values kept per column for medians; medians are exact up to this many values
+DEFAULT_SAMPLE_SIZE = 100_000
+
+Source = Union[pd.DataFrame, str, os.PathLike, Iterable[pd.DataFrame]]
+
+
+def iter_chunks(source: Source, chunksize: int = DEFAULT_CHUNKSIZE,
+                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over a snapshot in row blocks.
+
+    Args:
+        source: DataFrame (chunks are slices of it), path to a .csv or .parquet
+            snapshot, or an iterable of DataFrames (passed through)
+        chunksize: Rows per chunk
+        columns: Only read these columns (file sources)
+
+    Yields:
+        DataFrames of at most chunksize rows
+    """
+    if isinstance(source, pd.DataFrame):
+        frame = source if columns is None else source[columns]
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith(".parquet"):
+            if not PARQUET_AVAILABLE:
+                raise ImportError("Reading Parquet snapshots requires pyarrow (pip install pyarrow).")
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+            return
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+        return
+
+    yield from source
+
+
+def _is_reiterable(source: Source) -> bool:
+    return isinstance(source, (pd.DataFrame, str, os.PathLike, list, tuple))
+
+
+def map_chunks(source: Source, func: Callable[[pd.DataFrame], pd.DataFrame],
+               chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Apply a per-row transformation (e.g. filter_by_agent_contact) chunk by chunk.
+
+    Yields:
+        Transformed chunks
+    """
+    for chunk in iter_chunks(source, chunksize):
+        yield func(chunk)
+
+
+def clean_chunks(source: Source, chunksize: int = DEFAULT_CHUNKSIZE,
+                 add_derived_fields: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Stream clean_dataframe over a snapshot.
+
+    Yields:
+        Cleaned chunks
+    """
+    return map_chunks(source, lambda chunk: clean_dataframe(chunk, add_derived_fields=add_derived_fields), chunksize)
+
+
+class ReservoirSample:
+    """
+    Uniform random sample of a stream of numbers (Algorithm R), for medians in fixed memory.
+
+    The median is exact while no more than size values have been added.
+    """
+
+    def __init__(self, size: int = DEFAULT_SAMPLE_SIZE, seed: Optional[int] = 0):
+        self.size = size
+        self.values = np.empty(size, dtype=float)
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, values: np.ndarray) -> None:
+        values = values[~np.isnan(values)]
+        fill = min(len(values), max(0, self.size - self.seen))
+        self.values[self.seen:self.seen + fill] = values[:fill]
+
+        rest = values[fill:]
+        if len(rest):
+            # Item i (0-based position in the stream) replaces a random slot with probability size / (i + 1)
+            positions = self.seen + fill + np.arange(len(rest))
+            slots = (self._rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+            keep = slots < self.size
+            self.values[slots[keep]] = rest[keep]
+
+        self.seen += len(values)
+
+    def median(self) -> float:
+        if not self.seen:
+            return np.nan
+        return float(np.median(self.values[:min(self.seen, self.size)]))
+
+
+class InvestmentStats:
+    """
+    First pass of chunked investment scoring: the statistics of
+    sorting.investment_score_params, accumulated chunk by chunk.
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.samples = {column: ReservoirSample(sample_size) for column in ("price_per_sqft", "lot_sqft")}
+        self.minimum = {column: np.nan for column in self.samples}
+        self.maximum = {column: np.nan for column in self.samples}
+        self.seen_columns = set()
+        self.dom_max = np.nan
+
+    def update(self, chunk: pd.DataFrame) -> "InvestmentStats":
+        for column, sample in self.samples.items():
+            if column in chunk.columns:
+                self.seen_columns.add(column)
+                values = pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=float)
+                sample.add(values)
+                self.minimum[column] = np.fmin(self.minimum[column], np.nanmin(values, initial=np.inf))
+                self.maximum[column] = np.fmax(self.maximum[column], np.nanmax(values, initial=-np.inf))
+
+        if "days_on_mls" in chunk.columns:
+            self.seen_columns.add("days_on_mls")
+            self.dom_max = np.fmax(self.dom_max, chunk["days_on_mls"].fillna(0).max())
+        return self
+
+    def params(self) -> dict:
+        """Statistics in the format of sorting.investment_score_params."""
+        params = dict.fromkeys(["ppsf_median", "ppsf_min", "ppsf_max", "dom_max", "lot_median", "lot_min", "lot_max"])
+
+        for column, prefix in (("price_per_sqft", "ppsf"), ("lot_sqft", "lot")):
+            if column not in self.seen_columns:
+                continue
+            median = self.samples[column].median()
+            minimum, maximum = self.minimum[column], self.maximum[column]
+            if not np.isfinite(minimum):
+                minimum = maximum = np.nan
+            params[f"{prefix}_median"] = median
+            params[f"{prefix}_min"] = minimum
+            params[f"{prefix}_max"] = maximum
+
+        if "days_on_mls" in self.seen_columns:
+            params["dom_max"] = self.dom_max
+        return params
+
+
+def investment_params(source: Source, chunksize: int = DEFAULT_CHUNKSIZE,
+                      sample_size: int = DEFAULT_SAMPLE_SIZE) -> dict:
+    """
+    First pass: global investment score statistics of a snapshot.
+
+    Medians come from a reservoir sample of sample_size values per column
+    (exact for smaller snapshots); min/max are exact.
+    """
+    stats = InvestmentStats(sample_size)
+    columns = None
+    if isinstance(source, (str, os.PathLike)):
+        header = next(iter_chunks(source, 1), pd.DataFrame())
+        columns = [column for column in ("price_per_sqft", "lot_sqft", "days_on_mls") if column in header.columns]
+    for chunk in iter_chunks(source, chunksize, columns=columns):
+        stats.update(chunk)
+    return stats.params()
+
+
+def score_chunks(source: Source, chunksize: int = DEFAULT_CHUNKSIZE, params: Optional[dict] = None,
+                 clean: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Second pass: stream chunks with an investment_score column.
+
+    Args:
+        source: Snapshot (must be re-iterable unless params is given)
+        chunksize: Rows per chunk
+        params: Statistics from investment_params (computed with a first pass when None)
+        clean: Run clean_dataframe on each chunk first (the statistics are then
+            gathered on cleaned chunks too)
+
+    Yields:
+        Chunks with investment_score, in input order (not sorted)
+    """
+    if params is None:
+        if not _is_reiterable(source):
+            raise ValueError("Two-pass scoring needs a DataFrame, a file path or a list of chunks; "
+                             "pass params from investment_params() for one-shot iterables.")
+        params = investment_params(clean_chunks(source, chunksize) if clean else source, chunksize)
+
+    chunks = clean_chunks(source, chunksize) if clean else iter_chunks(source, chunksize)
+    for chunk in chunks:
+        yield chunk.assign(investment_score=compute_investment_score(chunk, params))
+
+
+def rank_by_investment_potential_chunked(source: Source, top_k: int = 100,
+                                         chunksize: int = DEFAULT_CHUNKSIZE,
+                                         params: Optional[dict] = None,
+                                         clean: bool = False) -> pd.DataFrame:
+    """
+    Top properties by investment potential, in bounded memory.
+
+    Only the running top_k rows are kept between chunks.
+
+    Returns:
+        DataFrame of the top_k properties, highest investment_score first
+    """
+    best: Optional[pd.DataFrame] = None
+    for chunk in score_chunks(source, chunksize, params=params, clean=clean):
+        candidates = chunk.nlargest(top_k, "investment_score")
+        best = candidates if best is None else pd.concat([best, candidates]).nlargest(top_k, "investment_score")
+
+    if best is None:
+        return pd.DataFrame()
+    return best.reset_index(drop=True)
+
+
+def write_chunks(chunks: Iterable[pd.DataFrame], path: Union[str, os.PathLike]) -> int:
+    """
+    Write streamed chunks to a .csv or .parquet file without holding them together.
+
+    Returns:
+        Number of rows written
+    """
+    path = os.fspath(path)
+    rows = 0
+    writer = None
+    try:
+        for index, chunk in enumerate(chunks):
+            if path.endswith(".parquet"):
+                if not PARQUET_AVAILABLE:
+                    raise ImportError("Writing Parquet snapshots requires pyarrow (pip install pyarrow).")
+                import pyarrow as pa
+
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
@@ -1,13 +1,10 @@
 from __future__ import annotations
 from typing import Union
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import uuid
-from ...exceptions import AuthenticationError
+from ...instrumentation import ScrapeStats
+from .auth import TOKEN_MANAGER
+from .transport import get_session, DEFAULT_POOL_SIZE
 from .models import Property, ListingType, SiteName, SearchPropertyType, ReturnType
-import json
 from pydantic import BaseModel
 
 
@@ -75,51 +72,36 @@ class ScraperInput(BaseModel):
     # Pagination control
     parallel: bool = True
 
+    # Split searches over the 10k API cap into partitions
+    exhaustive: bool = False
+
+    # Transport
+    max_workers: int = DEFAULT_POOL_SIZE  # concurrent page fetches, also the connection pool size
+    http2: bool = False
+
+    # Compact pydantic results (shared advertiser records, heavy fields dropped)
+    compact: bool = False
+    drop_fields: list[str] | None = None
 
-class Scraper:
-    session = None
 
+class Scraper:
     def __init__(
         self,
         scraper_input: ScraperInput,
+        stats: ScrapeStats | None = None,
     ):
+        self.stats = stats if stats is not None else ScrapeStats()
         self.location = scraper_input.location
         self.listing_type = scraper_input.listing_type
         self.property_type = scraper_input.property_type
 
-        if not self.session:
-            Scraper.session = requests.Session()
-            retries = Retry(
-                total=3, backoff_factor=4, status_forcelist=[429, 403], allowed_methods=frozenset(["GET", "POST"])
-            )
-
-            adapter = HTTPAdapter(max_retries=retries)
-            Scraper.session.mount("http://", adapter)
-            Scraper.session.mount("https://", adapter)
-            Scraper.session.headers.update(
-                {
-                    "accept": "application/json, text/javascript",
-                    "accept-language": "en-US,en;q=0.9",
-                    "cache-control": "no-cache",
-                    "content-type": "application/json",
-                    "origin": "https://www.realtor.com",
-                    "pragma": "no-cache",
-                    "priority": "u=1, i",
-                    "rdc-ab-tests": "commute_travel_time_variation:v1",
-                    "sec-ch-ua": '"Not)A;Brand";v="99", "Google Chrome";v="127", "Chromium";v="127"',
-                    "sec-ch-ua-mobile": "?0",
-                    "sec-ch-ua-platform": '"Windows"',
-                    "sec-fetch-dest": "empty",
-                    "sec-fetch-mode": "cors",
-                    "sec-fetch-site": "same-origin",
-                    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
-                }
-            )
-
-        if scraper_input.proxy:
-            proxy_url = scraper_input.proxy
-            proxies = {"http": proxy_url, "https": proxy_url}
-            self.session.proxies.update(proxies)
+        #: one pooled session per proxy, sized to the page-fetch concurrency
+        self.max_workers = scraper_input.max_workers
+        self.session = get_session(
+            proxy=scraper_input.proxy,
+            pool_size=scraper_input.max_workers,
+            http2=scraper_input.http2,
+        )
 
         self.listing_type = scraper_input.listing_type
         self.radius = scraper_input.radius
@@ -180,6 +162,9 @@ class Scraper:
 
         # Pagination control
         self.parallel = scraper_input.parallel
+        self.exhaustive = scraper_input.exhaustive
+
+        self.scraper_input = scraper_input
 
     def search(self) -> list[Union[Property | dict]]: ...
 
@@ -188,36 +173,6 @@ class Scraper:
 
     def handle_location(self): ...
 
-    @staticmethod
-    def get_access_token():
-        device_id = str(uuid.uuid4()).upper()
-
-        response = requests.post(
-            "https://graph.realtor.com/auth/token",
-            headers={
-                "Host": "graph.realtor.com",
-                "Accept": "*/*",
-                "Content-Type": "Application/json",
-                "X-Client-ID": "rdc_mobile_native,iphone",
-                "X-Visitor-ID": device_id,
-                "X-Client-Version": "24.21.23.679885",
-                "Accept-Language": "en-US,en;q=0.9",
-                "User-Agent": "Realtor.com/24.21.23.679885 CFNetwork/1494.0.7 Darwin/23.4.0",
-            },
-            data=json.dumps(
-                {
-                    "grant_type": "device_mobile",
-                    "device_id": device_id,
-                    "client_app_id": "rdc_mobile_native,24.21.23.679885,iphone",
-                }
-            ),
-        )
-
-        data = response.json()
-
-        if not (access_token := data.get("access_token")):
-            raise AuthenticationError(
-                "Failed to get access token, use a proxy/vpn or wait a moment and try again.", response=response
-            )
-
-        return access_token
+    def get_access_token(self, worker: int | None = None):
+        """Get a cached (or freshly minted) access token for the mobile GraphQL endpoint."""
+        return TOKEN_MANAGER.get_token(worker, stats=self.stats)
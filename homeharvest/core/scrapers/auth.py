@@ -0,0 +1,204 @@
+"""
+homeharvest.core.scrapers.auth
+~~~~~~~~~~~~
+
+Access-token management for the mobile GraphQL endpoint (graph.realtor.com).
+Tokens are cached with their expiry, refreshed in the background before they
+lapse, and shared by all threads; a small pool of device identities spreads
+parallel workers across several tokens.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+import uuid
+
+import requests
+
+from ...exceptions import AuthenticationError
+from ...instrumentation import CACHE_HITS
+
+AUTH_URL = "https://graph.realtor.com/auth/token"
+CLIENT_VERSION = "24.21.23.679885"
+
+#: used when the auth response carries no expires_in
+DEFAULT_TOKEN_TTL = 3600
+
+#: start a background refresh this many seconds before a token expires
+DEFAULT_REFRESH_MARGIN = 300
+
+DEFAULT_IDENTITY_POOL_SIZE = 4
+
+
+def mint_access_token(device_id: str) -> tuple[str, float]:
+    """
+    Request a new device token.
+
+    Args:
+        device_id: Device identity (upper-case UUID) to authenticate as
+
+    Returns:
+        Tuple of (access_token, expires_in_seconds)
+
+    Raises:
+        AuthenticationError: If the response does not contain a token
+    """
+    response = requests.post(
+        AUTH_URL,
+        headers={
+            "Host": "graph.realtor.com",
+            "Accept": "*/*",
+            "Content-Type": "Application/json",
+            "X-Client-ID": "rdc_mobile_native,iphone",
+            "X-Visitor-ID": device_id,
+            "X-Client-Version": CLIENT_VERSION,
+            "Accept-Language": "en-US,en;q=0.9",
+            "User-Agent": f"Realtor.com/{CLIENT_VERSION} CFNetwork/1494.0.7 Darwin/23.4.0",
+        },
+        data=json.dumps(
+            {
+                "grant_type": "device_mobile",
+                "device_id": device_id,
+                "client_app_id": f"rdc_mobile_native,{CLIENT_VERSION},iphone",
+            }
+        ),
+    )
+
+    data = response.json()
+
+    if not (access_token := data.get("access_token")):
+        raise AuthenticationError(
+            "Failed to get access token, use a proxy/vpn or wait a moment and try again.", response=response
+        )
+
+    try:
+        expires_in = float(data.get("expires_in") or DEFAULT_TOKEN_TTL)
+    except (TypeError, ValueError):
+        expires_in = DEFAULT_TOKEN_TTL
+
+    return access_token, expires_in
+
+
+class _DeviceIdentity:
+    """One device id and its current token."""
+
+    def __init__(self):
+        self.device_id = str(uuid.uuid4()).upper()
+        self.token: str | None = None
+        self.expires_at = 0.0
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+
+class TokenManager:
+    """
+    Thread-safe access-token cache with proactive refresh.
+
+    Each device identity holds one token. Callers on the same identity share the
+    token; the first caller to find it missing or expired mints a new one while the
+    others wait on the same lock. Once a token enters the refresh margin, one
+    background thread renews it and callers keep using the still-valid token.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_IDENTITY_POOL_SIZE,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        mint=mint_access_token,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+
+        self.refresh_margin = refresh_margin
+        self._mint = mint
+        self._identities = [_DeviceIdentity() for _ in range(pool_size)]
+        #: thread idents are aligned addresses, so they are not used as indices;
+        #: each thread instead takes the next slot once and keeps it
+        self._next_slot = itertools.count()
+        self._slot_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _identity_for(self, worker: int | None) -> _DeviceIdentity:
+        if worker is None:
+            worker = getattr(self._local, "slot", None)
+            if worker is None:
+                with self._slot_lock:
+                    worker = self._local.slot = next(self._next_slot)
+        return self._identities[worker % len(self._identities)]
+
+    def _refresh(self, identity: _DeviceIdentity) -> str:
+        token, expires_in = self._mint(identity.device_id)
+        identity.token = token
+        identity.expires_at = time.monotonic() + expires_in
+        return token
+
+    def _refresh_in_background(self, identity: _DeviceIdentity) -> None:
+        def run():
+            try:
+                with identity.lock:
+                    self._refresh(identity)
+            except Exception:
+                pass  # the current token stays valid; the next caller retries synchronously
+            finally:
+                identity.refreshing = False
+
+        threading.Thread(target=run, name="homeharvest-token-refresh", daemon=True).start()
+
+    def get_token(self, worker: int | None = None, stats=None) -> str:
+        """
+        Get a valid access token.
+
+        Args:
+            worker: Optional worker index used to pick a device identity. Defaults to the
+                calling thread, so parallel workers spread across the identity pool.
+            stats: Optional ScrapeStats; cache hits are counted on it
+
+        Returns:
+            Access token string
+
+        Raises:
+            AuthenticationError: If a new token cannot be minted
+        """
+        identity = self._identity_for(worker)
+        now = time.monotonic()
+
+        token = identity.token
+        if token and now < identity.expires_at:
+            if stats is not None:
+                stats.incr(CACHE_HITS)
+
+            if now >= identity.expires_at - self.refresh_margin:
+                with identity.lock:
+                    start_refresh = not identity.refreshing
+                    identity.refreshing = True
+                if start_refresh:
+                    self._refresh_in_background(identity)
+
+            return token
+
+        with identity.lock:
+            #: another thread may have refreshed while we waited
+            if identity.token and time.monotonic() < identity.expires_at:
+                if stats is not None:
+                    stats.incr(CACHE_HITS)
+                return identity.token
+            return self._refresh(identity)
+
+    def invalidate(self, token: str | None = None) -> None:
+        """
+        Drop cached tokens, e.g. after the API rejects one.
+
+        Args:
+            token: Only drop this token; drops every cached token when omitted
+        """
+        for identity in self._identities:
+            with identity.lock:
+                if token is None or identity.token == token:
+                    identity.token = None
+                    identity.expires_at = 0.0
+
+
+TOKEN_MANAGER = TokenManager()
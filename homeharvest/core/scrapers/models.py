@@ -216,6 +216,7 @@ class Property(BaseModel):
     estimated_value: int | None = None
     tax: int | None = None
     tax_history: list[TaxHistory] | None = None
+    property_history: list[PropertyHistory] | None = Field(None, description="Listing events of the home (listed, price changes, sold, ...)")
 
     advertisers: Advertisers | None = None
     
@@ -317,6 +318,12 @@ class TaxHistory(BaseModel):
     assessed_year: int | None = Field(None, description="Assessment year for which taxes were billed")
 
 
+class PropertyHistory(BaseModel):
+    date: datetime | None = None
+    event_name: str | None = Field(None, description="Listing event, e.g. 'Listed', 'Price Changed', 'Sold'")
+    price: int | None = None
+
+
 class TaxRecord(BaseModel):
     cl_id: str | None = None
     public_record_id: str | None = None
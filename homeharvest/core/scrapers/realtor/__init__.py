@@ -21,12 +21,19 @@ from tenacity import (
 )
 
 from .. import Scraper
+from ....dates import parse_datetime, parse_utc_datetime
+from ....instrumentation import timed, RETRIES
 from ..models import (
     Property,
     ListingType,
     ReturnType
 )
 from .queries import GENERAL_RESULTS_QUERY, SEARCH_HOMES_DATA, HOMES_DATA, HOME_FRAGMENT
+from .filters import compile_filters
+from .pagination import PaginationPlanner
+from .compact import CompactProperties
+from .partitioning import SearchPartitioner
+from .sort import CALCULATED_SORT_FIELDS, sort_fields, sort_homes
 from .processors import (
     process_property,
     process_extra_property_details,
@@ -42,9 +49,14 @@ class RealtorScraper(Scraper):
     NUM_PROPERTY_WORKERS = 20
     DEFAULT_PAGE_SIZE = 200
 
-    def __init__(self, scraper_input):
-        super().__init__(scraper_input)
+    def __init__(self, scraper_input, stats=None):
+        super().__init__(scraper_input, stats=stats)
+        #: resolved location of the last search (includes the centroid of address searches)
+        self.location_info = None
+        #: shared records and dropped fields of compact mode
+        self.compact = CompactProperties(scraper_input.drop_fields) if scraper_input.compact else None
 
+    @timed("handle_location")
     def handle_location(self):
         # Get client_id from listing_type
         if self.listing_type is None:
@@ -65,6 +77,7 @@ class RealtorScraper(Scraper):
             self.ADDRESS_AUTOCOMPLETE_URL,
             params=params,
         )
+        self.stats.record_response(response)
         response_json = response.json()
 
         result = response_json["autocomplete"]
@@ -92,6 +105,7 @@ class RealtorScraper(Scraper):
         }
 
         response = self.session.post(self.SEARCH_GQL_URL, json=payload)
+        self.stats.record_response(response)
         response_json = response.json()
 
         property_info = response_json["data"]["property"]
@@ -122,21 +136,25 @@ class RealtorScraper(Scraper):
         }
 
         response = self.session.post(self.SEARCH_GQL_URL, json=payload)
+        self.stats.record_response(response)
         response_json = response.json()
 
         property_info = response_json["data"]["home"]
 
         if self.return_type != ReturnType.raw:
-            return [process_property(property_info, self.mls_only, self.extra_property_data, 
-                                   self.exclude_pending, self.listing_type, get_key, process_extra_property_details)]
+            return [self._process_property(property_info)]
         else:
             return [property_info]
 
+    def _process_property(self, result: dict) -> Property | None:
+        with self.stats.span("process_property"):
+            return process_property(result, self.mls_only, self.extra_property_data,
+                                    self.exclude_pending, self.listing_type, get_key, process_extra_property_details,
+                                    compact=self.compact)
 
-
-    def general_search(self, variables: dict, search_type: str) -> Dict[str, Union[int, Union[list[Property], list[dict]]]]:
+    def build_search_query(self, variables: dict, search_type: str, results_query: str = GENERAL_RESULTS_QUERY) -> str:
         """
-        Handles a location area & returns a list of properties
+        Builds the home_search GraphQL query for this scraper's filters
         """
 
         date_param = ""
@@ -177,24 +195,14 @@ class RealtorScraper(Scraper):
 
             if has_hour_precision and (self.date_from or self.date_to):
                 # Hour-based datetime filtering: extract date parts for API, client-side filter by hours
-                from datetime import datetime
-
                 min_date = None
                 max_date = None
 
-                if self.date_from:
-                    try:
-                        dt_from = datetime.fromisoformat(self.date_from.replace('Z', '+00:00'))
-                        min_date = dt_from.strftime("%Y-%m-%d")
-                    except (ValueError, AttributeError):
-                        pass
+                if dt_from := parse_datetime(self.date_from):
+                    min_date = dt_from.strftime("%Y-%m-%d")
 
-                if self.date_to:
-                    try:
-                        dt_to = datetime.fromisoformat(self.date_to.replace('Z', '+00:00'))
-                        max_date = dt_to.strftime("%Y-%m-%d")
-                    except (ValueError, AttributeError):
-                        pass
+                if dt_to := parse_datetime(self.date_to):
+                    max_date = dt_to.strftime("%Y-%m-%d")
 
                 if min_date and max_date:
                     date_param = f'{date_field}: {{ min: "{min_date}", max: "{max_date}" }}'
@@ -278,8 +286,13 @@ class RealtorScraper(Scraper):
         property_filters_param = "\n".join(property_filters)
 
         # Build sort parameter
-        if self.sort_by:
-            sort_param = f"sort: [{{ field: {self.sort_by}, direction: {self.sort_direction} }}]"
+        api_sort = [(field, "desc" if descending else "asc")
+                    for field, descending in sort_fields(self.sort_by, self.sort_direction)
+                    if field not in CALCULATED_SORT_FIELDS]
+        if api_sort:
+            sort_param = "sort: [{}]".format(
+                ", ".join(f"{{ field: {field}, direction: {direction} }}" for field, direction in api_sort)
+            )
         elif isinstance(self.listing_type, ListingType) and self.listing_type == ListingType.SOLD:
             sort_param = "sort: [{ field: sold_date, direction: desc }]"
         else:
@@ -297,7 +310,7 @@ class RealtorScraper(Scraper):
 
         # Build bucket parameter (only use fractal sort if no custom sort is specified)
         bucket_param = ""
-        if not self.sort_by:
+        if not api_sort:
             bucket_param = 'bucket: { sort: "fractal_v1.1.3_fr" }'
 
         # Build status parameter
@@ -359,7 +372,7 @@ class RealtorScraper(Scraper):
                 property_filters_param,
                 pending_or_contingent_param,
                 sort_param,
-                GENERAL_RESULTS_QUERY,
+                results_query,
             )
         elif search_type == "area":  #: general search, came from a general location
             query = """query Home_search(
@@ -396,7 +409,7 @@ class RealtorScraper(Scraper):
                 pending_or_contingent_param,
                 bucket_param,
                 sort_param,
-                GENERAL_RESULTS_QUERY,
+                results_query,
             )
         else:  #: general search, came from an address
             query = (
@@ -412,32 +425,61 @@ class RealtorScraper(Scraper):
                             offset: $offset
                         ) %s
                     }"""
-                % GENERAL_RESULTS_QUERY
+                % results_query
             )
 
+        return query
+
+    def _post_search(self, variables: dict, search_type: str, results_query: str = GENERAL_RESULTS_QUERY) -> dict | None:
+        """
+        Runs a search query and returns its home_search/property_search block, or None
+        """
+        query = self.build_search_query(variables, search_type, results_query)
         payload = {
             "query": query,
             "variables": variables,
         }
 
         response = self.session.post(self.SEARCH_GQL_URL, json=payload)
+        self.stats.record_response(response)
         response_json = response.json()
         search_key = "home_search" if "home_search" in query else "property_search"
 
-        properties: list[Union[Property, dict]] = []
-
         if (
             response_json is None
             or "data" not in response_json
             or response_json["data"] is None
             or search_key not in response_json["data"]
             or response_json["data"][search_key] is None
-            or "results" not in response_json["data"][search_key]
         ):
+            return None
+
+        return response_json["data"][search_key]
+
+    @timed("probe_total")
+    def probe_total(self, variables: dict, search_type: str) -> int:
+        """
+        Returns the number of matching listings without fetching any results
+        """
+        search_data = self._post_search(variables | {"offset": 0}, search_type, results_query="{ total }")
+        if not search_data:
+            return 0
+        return search_data.get("total") or 0
+
+    @timed("general_search")
+    def general_search(self, variables: dict, search_type: str) -> Dict[str, Union[int, Union[list[Property], list[dict]]]]:
+        """
+        Handles a location area & returns a list of properties
+        """
+        search_data = self._post_search(variables, search_type)
+
+        properties: list[Union[Property, dict]] = []
+
+        if search_data is None or "results" not in search_data:
             return {"total": 0, "properties": []}
 
-        properties_list = response_json["data"][search_key]["results"]
-        total_properties = response_json["data"][search_key]["total"]
+        properties_list = search_data["results"]
+        total_properties = search_data["total"]
         offset = variables.get("offset", 0)
 
         #: limit the number of properties to be processed
@@ -463,8 +505,7 @@ class RealtorScraper(Scraper):
             with ThreadPoolExecutor(max_workers=self.NUM_PROPERTY_WORKERS) as executor:
                 # Store futures with their indices to maintain sort order
                 futures_with_indices = [
-                    (i, executor.submit(process_property, result, self.mls_only, self.extra_property_data,
-                                       self.exclude_pending, self.listing_type, get_key, process_extra_property_details))
+                    (i, executor.submit(self._process_property, result))
                     for i, result in enumerate(properties_list)
                 ]
 
@@ -487,42 +528,54 @@ class RealtorScraper(Scraper):
         }
 
     def search(self):
-        location_info = self.handle_location()
+        location_info = self.location_info = self.handle_location()
         if not location_info:
             return []
 
+        if location_info["area_type"] == "address" and not self.radius:  #: single address search, non comps
+            property_id = location_info["mpr_id"]
+            return self.handle_home(property_id)
+
+        search_context = self.get_search_variables(location_info)
+        if not search_context:
+            return []
+
+        search_type, search_variables = search_context
+
+        if self.exhaustive:
+            return SearchPartitioner(self).search(search_variables, search_type)
+
+        return self.search_area(search_variables, search_type)
+
+    def get_search_variables(self, location_info: dict) -> tuple[str, dict] | None:
+        """
+        Builds the (search_type, variables) pair for a resolved area or comps location
+        """
         location_type = location_info["area_type"]
 
         search_variables = {
             "offset": self.offset,
         }
 
-        search_type = (
-            "comps"
-            if self.radius and location_type == "address"
-            else "address" if location_type == "address" and not self.radius else "area"
-        )
-        if location_type == "address":
-            if not self.radius:  #: single address search, non comps
-                property_id = location_info["mpr_id"]
-                return self.handle_home(property_id)
-
-            else:  #: general search, comps (radius)
-                if not location_info.get("centroid"):
-                    return []
-
-                coordinates = list(location_info["centroid"].values())
-                search_variables |= {
-                    "coordinates": coordinates,
-                    "radius": "{}mi".format(self.radius),
-                }
+        if location_type == "address":  #: general search, comps (radius)
+            search_type = "comps"
+            if not location_info.get("centroid"):
+                return None
+
+            coordinates = list(location_info["centroid"].values())
+            search_variables |= {
+                "coordinates": coordinates,
+                "radius": "{}mi".format(self.radius),
+            }
 
         elif location_type == "postal_code":
+            search_type = "area"
             search_variables |= {
                 "postal_code": location_info.get("postal_code"),
             }
 
         else:  #: general search, location
+            search_type = "area"
             search_variables |= {
                 "city": location_info.get("city"),
                 "county": location_info.get("county"),
@@ -534,153 +587,65 @@ class RealtorScraper(Scraper):
         if self.foreclosure:
             search_variables["foreclosure"] = self.foreclosure
 
+        return search_type, search_variables
+
+    def search_area(self, search_variables: dict, search_type: str):
+        """
+        Paginates an area/comps search, then applies client-side filters and sorting
+        """
         result = self.general_search(search_variables, search_type=search_type)
         total = result["total"]
         homes = result["properties"]
 
-        # Fetch remaining pages based on parallel parameter
-        if self.offset + self.DEFAULT_PAGE_SIZE < min(total, self.offset + self.limit):
-            if self.parallel:
-                # Parallel mode: Fetch all remaining pages in parallel
-                with ThreadPoolExecutor() as executor:
-                    futures_with_offsets = [
-                        (i, executor.submit(
-                            self.general_search,
-                            variables=search_variables | {"offset": i},
-                            search_type=search_type,
-                        ))
-                        for i in range(
-                            self.offset + self.DEFAULT_PAGE_SIZE,
-                            min(total, self.offset + self.limit),
-                            self.DEFAULT_PAGE_SIZE,
-                        )
-                    ]
-
-                    # Collect results and sort by offset to preserve API sort order
-                    results = []
-                    for offset, future in futures_with_offsets:
-                        results.append((offset, future.result()["properties"]))
-
-                    results.sort(key=lambda x: x[0])
-                    for offset, properties in results:
-                        homes.extend(properties)
-            else:
-                # Sequential mode: Fetch pages one by one with early termination checks
-                for current_offset in range(
-                    self.offset + self.DEFAULT_PAGE_SIZE,
-                    min(total, self.offset + self.limit),
-                    self.DEFAULT_PAGE_SIZE,
-                ):
-                    # Check if we should continue based on time-based filters
-                    if not self._should_fetch_more_pages(homes):
-                        break
-
-                    result = self.general_search(
-                        variables=search_variables | {"offset": current_offset},
-                        search_type=search_type,
-                    )
-                    page_properties = result["properties"]
-                    homes.extend(page_properties)
-
-        # Apply client-side hour-based filtering if needed
-        # (API only supports day-level filtering, so we post-filter for hour precision)
-        has_hour_precision = (self.date_from_precision == "hour" or self.date_to_precision == "hour")
-        if self.past_hours or has_hour_precision:
-            homes = self._apply_hour_based_date_filter(homes)
-        # Apply client-side date filtering for PENDING properties
-        # (server-side filters are broken in the API)
-        elif self.listing_type == ListingType.PENDING and (self.last_x_days or self.date_from):
-            homes = self._apply_pending_date_filter(homes)
-
-        # Apply client-side filtering by last_update_date if specified
-        if self.updated_since or self.updated_in_past_hours:
-            homes = self._apply_last_update_date_filter(homes)
-
-        # Apply client-side tag filtering if specified
-        if self.tag_filters or self.tag_exclude:
-            homes = self._apply_tag_filters(homes)
-
-        # Apply additional property filters if specified
-        if any([self.hoa_fee_min, self.hoa_fee_max, self.stories_min, self.stories_max,
-                self.garage_spaces_min, self.garage_spaces_max, self.has_pool, self.has_garage,
-                self.waterfront, self.has_view]):
-            homes = self._apply_additional_filters(homes)
+        # Fetch remaining pages (in parallel waves, or sequentially), stopping early
+        # once the sort order has moved past the client-side filter window
+        homes.extend(PaginationPlanner(self).fetch_remaining(homes, total, search_variables, search_type))
+
+        # Apply client-side filters in one pass: hour-precision and PENDING dates (the API only
+        # supports day-level / broken filtering for these), last_update_date, tags and the
+        # additional property filters
+        home_filter = compile_filters(self)
+        if home_filter.active:
+            with self.stats.span("apply_client_filters"):
+                homes = home_filter.apply(homes)
 
         # Apply client-side sort to ensure results are properly ordered
         # This is necessary after filtering and to guarantee sort order across page boundaries
         if self.sort_by:
-            homes = self._apply_sort(homes)
+            with self.stats.span("apply_sort"):
+                homes = self._apply_sort(homes)
 
         # Apply raw data filters (exclude_pending and mls_only) for raw return type
         # These filters are normally applied in process_property() but are bypassed for raw data
         if self.return_type == ReturnType.raw:
-            homes = self._apply_raw_data_filters(homes)
+            with self.stats.span("apply_raw_data_filters"):
+                homes = self._apply_raw_data_filters(homes)
 
         return homes
 
-    def _apply_hour_based_date_filter(self, homes):
-        """Apply client-side hour-based date filtering for all listing types.
-
-        This is used when past_hours or date_from/date_to have hour precision,
-        since the API only supports day-level filtering.
-        """
-        if not homes:
-            return homes
-
-        from datetime import datetime, timedelta
-
-        # Determine date range with hour precision
-        date_range = None
+    def _get_hour_based_date_range(self):
+        """Get the hour-precision date range from past_hours or date_from/date_to."""
+        from datetime import datetime, timedelta, timezone
 
         if self.past_hours:
-            cutoff_datetime = datetime.now() - timedelta(hours=self.past_hours)
-            date_range = {'type': 'since', 'date': cutoff_datetime}
-        elif self.date_from or self.date_to:
-            try:
-                from_datetime = None
-                to_datetime = None
-
-                if self.date_from:
-                    from_datetime_str = self.date_from.replace('Z', '+00:00') if self.date_from.endswith('Z') else self.date_from
-                    from_datetime = datetime.fromisoformat(from_datetime_str).replace(tzinfo=None)
-
-                if self.date_to:
-                    to_datetime_str = self.date_to.replace('Z', '+00:00') if self.date_to.endswith('Z') else self.date_to
-                    to_datetime = datetime.fromisoformat(to_datetime_str).replace(tzinfo=None)
-
-                if from_datetime and to_datetime:
-                    date_range = {'type': 'range', 'from_date': from_datetime, 'to_date': to_datetime}
-                elif from_datetime:
-                    date_range = {'type': 'since', 'date': from_datetime}
-                elif to_datetime:
-                    date_range = {'type': 'until', 'date': to_datetime}
-            except (ValueError, AttributeError):
-                return homes  # If parsing fails, return unfiltered
-
-        if not date_range:
-            return homes
-
-        # Determine which date field to use based on listing type
-        date_field_name = self._get_date_field_for_listing_type()
-
-        filtered_homes = []
-
-        for home in homes:
-            # Extract the appropriate date for this property
-            property_date = self._extract_date_from_home(home, date_field_name)
-
-            # Handle properties without dates
-            if property_date is None:
-                # For PENDING, include contingent properties without pending_date
-                if self.listing_type == ListingType.PENDING and self._is_contingent(home):
-                    filtered_homes.append(home)
-                continue
-
-            # Check if property date falls within the specified range
-            if self._is_datetime_in_range(property_date, date_range):
-                filtered_homes.append(home)
+            # Use UTC now, strip timezone to match naive UTC property dates
+            cutoff_datetime = (datetime.now(timezone.utc) - timedelta(hours=self.past_hours)).replace(tzinfo=None)
+            return {'type': 'since', 'date': cutoff_datetime}
+
+        if self.date_from or self.date_to:
+            from_datetime = parse_utc_datetime(self.date_from)
+            to_datetime = parse_utc_datetime(self.date_to)
+            if (self.date_from and not from_datetime) or (self.date_to and not to_datetime):
+                return None  # If parsing fails, leave unfiltered
+
+            if from_datetime and to_datetime:
+                return {'type': 'range', 'from_date': from_datetime, 'to_date': to_datetime}
+            elif from_datetime:
+                return {'type': 'since', 'date': from_datetime}
+            elif to_datetime:
+                return {'type': 'until', 'date': to_datetime}
 
-        return filtered_homes
+        return None
 
     def _get_date_field_for_listing_type(self):
         """Get the appropriate date field name for the current listing type."""
@@ -691,409 +656,43 @@ class RealtorScraper(Scraper):
         else:  # FOR_SALE or FOR_RENT
             return 'list_date'
 
-    def _extract_date_from_home(self, home, date_field_name):
-        """Extract a date field from a home (handles both dict and Property object).
-
-        Falls back to last_status_change_date if the primary date field is not available,
-        providing more precise filtering for PENDING/SOLD properties.
-        """
-        if isinstance(home, dict):
-            date_value = home.get(date_field_name)
-        else:
-            date_value = getattr(home, date_field_name, None)
-
-        if date_value:
-            return self._parse_date_value(date_value)
-
-        # Fallback to last_status_change_date if primary date field is missing
-        # This is useful for PENDING/SOLD properties where the specific date might be unavailable
-        if isinstance(home, dict):
-            fallback_date = home.get('last_status_change_date')
-        else:
-            fallback_date = getattr(home, 'last_status_change_date', None)
-
-        if fallback_date:
-            return self._parse_date_value(fallback_date)
-
-        return None
-
-    def _is_datetime_in_range(self, date_obj, date_range):
-        """Check if a datetime object falls within the specified date range (with hour precision)."""
-        if date_range['type'] == 'since':
-            return date_obj >= date_range['date']
-        elif date_range['type'] == 'until':
-            return date_obj <= date_range['date']
-        elif date_range['type'] == 'range':
-            return date_range['from_date'] <= date_obj <= date_range['to_date']
-        return False
-
-    def _apply_pending_date_filter(self, homes):
-        """Apply client-side date filtering for PENDING properties based on pending_date field.
-        For contingent properties without pending_date, tries fallback date fields."""
-        if not homes:
-            return homes
-            
-        from datetime import datetime, timedelta
-        
-        # Determine date range for filtering
-        date_range = self._get_date_range()
-        if not date_range:
-            return homes
-            
-        filtered_homes = []
-        
-        for home in homes:
-            # Extract the best available date for this property
-            property_date = self._extract_property_date_for_filtering(home)
-            
-            # Handle properties without dates (include contingent properties)
-            if property_date is None:
-                if self._is_contingent(home):
-                    filtered_homes.append(home)  # Include contingent without date filter
-                continue
-            
-            # Check if property date falls within the specified range
-            if self._is_date_in_range(property_date, date_range):
-                filtered_homes.append(home)
-                
-        return filtered_homes
-    
-    def _get_pending_date(self, home):
-        """Extract pending_date from a home property (handles both dict and Property object)."""
-        if isinstance(home, dict):
-            return home.get('pending_date')
-        else:
-            # Assume it's a Property object
-            return getattr(home, 'pending_date', None)
-    
-    
-    def _is_contingent(self, home):
-        """Check if a property is contingent."""
-        if isinstance(home, dict):
-            flags = home.get('flags', {})
-            return flags.get('is_contingent', False)
-        else:
-            # Property object - check flags attribute
-            if hasattr(home, 'flags') and home.flags:
-                return getattr(home.flags, 'is_contingent', False)
-            return False
-
-    def _apply_last_update_date_filter(self, homes):
-        """Apply client-side filtering by last_update_date.
-
-        This is used when updated_since or updated_in_past_hours are specified.
-        Filters properties based on when they were last updated.
-        """
-        if not homes:
-            return homes
-
+    def _get_last_update_date_range(self):
+        """Get the last_update_date range from updated_in_past_hours or updated_since."""
         from datetime import datetime, timedelta, timezone
 
-        # Determine date range for last_update_date filtering
-        date_range = None
-
         if self.updated_in_past_hours:
-            # Use UTC now, strip timezone to match naive property dates
+            # Use UTC now, strip timezone to match naive UTC property dates
             cutoff_datetime = (datetime.now(timezone.utc) - timedelta(hours=self.updated_in_past_hours)).replace(tzinfo=None)
-            date_range = {'type': 'since', 'date': cutoff_datetime}
-        elif self.updated_since:
-            try:
-                since_datetime_str = self.updated_since.replace('Z', '+00:00') if self.updated_since.endswith('Z') else self.updated_since
-                since_datetime = datetime.fromisoformat(since_datetime_str).replace(tzinfo=None)
-                date_range = {'type': 'since', 'date': since_datetime}
-            except (ValueError, AttributeError):
-                return homes  # If parsing fails, return unfiltered
-
-        if not date_range:
-            return homes
-
-        filtered_homes = []
-
-        for home in homes:
-            # Extract last_update_date from the property
-            property_date = self._extract_date_from_home(home, 'last_update_date')
-
-            # Skip properties without last_update_date
-            if property_date is None:
-                continue
-
-            # Check if property date falls within the specified range
-            if self._is_datetime_in_range(property_date, date_range):
-                filtered_homes.append(home)
-
-        return filtered_homes
-
-    def _apply_tag_filters(self, homes):
-        """Apply client-side tag filtering.
-
-        Filters properties based on tags from realtor.com.
-        Supports three match types:
-        - 'any': Property has at least one of the specified tags (OR logic)
-        - 'all': Property has all of the specified tags (AND logic)
-        - 'exact': Property tags exactly match the specified tags (exact match)
-
-        Also supports tag exclusion via tag_exclude parameter.
-        """
-        if not homes:
-            return homes
-
-        # If no tag filters specified, return all homes
-        if not self.tag_filters and not self.tag_exclude:
-            return homes
-
-        filtered_homes = []
-
-        for home in homes:
-            # Extract tags from property
-            # Tags can be in raw dict or Property object
-            if isinstance(home, dict):
-                property_tags = home.get('tags', []) or []
-            else:
-                property_tags = getattr(home, 'tags', []) or []
-
-            # Convert to lowercase for case-insensitive matching
-            property_tags_lower = [tag.lower() for tag in property_tags] if property_tags else []
-
-            # Check exclusion filters first
-            if self.tag_exclude:
-                exclude_tags_lower = [tag.lower() for tag in self.tag_exclude]
-                if any(excluded_tag in property_tags_lower for excluded_tag in exclude_tags_lower):
-                    continue  # Skip this property
-
-            # If no inclusion filters, just apply exclusion
-            if not self.tag_filters:
-                filtered_homes.append(home)
-                continue
-
-            # Apply inclusion filters
-            filter_tags_lower = [tag.lower() for tag in self.tag_filters]
-
-            if self.tag_match_type == "any":
-                # Property must have at least one of the specified tags
-                if any(filter_tag in property_tags_lower for filter_tag in filter_tags_lower):
-                    filtered_homes.append(home)
-            elif self.tag_match_type == "all":
-                # Property must have all of the specified tags
-                if all(filter_tag in property_tags_lower for filter_tag in filter_tags_lower):
-                    filtered_homes.append(home)
-            elif self.tag_match_type == "exact":
-                # Property tags must exactly match specified tags (order doesn't matter)
-                if set(property_tags_lower) == set(filter_tags_lower):
-                    filtered_homes.append(home)
-
-        return filtered_homes
-
-    def _apply_additional_filters(self, homes):
-        """Apply additional property filters (HOA, stories, garage, pool, views, etc.)
-
-        Client-side filtering for property characteristics.
-        """
-        if not homes:
-            return homes
-
-        filtered_homes = []
+            return {'type': 'since', 'date': cutoff_datetime}
 
-        for home in homes:
-            # Extract property data
-            if isinstance(home, dict):
-                hoa_fee = home.get('hoa_fee')
-                stories = home.get('stories')
-                garage = home.get('parking_garage')  # Number of garage spaces
-                tags = home.get('tags', []) or []
-            else:
-                hoa_fee = getattr(home, 'hoa_fee', None)
-                stories = getattr(home, 'stories', None)
-                garage = getattr(home, 'parking_garage', None)
-                tags = getattr(home, 'tags', []) or []
-
-            # Convert tags to lowercase for matching
-            tags_lower = [tag.lower() for tag in tags] if tags else []
-
-            # HOA fee filters
-            if self.hoa_fee_min is not None and hoa_fee is not None and hoa_fee < self.hoa_fee_min:
-                continue
-            if self.hoa_fee_max is not None and hoa_fee is not None and hoa_fee > self.hoa_fee_max:
-                continue
-
-            # Stories filters
-            if self.stories_min is not None and stories is not None and stories < self.stories_min:
-                continue
-            if self.stories_max is not None and stories is not None and stories > self.stories_max:
-                continue
-
-            # Garage spaces filters
-            if self.garage_spaces_min is not None and garage is not None and garage < self.garage_spaces_min:
-                continue
-            if self.garage_spaces_max is not None and garage is not None and garage > self.garage_spaces_max:
-                continue
-
-            # Boolean filters using tags
-            if self.has_pool is not None:
-                has_pool_tag = any('pool' in tag or 'spa' in tag for tag in tags_lower)
-                if self.has_pool and not has_pool_tag:
-                    continue
-                if not self.has_pool and has_pool_tag:
-                    continue
-
-            if self.has_garage is not None:
-                has_garage_tag = any('garage' in tag for tag in tags_lower) or (garage is not None and garage > 0)
-                if self.has_garage and not has_garage_tag:
-                    continue
-                if not self.has_garage and has_garage_tag:
-                    continue
-
-            if self.waterfront is not None:
-                is_waterfront = any('waterfront' in tag or 'water' in tag for tag in tags_lower)
-                if self.waterfront and not is_waterfront:
-                    continue
-                if not self.waterfront and is_waterfront:
-                    continue
-
-            if self.has_view is not None:
-                has_view_tag = any('view' in tag for tag in tags_lower)
-                if self.has_view and not has_view_tag:
-                    continue
-                if not self.has_view and has_view_tag:
-                    continue
-
-            # If all filters pass, include the home
-            filtered_homes.append(home)
+        if self.updated_since:
+            since_datetime = parse_utc_datetime(self.updated_since)
+            if since_datetime is None:
+                return None  # If parsing fails, leave unfiltered
+            return {'type': 'since', 'date': since_datetime}
 
-        return filtered_homes
+        return None
 
     def _get_date_range(self):
         """Get the date range for filtering based on instance parameters."""
         from datetime import datetime, timedelta, timezone
 
         if self.last_x_days:
-            # Use UTC now, strip timezone to match naive property dates
+            # Use UTC now, strip timezone to match naive UTC property dates
             cutoff_date = (datetime.now(timezone.utc) - timedelta(days=self.last_x_days)).replace(tzinfo=None)
             return {'type': 'since', 'date': cutoff_date}
         elif self.date_from and self.date_to:
-            try:
-                # Parse and strip timezone to match naive property dates
-                from_date_str = self.date_from.replace('Z', '+00:00') if self.date_from.endswith('Z') else self.date_from
-                to_date_str = self.date_to.replace('Z', '+00:00') if self.date_to.endswith('Z') else self.date_to
-                from_date = datetime.fromisoformat(from_date_str).replace(tzinfo=None)
-                to_date = datetime.fromisoformat(to_date_str).replace(tzinfo=None)
-                return {'type': 'range', 'from_date': from_date, 'to_date': to_date}
-            except ValueError:
+            # Convert offsets to UTC, then strip timezone to match naive UTC property dates
+            from_date = parse_utc_datetime(self.date_from)
+            to_date = parse_utc_datetime(self.date_to)
+            if from_date is None or to_date is None:
                 return None
-        return None
-    
-    def _extract_property_date_for_filtering(self, home):
-        """Extract pending_date from a property for filtering.
-        
-        Returns parsed datetime object or None.
-        """
-        date_value = self._get_pending_date(home)
-        if date_value:
-            return self._parse_date_value(date_value)
+            return {'type': 'range', 'from_date': from_date, 'to_date': to_date}
         return None
     
     def _parse_date_value(self, date_value):
-        """Parse a date value (string or datetime) into a timezone-naive datetime object."""
-        from datetime import datetime
-        
-        if isinstance(date_value, datetime):
-            return date_value.replace(tzinfo=None)
-        
-        if not isinstance(date_value, str):
-            return None
-            
-        try:
-            # Handle timezone indicators
-            if date_value.endswith('Z'):
-                date_value = date_value[:-1] + '+00:00'
-            elif '.' in date_value and date_value.endswith('Z'):
-                date_value = date_value.replace('Z', '+00:00')
-            
-            # Try ISO format first
-            try:
-                parsed_date = datetime.fromisoformat(date_value)
-                return parsed_date.replace(tzinfo=None)
-            except ValueError:
-                # Try simple datetime format: '2025-08-29 00:00:00'
-                return datetime.strptime(date_value, '%Y-%m-%d %H:%M:%S')
-                
-        except (ValueError, AttributeError):
-            return None
-    
-    def _is_date_in_range(self, date_obj, date_range):
-        """Check if a datetime object falls within the specified date range."""
-        if date_range['type'] == 'since':
-            return date_obj >= date_range['date']
-        elif date_range['type'] == 'range':
-            return date_range['from_date'] <= date_obj <= date_range['to_date']
-        return False
-
-    def _should_fetch_more_pages(self, first_page):
-        """Determine if we should continue pagination based on first page results.
-
-        This optimization prevents unnecessary API calls when using time-based filters
-        with date sorting. If the last property on page 1 is already outside the time
-        window, all future pages will also be outside (due to sort order).
-
-        Args:
-            first_page: List of properties from the first page
-
-        Returns:
-            bool: True if we should continue pagination, False to stop early
-        """
-        from datetime import datetime, timedelta, timezone
-
-        # Check for last_update_date filters
-        if (self.updated_since or self.updated_in_past_hours) and self.sort_by == "last_update_date":
-            if not first_page:
-                return False
-
-            last_property = first_page[-1]
-            last_date = self._extract_date_from_home(last_property, 'last_update_date')
-
-            if not last_date:
-                return True
-
-            # Build date range for last_update_date filter
-            if self.updated_since:
-                try:
-                    cutoff_datetime = datetime.fromisoformat(self.updated_since.replace('Z', '+00:00') if self.updated_since.endswith('Z') else self.updated_since)
-                    # Strip timezone to match naive datetimes from _parse_date_value
-                    cutoff_datetime = cutoff_datetime.replace(tzinfo=None)
-                    date_range = {'type': 'since', 'date': cutoff_datetime}
-                except ValueError:
-                    return True
-            elif self.updated_in_past_hours:
-                # Use UTC now, strip timezone to match naive property dates
-                cutoff_datetime = (datetime.now(timezone.utc) - timedelta(hours=self.updated_in_past_hours)).replace(tzinfo=None)
-                date_range = {'type': 'since', 'date': cutoff_datetime}
-            else:
-                return True
-
-            return self._is_datetime_in_range(last_date, date_range)
-
-        # Check for PENDING date filters
-        if (self.listing_type == ListingType.PENDING and
-            (self.last_x_days or self.past_hours or self.date_from) and
-            self.sort_by == "pending_date"):
-
-            if not first_page:
-                return False
-
-            last_property = first_page[-1]
-            last_date = self._extract_date_from_home(last_property, 'pending_date')
-
-            if not last_date:
-                return True
-
-            # Build date range for pending date filter
-            date_range = self._get_date_range()
-            if not date_range:
-                return True
-
-            return self._is_datetime_in_range(last_date, date_range)
-
-        # No optimization applicable, continue pagination
-        return True
+        """Parse a date value (string or datetime) into a naive UTC datetime object."""
+        return parse_utc_datetime(date_value)
 
     def _apply_sort(self, homes):
         """Apply client-side sorting to ensure results are properly ordered.
@@ -1102,6 +701,8 @@ class RealtorScraper(Scraper):
         1. Multi-page results need to be re-sorted after concatenation
         2. Filtering operations may disrupt the original sort order
 
+        Every sort_by field is applied with its own direction; missing values sort last.
+
         Args:
             homes: List of properties (either dicts or Property objects)
 
@@ -1111,48 +712,7 @@ class RealtorScraper(Scraper):
         if not homes or not self.sort_by:
             return homes
 
-        def get_sort_key(home):
-            """Extract the sort field value from a home (handles both dict and Property object)."""
-            from datetime import datetime
-
-            if isinstance(home, dict):
-                value = home.get(self.sort_by)
-            else:
-                # Property object
-                value = getattr(home, self.sort_by, None)
-
-            # Handle None values - push them to the end
-            if value is None:
-                # Use a sentinel value that sorts to the end
-                return (1, 0) if self.sort_direction == "desc" else (1, float('inf'))
-
-            # For datetime fields, convert string to datetime for proper sorting
-            if self.sort_by in ['list_date', 'sold_date', 'pending_date', 'last_update_date']:
-                if isinstance(value, str):
-                    try:
-                        # Handle timezone indicators
-                        date_value = value
-                        if date_value.endswith('Z'):
-                            date_value = date_value[:-1] + '+00:00'
-                        parsed_date = datetime.fromisoformat(date_value)
-                        # Normalize to timezone-naive for consistent comparison
-                        return 0, parsed_date.replace(tzinfo=None)
-                    except (ValueError, AttributeError):
-                        # If parsing fails, treat as None
-                        return (1, 0) if self.sort_direction == "desc" else (1, float('inf'))
-                # Handle datetime objects directly (normalize timezone)
-                if isinstance(value, datetime):
-                    return 0, value.replace(tzinfo=None)
-                return 0, value
-
-            # For numeric fields, ensure we can compare
-            return 0, value
-
-        # Sort the homes
-        reverse = (self.sort_direction == "desc")
-        sorted_homes = sorted(homes, key=get_sort_key, reverse=reverse)
-
-        return sorted_homes
+        return sort_homes(homes, self.sort_by, self.sort_direction, self._parse_date_value)
 
     def _apply_raw_data_filters(self, homes):
         """Apply exclude_pending and mls_only filters for raw data returns.
@@ -1197,10 +757,12 @@ class RealtorScraper(Scraper):
         return filtered_homes
 
 
+    @timed("get_bulk_prop_details")
     @retry(
         retry=retry_if_exception_type(JSONDecodeError),
         wait=wait_exponential(min=4, max=10),
         stop=stop_after_attempt(3),
+        before_sleep=lambda retry_state: retry_state.args[0].stats.incr(RETRIES),
     )
     def get_bulk_prop_details(self, property_ids: list[str]) -> dict:
         """
@@ -1224,6 +786,7 @@ class RealtorScraper(Scraper):
         }}"""
 
         response = self.session.post(self.SEARCH_GQL_URL, json={"query": query})
+        self.stats.record_response(response)
         data = response.json()
 
         if "data" not in data:
@@ -0,0 +1,112 @@
+"""
+homeharvest.core.scrapers.realtor.compact
+~~~~~~~~~~~~
+
+Compact representation of processed properties.
+
+Agents, offices, brokers and builders repeat across hundreds of listings. In
+compact mode they are interned by id, so that all the properties of one agent
+share a single Agent instance (and one Advertisers instance per combination of
+agent, broker, builder and office). Repeated strings (status, city, tags, ...)
+are interned too, and heavy optional fields are left empty instead of being
+parsed and validated. Shared instances must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Iterable
+
+from ..models import Advertisers, Entity, Property
+
+#: fields left empty in compact mode unless configured otherwise
+HEAVY_FIELDS = (
+    "photos",
+    "alt_photos",
+    "units",
+    "tax_history",
+    "details",
+    "open_houses",
+    "current_estimates",
+    "estimates",
+    "tax_record",
+    "popularity",
+    "terms",
+)
+
+#: fields process_property can leave empty (HEAVY_FIELDS plus property_history)
+DROPPABLE_FIELDS = frozenset(HEAVY_FIELDS) | {"property_history"}
+
+#: Property and Address string fields with few distinct values
+_INTERNED_FIELDS = ("status", "mls", "mls_status", "county", "fips_code", "neighborhoods")
+_INTERNED_ADDRESS_FIELDS = ("city", "state", "zip", "street_suffix", "street_direction")
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class CompactProperties:
+    """
+    Shared records and field selection for one or more scrapes in compact mode.
+
+    Args:
+        drop_fields: Fields to leave empty (HEAVY_FIELDS when None)
+
+    Raises:
+        ValueError: if drop_fields names a field outside DROPPABLE_FIELDS
+    """
+
+    def __init__(self, drop_fields: Iterable[str] | None = None):
+        self.drop_fields = frozenset(HEAVY_FIELDS if drop_fields is None else drop_fields)
+        unknown = self.drop_fields - DROPPABLE_FIELDS
+        if unknown:
+            raise ValueError(
+                f"Fields that cannot be dropped: {', '.join(sorted(unknown))} "
+                f"(droppable: {', '.join(sorted(DROPPABLE_FIELDS))})"
+            )
+        self._records: dict = {}
+        self._lock = threading.Lock()
+
+    def keeps(self, field: str) -> bool:
+        return field not in self.drop_fields
+
+    def _shared(self, key, build):
+        record = self._records.get(key)
+        if record is None:
+            with self._lock:
+                record = self._records.get(key)
+                if record is None:
+                    record = self._records[key] = build()
+        return record
+
+    def entity(self, model: type[Entity], **fields) -> Entity:
+        """
+        The shared record of an agent, office, broker or builder.
+
+        Records are keyed by uuid and MLS set, else by all their fields. The other
+        fields (name, email, phones, ...) are those of the first listing seen with
+        that key; later listings reuse the record even if theirs differ.
+        """
+        if fields.get("uuid"):
+            key = (model, fields["uuid"], repr(fields.get("mls_set")))
+        else:
+            key = (model, repr(sorted(fields.items())))
+        return self._shared(key, lambda: model(**fields))
+
+    def advertisers(self, **entities: Entity | None) -> Advertisers:
+        """The shared Advertisers of a combination of (shared) entities."""
+        key = (Advertisers,) + tuple(sorted((role, id(entity)) for role, entity in entities.items()))
+        return self._shared(key, lambda: Advertisers(**entities))
+
+    def shrink(self, realty_property: Property) -> Property:
+        """Intern the repeated strings of a processed property (in place)."""
+        for field in _INTERNED_FIELDS:
+            setattr(realty_property, field, _intern(getattr(realty_property, field)))
+        if realty_property.address is not None:
+            for field in _INTERNED_ADDRESS_FIELDS:
+                setattr(realty_property.address, field, _intern(getattr(realty_property.address, field)))
+        if realty_property.tags:
+            realty_property.tags = [_intern(tag) for tag in realty_property.tags]
+        return realty_property
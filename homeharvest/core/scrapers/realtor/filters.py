@@ -0,0 +1,465 @@
+"""
+homeharvest.core.scrapers.realtor.filters
+~~~~~~~~~~~~
+
+Client-side filters compiled into one predicate.
+
+The active filters of a search (hour-precision dates, PENDING dates,
+last_update_date, tags and the additional property filters) are resolved once
+into a list of checks. Each home is then evaluated in a single pass, with its
+dates parsed and tags lower-cased at most once. HomeFilter.mask applies the same
+filters to a results DataFrame.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from ....dates import parse_datetime_series, parse_utc_datetime
+from ....tag_index import TAG_INDEX
+from ..models import ListingType
+
+#: where each filtered field lives on a Property, a raw API dict or a DataFrame row
+FIELD_PATHS = {
+    "hoa_fee": (("hoa_fee",), ("hoa", "fee")),
+    "stories": (("stories",), ("description", "stories")),
+    "parking_garage": (("parking_garage",), ("description", "garage")),
+    "beds": (("beds",), ("description", "beds")),
+    "sqft": (("sqft",), ("description", "sqft")),
+    "lot_sqft": (("lot_sqft",), ("description", "lot_sqft")),
+    "year_built": (("year_built",), ("description", "year_built")),
+    "property_type": (("style",), ("description", "style"), ("description", "type")),
+}
+
+#: search filters (applied by the API during a scrape) and the field each one reads
+SEARCH_RANGE_FIELDS = {
+    "beds": "beds",
+    "baths": "baths",
+    "sqft": "sqft",
+    "price": "list_price",
+    "lot_sqft": "lot_sqft",
+    "year_built": "year_built",
+}
+
+#: listing styles matched by each searchable property type
+PROPERTY_TYPE_STYLES = {
+    "condos": ("condos", "condo", "condop", "coop"),
+    "condo_townhome": ("condo_townhome", "condos", "condo", "townhomes"),
+    "condo_townhome_rowhome_coop": (
+        "condo_townhome_rowhome_coop", "condo_townhome", "condos", "condo", "condop", "coop", "townhomes",
+    ),
+}
+
+#: tag substrings used by the boolean filters
+POOL_TAGS = ("pool", "spa")
+GARAGE_TAGS = ("garage",)
+WATERFRONT_TAGS = ("waterfront", "water")
+VIEW_TAGS = ("view",)
+
+
+def _lookup(home, path: tuple[str, ...]):
+    value = home
+    for key in path:
+        if value is None:
+            return None
+        value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+    return value
+
+
+class HomeView:
+    """Per-home accessor that caches parsed dates and the tag bitmask."""
+
+    __slots__ = ("home", "_parse_date", "_dates", "_tag_bits")
+
+    def __init__(self, home, parse_date):
+        self.home = home
+        self._parse_date = parse_date
+        self._dates = {}
+        self._tag_bits = None
+
+    def get(self, field: str):
+        if field == "baths":
+            return self._baths()
+        paths = FIELD_PATHS.get(field, ((field,),))
+        for path in paths:
+            value = _lookup(self.home, path)
+            if value is not None:
+                return value
+        return None
+
+    def _baths(self):
+        baths = _lookup(self.home, ("baths",))
+        if baths is not None:
+            return baths
+        full = self.get("full_baths") or _lookup(self.home, ("description", "baths_full"))
+        half = self.get("half_baths") or _lookup(self.home, ("description", "baths_half"))
+        if full is None and half is None:
+            return None
+        return (full or 0) + 0.5 * (half or 0)
+
+    def property_type(self) -> str | None:
+        value = self.get("property_type")
+        value = getattr(value, "value", value)
+        return value.lower() if isinstance(value, str) else None
+
+    def date(self, field: str, fallback: bool = True):
+        """Parsed date of a field, falling back to last_status_change_date when it is missing."""
+        key = (field, fallback)
+        if key not in self._dates:
+            raw = self.get(field)
+            if raw:
+                parsed = self._parse_date(raw)
+            elif fallback and (raw := self.get("last_status_change_date")):
+                parsed = self._parse_date(raw)
+            else:
+                parsed = None
+            self._dates[key] = parsed
+        return self._dates[key]
+
+    @property
+    def tag_bits(self) -> int:
+        if self._tag_bits is None:
+            self._tag_bits = TAG_INDEX.encode(self.get("tags"))
+        return self._tag_bits
+
+    def is_contingent(self) -> bool:
+        return bool(_lookup(self.home, ("flags", "is_contingent")))
+
+    def has_tag_containing(self, substrings: tuple[str, ...]) -> bool:
+        return bool(self.tag_bits & TAG_INDEX.substring_mask(substrings))
+
+
+def _in_range(value, date_range: dict) -> bool:
+    if date_range["type"] == "since":
+        return value >= date_range["date"]
+    if date_range["type"] == "until":
+        return value <= date_range["date"]
+    if date_range["type"] == "range":
+        return date_range["from_date"] <= value <= date_range["to_date"]
+    return False
+
+
+class HomeFilter:
+    """
+    Fused client-side filter for one search.
+
+    Build it with compile_filters(scraper); call it on a home, use apply() on a list
+    of homes (Property objects or raw dicts) or mask() on a results DataFrame.
+    """
+
+    def __init__(self, parse_date):
+        self._parse_date = parse_date
+        self.checks = []
+        #: (kind, args) descriptions of the checks, used by mask()
+        self.specs = []
+
+    def add(self, kind: str, check, **spec) -> None:
+        self.checks.append(check)
+        self.specs.append((kind, spec))
+
+    @property
+    def active(self) -> bool:
+        return bool(self.checks)
+
+    def __call__(self, home) -> bool:
+        view = HomeView(home, self._parse_date)
+        return all(check(view) for check in self.checks)
+
+    def apply(self, homes: list) -> list:
+        """Keep the homes that pass every active filter, in order."""
+        if not homes or not self.checks:
+            return homes
+        return [home for home in homes if self(home)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of the filter for a results DataFrame.
+
+        Results DataFrames carry no listing flags, so contingent PENDING homes without
+        a date are only kept when the frame has an is_contingent column.
+
+        Args:
+            df: DataFrame produced by scrape_property
+
+        Returns:
+            Boolean Series aligned with df.index
+        """
+        frame = _Frame(df.reset_index(drop=True))
+        keep = pd.Series(True, index=frame.df.index)
+        for kind, spec in self.specs:
+            keep &= _MASKS[kind](frame, **spec)
+        return pd.Series(keep.to_numpy(), index=df.index)
+
+
+def _date_check(field: str, date_range: dict, fallback: bool, keep_contingent: bool):
+    def check(view: HomeView) -> bool:
+        value = view.date(field, fallback)
+        if value is None:
+            return keep_contingent and view.is_contingent()
+        return _in_range(value, date_range)
+    return check
+
+
+def _tag_check(filter_tags: list[str] | None, exclude_tags: list[str] | None, match_type: str):
+    query = TAG_INDEX.query(filter_tags, exclude_tags, match_type)
+
+    def check(view: HomeView) -> bool:
+        return query.matches(view.tag_bits)
+    return check
+
+
+def _range_check(field: str, minimum, maximum, keep_missing: bool = True):
+    def check(view: HomeView) -> bool:
+        value = view.get(field)
+        if value is None:
+            return keep_missing
+        if minimum is not None and value < minimum:
+            return False
+        if maximum is not None and value > maximum:
+            return False
+        return True
+    return check
+
+
+def _property_type_check(styles: frozenset):
+    def check(view: HomeView) -> bool:
+        return view.property_type() in styles
+    return check
+
+
+def _flag_check(flag: str, wanted: bool):
+    def check(view: HomeView) -> bool:
+        return _has_flag(view, flag) == wanted
+    return check
+
+
+def _has_flag(view: HomeView, flag: str) -> bool:
+    if flag == "has_pool":
+        return view.has_tag_containing(POOL_TAGS)
+    if flag == "has_garage":
+        garage = view.get("parking_garage")
+        return view.has_tag_containing(GARAGE_TAGS) or (garage is not None and garage > 0)
+    if flag == "waterfront":
+        return view.has_tag_containing(WATERFRONT_TAGS)
+    return view.has_tag_containing(VIEW_TAGS)
+
+
+def compile_filters(scraper) -> HomeFilter:
+    """
+    Compile the client-side filters that apply to a scraper's search.
+
+    Mirrors the filters RealtorScraper applies after pagination: the hour-precision
+    date filter (or the PENDING date filter), the last_update_date filter, tag
+    filters and the additional property filters.
+
+    Args:
+        scraper: RealtorScraper whose ScraperInput settings to compile
+
+    Returns:
+        HomeFilter (inactive when no client-side filter applies)
+    """
+    #: offsets are converted to UTC, as parse_datetime_series does for HomeFilter.mask
+    home_filter = HomeFilter(parse_utc_datetime)
+
+    has_hour_precision = scraper.date_from_precision == "hour" or scraper.date_to_precision == "hour"
+    if scraper.past_hours or has_hour_precision:
+        date_range = scraper._get_hour_based_date_range()
+        if date_range:
+            field = scraper._get_date_field_for_listing_type()
+            keep_contingent = scraper.listing_type == ListingType.PENDING
+            home_filter.add(
+                "date", _date_check(field, date_range, True, keep_contingent),
+                field=field, date_range=date_range, fallback=True, keep_contingent=keep_contingent,
+            )
+    elif scraper.listing_type == ListingType.PENDING and (scraper.last_x_days or scraper.date_from):
+        date_range = scraper._get_date_range()
+        if date_range:
+            home_filter.add(
+                "date", _date_check("pending_date", date_range, False, True),
+                field="pending_date", date_range=date_range, fallback=False, keep_contingent=True,
+            )
+
+    if scraper.updated_since or scraper.updated_in_past_hours:
+        date_range = scraper._get_last_update_date_range()
+        if date_range:
+            home_filter.add(
+                "date", _date_check("last_update_date", date_range, True, False),
+                field="last_update_date", date_range=date_range, fallback=True, keep_contingent=False,
+            )
+
+    _add_property_filters(home_filter, scraper)
+
+    return home_filter
+
+
+def _add_property_filters(home_filter: HomeFilter, settings) -> None:
+    if settings.tag_filters or settings.tag_exclude:
+        home_filter.add(
+            "tags", _tag_check(settings.tag_filters, settings.tag_exclude, settings.tag_match_type),
+            filter_tags=settings.tag_filters, exclude_tags=settings.tag_exclude, match_type=settings.tag_match_type,
+        )
+
+    #: the additional filters only switch on when one of their values is truthy
+    if any([settings.hoa_fee_min, settings.hoa_fee_max, settings.stories_min, settings.stories_max,
+            settings.garage_spaces_min, settings.garage_spaces_max, settings.has_pool, settings.has_garage,
+            settings.waterfront, settings.has_view]):
+        for field, minimum, maximum in (
+            ("hoa_fee", settings.hoa_fee_min, settings.hoa_fee_max),
+            ("stories", settings.stories_min, settings.stories_max),
+            ("parking_garage", settings.garage_spaces_min, settings.garage_spaces_max),
+        ):
+            if minimum is not None or maximum is not None:
+                home_filter.add(
+                    "range", _range_check(field, minimum, maximum),
+                    field=field, minimum=minimum, maximum=maximum, keep_missing=True,
+                )
+
+        for flag in ("has_pool", "has_garage", "waterfront", "has_view"):
+            wanted = getattr(settings, flag)
+            if wanted is not None:
+                home_filter.add("flag", _flag_check(flag, wanted), flag=flag, wanted=wanted)
+
+
+class _Settings:
+    """Attribute access over a params dict; missing filters read as unset."""
+
+    def __init__(self, params: dict):
+        self._params = params
+
+    def __getattr__(self, name):
+        if name == "tag_match_type":
+            return self._params.get(name) or "any"
+        return self._params.get(name)
+
+
+def compile_params_filters(params: dict) -> HomeFilter:
+    """
+    Compile scrape_property-style filter parameters for local evaluation.
+
+    Besides the client-side filters, this also covers the filters the API applies
+    during a scrape (property_type and the beds/baths/sqft/price/lot_sqft/
+    year_built ranges), so a superset scrape can be narrowed locally. Homes missing
+    a value fail those search filters, as they would not be returned by the API.
+    Baths are full baths plus half a bath per half bath when no baths field exists.
+
+    Args:
+        params: Filter parameters, e.g. from CompiledPreset.params()
+
+    Returns:
+        HomeFilter
+    """
+    home_filter = HomeFilter(None)
+    settings = _Settings(params)
+
+    if settings.property_type:
+        styles = set()
+        for property_type in settings.property_type:
+            property_type = getattr(property_type, "value", property_type).lower()
+            styles.update(PROPERTY_TYPE_STYLES.get(property_type, (property_type,)))
+        styles = frozenset(styles)
+        home_filter.add("property_type", _property_type_check(styles), styles=styles)
+
+    for name, field in SEARCH_RANGE_FIELDS.items():
+        minimum, maximum = params.get(f"{name}_min"), params.get(f"{name}_max")
+        if minimum is not None or maximum is not None:
+            home_filter.add(
+                "range", _range_check(field, minimum, maximum, keep_missing=False),
+                field=field, minimum=minimum, maximum=maximum, keep_missing=False,
+            )
+
+    _add_property_filters(home_filter, settings)
+    return home_filter
+
+
+# DataFrame masks, one per check kind
+
+
+class _Frame:
+    """Results DataFrame with its tags column encoded once for all masks."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._tag_words = None
+
+    def column(self, name: str) -> pd.Series:
+        if name in self.df.columns:
+            return self.df[name]
+        return pd.Series(None, index=self.df.index, dtype=object)
+
+    @property
+    def tag_words(self):
+        if self._tag_words is None:
+            self._tag_words = TAG_INDEX.encode_series(self.column("tags"))
+        return self._tag_words
+
+
+def _date_mask(frame: _Frame, field, date_range, fallback, keep_contingent) -> pd.Series:
+    raw = frame.column(field)
+    values = parse_datetime_series(raw)
+    if fallback:
+        values = values.where(raw.notna(), parse_datetime_series(frame.column("last_status_change_date")))
+
+    if date_range["type"] == "since":
+        in_range = values >= date_range["date"]
+    elif date_range["type"] == "until":
+        in_range = values <= date_range["date"]
+    else:
+        in_range = (values >= date_range["from_date"]) & (values <= date_range["to_date"])
+
+    missing = values.isna()
+    if keep_contingent and "is_contingent" in frame.df.columns:
+        return in_range | (missing & frame.df["is_contingent"].fillna(False).astype(bool))
+    return in_range & ~missing
+
+
+def _tag_mask(frame: _Frame, filter_tags, exclude_tags, match_type) -> pd.Series:
+    query = TAG_INDEX.query(filter_tags, exclude_tags, match_type)
+    return pd.Series(query.matches_words(frame.tag_words), index=frame.df.index)
+
+
+def _range_mask(frame: _Frame, field, minimum, maximum, keep_missing) -> pd.Series:
+    if field == "baths" and "baths" not in frame.df.columns:
+        full = pd.to_numeric(frame.column("full_baths"), errors="coerce")
+        half = pd.to_numeric(frame.column("half_baths"), errors="coerce")
+        values = full.fillna(0) + 0.5 * half.fillna(0)
+        values = values.where(full.notna() | half.notna())
+    else:
+        values = pd.to_numeric(frame.column(field), errors="coerce")
+
+    keep = pd.Series(True, index=frame.df.index) if keep_missing else values.notna()
+    if minimum is not None:
+        keep &= ~(values < minimum)
+    if maximum is not None:
+        keep &= ~(values > maximum)
+    return keep
+
+
+def _property_type_mask(frame: _Frame, styles) -> pd.Series:
+    style = frame.column("style").map(lambda value: getattr(value, "value", value))
+    return style.str.lower().isin(styles).fillna(False).astype(bool)
+
+
+def _flag_mask(frame: _Frame, flag, wanted) -> pd.Series:
+    substrings = {
+        "has_pool": POOL_TAGS,
+        "has_garage": GARAGE_TAGS,
+        "waterfront": WATERFRONT_TAGS,
+        "has_view": VIEW_TAGS,
+    }[flag]
+    words = frame.tag_words
+    substring_words = TAG_INDEX.to_words(TAG_INDEX.substring_mask(substrings), words.shape[1])
+    has_flag = pd.Series((words & substring_words).any(axis=1), index=frame.df.index)
+
+    if flag == "has_garage":
+        has_flag |= pd.to_numeric(frame.column("parking_garage"), errors="coerce") > 0
+
+    return has_flag == wanted
+
+
+_MASKS = {
+    "date": _date_mask,
+    "tags": _tag_mask,
+    "range": _range_mask,
+    "property_type": _property_type_mask,
+    "flag": _flag_mask,
+}
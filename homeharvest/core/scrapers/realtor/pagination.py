@@ -0,0 +1,210 @@
+"""
+homeharvest.core.scrapers.realtor.pagination
+~~~~~~~~~~~~
+
+Pagination planning for area searches. When the sort key is monotonic with a
+client-side filter (e.g. list_date sorted with past_hours), pages are fetched in
+waves and the remaining ones are cancelled as soon as a page has moved past the
+filter window, since every later page would be filtered out anyway.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from ....instrumentation import PAGES_SKIPPED
+from ..models import ListingType
+
+#: sort field for the date each listing type is filtered on client-side
+DATE_SORT_FIELDS = {
+    "list_date": "list_date",
+    "last_sold_date": "sold_date",
+    "pending_date": "pending_date",
+}
+
+
+def _home_value(home, field: str):
+    if isinstance(home, dict):
+        return home.get(field)
+    return getattr(home, field, None)
+
+
+@dataclass
+class PageWindow:
+    """
+    Bounds of a client-side filter on the field the results are sorted by.
+
+    Homes without a value never end the window.
+    """
+
+    key: Callable[[Any], Any]
+    lower: Any = None
+    upper: Any = None
+    descending: bool = True
+
+    @classmethod
+    def from_date_range(cls, key: Callable[[Any], Any], date_range: dict | None, descending: bool) -> PageWindow | None:
+        if not date_range:
+            return None
+        if date_range["type"] == "since":
+            return cls(key, lower=date_range["date"], descending=descending)
+        if date_range["type"] == "until":
+            return cls(key, upper=date_range["date"], descending=descending)
+        return cls(key, lower=date_range["from_date"], upper=date_range["to_date"], descending=descending)
+
+    def exhausted(self, page: list) -> bool:
+        """
+        Check if the sort order has left the window by the end of a page.
+
+        Args:
+            page: Homes of one page, in API sort order
+
+        Returns:
+            True if every later page is outside the window
+        """
+        for home in reversed(page):
+            value = self.key(home)
+            if value is not None:
+                break
+        else:
+            return False
+
+        if self.descending:
+            return self.lower is not None and value < self.lower
+        return self.upper is not None and value > self.upper
+
+
+def build_page_window(scraper) -> PageWindow | None:
+    """
+    Build the window of the client-side filter that matches the scraper's sort, if any.
+
+    Args:
+        scraper: RealtorScraper whose sort and filters to inspect
+
+    Returns:
+        PageWindow, or None when pagination cannot stop early
+    """
+    sort_by = scraper.sort_by[0] if isinstance(scraper.sort_by, list) else scraper.sort_by
+    if not sort_by:
+        return None
+
+    sort_direction = scraper.sort_direction[0] if isinstance(scraper.sort_direction, list) else scraper.sort_direction
+    descending = sort_direction != "asc"
+
+    def date_key(field: str):
+        return lambda home: scraper._parse_date_value(_home_value(home, field))
+
+    if sort_by == "last_update_date" and (scraper.updated_since or scraper.updated_in_past_hours):
+        return PageWindow.from_date_range(
+            date_key("last_update_date"), scraper._get_last_update_date_range(), descending
+        )
+
+    has_hour_precision = "hour" in (scraper.date_from_precision, scraper.date_to_precision)
+    if scraper.past_hours or has_hour_precision:
+        date_field = scraper._get_date_field_for_listing_type()
+        if DATE_SORT_FIELDS.get(date_field) == sort_by:
+            return PageWindow.from_date_range(
+                date_key(date_field), scraper._get_hour_based_date_range(), descending
+            )
+        return None
+
+    if (sort_by == "pending_date" and scraper.listing_type == ListingType.PENDING
+            and (scraper.last_x_days or scraper.date_from)):
+        return PageWindow.from_date_range(date_key("pending_date"), scraper._get_date_range(), descending)
+
+    if sort_by == "list_price" and (scraper.price_min is not None or scraper.price_max is not None):
+        return PageWindow(
+            lambda home: _home_value(home, "list_price"),
+            lower=scraper.price_min,
+            upper=scraper.price_max,
+            descending=descending,
+        )
+
+    return None
+
+
+class PaginationPlanner:
+    """
+    Fetches the pages after the first one for a search.
+
+    In parallel mode pages are queued on a pool of max_workers threads, so at most
+    one wave of max_workers pages is in flight; results are consumed in offset order
+    and queued pages are cancelled once a page falls outside the window. Sequential
+    mode checks the window before each request.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.window = build_page_window(scraper)
+
+    def offsets(self, total: int) -> range:
+        scraper = self.scraper
+        return range(
+            scraper.offset + scraper.DEFAULT_PAGE_SIZE,
+            min(total, scraper.offset + scraper.limit),
+            scraper.DEFAULT_PAGE_SIZE,
+        )
+
+    def fetch_remaining(self, first_page: list, total: int, search_variables: dict, search_type: str) -> list:
+        """
+        Fetch the pages following first_page.
+
+        Args:
+            first_page: Homes already fetched at the scraper's offset
+            total: Total reported by the first request
+            search_variables: GraphQL variables of the search
+            search_type: "area" or "comps"
+
+        Returns:
+            Homes of the remaining pages, in API order
+        """
+        offsets = self.offsets(total)
+        if not offsets:
+            return []
+
+        if self.window and self.window.exhausted(first_page):
+            self.scraper.stats.incr(PAGES_SKIPPED, len(offsets))
+            return []
+
+        if self.scraper.parallel:
+            return self._fetch_parallel(offsets, search_variables, search_type)
+        return self._fetch_sequential(offsets, search_variables, search_type)
+
+    def _fetch_page(self, offset: int, search_variables: dict, search_type: str) -> list:
+        return self.scraper.general_search(
+            variables=search_variables | {"offset": offset},
+            search_type=search_type,
+        )["properties"]
+
+    def _fetch_sequential(self, offsets: range, search_variables: dict, search_type: str) -> list:
+        homes = []
+        for index, offset in enumerate(offsets):
+            page = self._fetch_page(offset, search_variables, search_type)
+            homes.extend(page)
+
+            if self.window and self.window.exhausted(page):
+                self.scraper.stats.incr(PAGES_SKIPPED, len(offsets) - index - 1)
+                break
+        return homes
+
+    def _fetch_parallel(self, offsets: range, search_variables: dict, search_type: str) -> list:
+        homes = []
+        with ThreadPoolExecutor(max_workers=self.scraper.max_workers) as executor:
+            futures = [
+                executor.submit(self._fetch_page, offset, search_variables, search_type)
+                for offset in offsets
+            ]
+
+            for index, future in enumerate(futures):
+                page = future.result()
+                homes.extend(page)
+
+                if self.window and self.window.exhausted(page):
+                    remaining = futures[index + 1:]
+                    cancelled = sum(1 for pending in remaining if pending.cancel())
+                    self.scraper.stats.incr(PAGES_SKIPPED, cancelled)
+                    break
+
+        return homes
@@ -4,6 +4,7 @@ Parsers for realtor.com data processing
 
 from datetime import datetime
 from typing import Optional
+from ....dates import parse_datetime, parse_naive_datetime
 from ..models import Address, Description, PropertyType
 
 
@@ -18,16 +19,10 @@ def parse_open_houses(open_houses_data: list[dict] | None) -> list[dict] | None:
         
         # Parse start_date and end_date
         if parsed_oh.get("start_date"):
-            try:
-                parsed_oh["start_date"] = datetime.fromisoformat(parsed_oh["start_date"].replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                parsed_oh["start_date"] = None
+            parsed_oh["start_date"] = parse_datetime(parsed_oh["start_date"])
                 
         if parsed_oh.get("end_date"):
-            try:
-                parsed_oh["end_date"] = datetime.fromisoformat(parsed_oh["end_date"].replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                parsed_oh["end_date"] = None
+            parsed_oh["end_date"] = parse_datetime(parsed_oh["end_date"])
                 
         parsed_open_houses.append(parsed_oh)
         
@@ -45,10 +40,7 @@ def parse_units(units_data: list[dict] | None) -> list[dict] | None:
         
         # Parse availability date
         if parsed_unit.get("availability") and parsed_unit["availability"].get("date"):
-            try:
-                parsed_unit["availability"]["date"] = datetime.fromisoformat(parsed_unit["availability"]["date"].replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                parsed_unit["availability"]["date"] = None
+            parsed_unit["availability"]["date"] = parse_datetime(parsed_unit["availability"]["date"])
                 
         parsed_units.append(parsed_unit)
         
@@ -64,14 +56,23 @@ def parse_tax_record(tax_record_data: dict | None) -> dict | None:
     
     # Parse last_update_date
     if parsed_tax_record.get("last_update_date"):
-        try:
-            parsed_tax_record["last_update_date"] = datetime.fromisoformat(parsed_tax_record["last_update_date"].replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            parsed_tax_record["last_update_date"] = None
+        parsed_tax_record["last_update_date"] = parse_datetime(parsed_tax_record["last_update_date"])
             
     return parsed_tax_record
 
 
+def parse_property_history(history_data: list[dict] | None) -> list[dict] | None:
+    """Parse property history events and convert date strings to datetime objects"""
+    if not history_data:
+        return None
+
+    return [
+        {"date": parse_datetime(event.get("date")), "event_name": event.get("event_name"), "price": event.get("price")}
+        for event in history_data
+        if isinstance(event, dict)
+    ]
+
+
 def parse_current_estimates(estimates_data: list[dict] | None) -> list[dict] | None:
     """Parse current estimates data and convert date strings to datetime objects"""
     if not estimates_data:
@@ -83,10 +84,7 @@ def parse_current_estimates(estimates_data: list[dict] | None) -> list[dict] | N
         
         # Parse date
         if parsed_estimate.get("date"):
-            try:
-                parsed_estimate["date"] = datetime.fromisoformat(parsed_estimate["date"].replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                parsed_estimate["date"] = None
+            parsed_estimate["date"] = parse_datetime(parsed_estimate["date"])
         
         # Parse source information
         if parsed_estimate.get("source"):
@@ -117,10 +115,7 @@ def parse_estimates(estimates_data: dict | None) -> dict | None:
             
             # Parse date
             if parsed_estimate.get("date"):
-                try:
-                    parsed_estimate["date"] = datetime.fromisoformat(parsed_estimate["date"].replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    parsed_estimate["date"] = None
+                parsed_estimate["date"] = parse_datetime(parsed_estimate["date"])
             
             # Parse source information
             if parsed_estimate.get("source"):
@@ -202,8 +197,8 @@ def parse_address(result: dict, search_type: str) -> Address:
     )
 
 
-def parse_description(result: dict) -> Description | None:
-    """Parse description data from result"""
+def parse_description(result: dict, alt_photos: bool = True) -> Description | None:
+    """Parse description data from result (alt_photos=False skips the alternative photos)"""
     if not result:
         return None
 
@@ -224,7 +219,7 @@ def parse_description(result: dict) -> Description | None:
 
     return Description(
         primary_photo=primary_photo,
-        alt_photos=process_alt_photos(result.get("photos", [])),
+        alt_photos=process_alt_photos(result.get("photos", [])) if alt_photos else None,
         style=(PropertyType.__getitem__(style) if style and style in PropertyType.__members__ else None),
         beds=description_data.get("beds"),
         baths_full=description_data.get("baths_full"),
@@ -249,29 +244,9 @@ def parse_description(result: dict) -> Description | None:
 
 def calculate_days_on_mls(result: dict) -> Optional[int]:
     """Calculate days on MLS from result data"""
-    list_date_str = result.get("list_date")
-    list_date = None
-    if list_date_str:
-        try:
-            # Parse full datetime, then use date() for day calculation
-            list_date_str_clean = list_date_str.replace('Z', '+00:00') if list_date_str.endswith('Z') else list_date_str
-            list_date = datetime.fromisoformat(list_date_str_clean).replace(tzinfo=None)
-        except (ValueError, AttributeError):
-            # Fallback for date-only format
-            list_date = datetime.strptime(list_date_str.split("T")[0], "%Y-%m-%d") if "T" in list_date_str else None
-
-    last_sold_date_str = result.get("last_sold_date")
-    last_sold_date = None
-    if last_sold_date_str:
-        try:
-            last_sold_date_str_clean = last_sold_date_str.replace('Z', '+00:00') if last_sold_date_str.endswith('Z') else last_sold_date_str
-            last_sold_date = datetime.fromisoformat(last_sold_date_str_clean).replace(tzinfo=None)
-        except (ValueError, AttributeError):
-            # Fallback for date-only format
-            try:
-                last_sold_date = datetime.strptime(last_sold_date_str, "%Y-%m-%d")
-            except ValueError:
-                last_sold_date = None
+    # Cached parses: process_property parses the same strings for the Property fields
+    list_date = parse_naive_datetime(result.get("list_date"))
+    last_sold_date = parse_naive_datetime(result.get("last_sold_date"))
     today = datetime.now()
 
     if list_date:
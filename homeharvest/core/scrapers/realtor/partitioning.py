@@ -0,0 +1,219 @@
+"""
+homeharvest.core.scrapers.realtor.partitioning
+~~~~~~~~~~~~
+
+Splits searches whose total exceeds the API's 10,000 result cap into smaller
+partitions (date windows, price bands, property types), fetches every partition
+concurrently and merges the results without duplicates.
+"""
+
+from __future__ import annotations
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from ..models import ListingType
+
+#: the API will not page past this many results for one query
+RESULT_CAP = 10000
+
+#: top of the finite price range; the band above it is left open-ended
+PRICE_CEILING = 50_000_000
+
+#: bands narrower than this are not split further
+MIN_PRICE_BAND = 1000
+
+DATE_SPLIT_LISTING_TYPES = (ListingType.SOLD, ListingType.FOR_SALE, ListingType.FOR_RENT)
+
+
+@dataclass
+class Partition:
+    """One slice of the search space, expressed as ScraperInput overrides."""
+
+    overrides: dict = field(default_factory=dict)
+    total: int = 0
+
+
+class SearchPartitioner:
+    """
+    Exhaustive search for one resolved location.
+
+    Totals are probed level by level (all partitions of a level concurrently).
+    A partition over the cap is split by date window first, then by price band,
+    then by property type. Once every partition fits, all of them are paginated
+    concurrently and the merged homes are deduplicated by property_id.
+
+    Listings without a price are dropped by the API once a price band is
+    applied, so a price split can miss them.
+    """
+
+    def __init__(self, scraper, cap: int = RESULT_CAP):
+        self.scraper = scraper
+        self.cap = cap
+
+    def _child(self, overrides: dict):
+        #: partitions already run on a pool of max_workers threads; paging each one
+        #: serially keeps the total at max_workers rather than max_workers squared
+        scraper_input = self.scraper.scraper_input.model_copy(
+            update=overrides | {"limit": self.cap, "offset": 0, "exhaustive": False, "parallel": False}
+        )
+        return type(self.scraper)(scraper_input, stats=self.scraper.stats)
+
+    def _probe(self, partitions: list[Partition], search_variables: dict, search_type: str) -> None:
+        def probe(partition: Partition) -> int:
+            return self._child(partition.overrides).probe_total(search_variables, search_type)
+
+        with ThreadPoolExecutor(max_workers=self.scraper.max_workers) as executor:
+            for partition, total in zip(partitions, executor.map(probe, partitions)):
+                partition.total = total
+
+    def _date_bounds(self, overrides: dict) -> tuple[date, date] | None:
+        scraper_input = self.scraper.scraper_input.model_copy(update=overrides)
+
+        if scraper_input.listing_type not in DATE_SPLIT_LISTING_TYPES:
+            return None
+        if scraper_input.past_hours or "hour" in (scraper_input.date_from_precision, scraper_input.date_to_precision):
+            return None
+
+        if scraper_input.date_from and scraper_input.date_to:
+            try:
+                return (
+                    datetime.fromisoformat(scraper_input.date_from).date(),
+                    datetime.fromisoformat(scraper_input.date_to).date(),
+                )
+            except ValueError:
+                return None
+
+        if scraper_input.last_x_days:
+            today = date.today()
+            return today - timedelta(days=scraper_input.last_x_days), today
+
+        return None
+
+    def _split_by_date(self, partition: Partition) -> list[Partition] | None:
+        bounds = self._date_bounds(partition.overrides)
+        if not bounds or bounds[0] >= bounds[1]:
+            return None
+
+        start, end = bounds
+        mid = start + (end - start) // 2
+        return [
+            Partition(partition.overrides | {
+                "date_from": start.isoformat(), "date_to": mid.isoformat(), "last_x_days": None,
+            }),
+            Partition(partition.overrides | {
+                "date_from": (mid + timedelta(days=1)).isoformat(), "date_to": end.isoformat(), "last_x_days": None,
+            }),
+        ]
+
+    def _split_by_price(self, partition: Partition) -> list[Partition] | None:
+        scraper_input = self.scraper.scraper_input
+        low = partition.overrides.get("price_min", scraper_input.price_min) or 0
+        high = partition.overrides.get("price_max", scraper_input.price_max)
+
+        if high is None:
+            if low >= PRICE_CEILING:
+                return None
+            return [
+                Partition(partition.overrides | {"price_min": low, "price_max": PRICE_CEILING}),
+                Partition(partition.overrides | {"price_min": PRICE_CEILING + 1, "price_max": None}),
+            ]
+
+        if high - low < MIN_PRICE_BAND:
+            return None
+
+        #: geometric midpoint: listings are dense at low prices and sparse at the top
+        mid = int((max(low, 1) * high) ** 0.5) if low else high // 2
+        mid = min(max(mid, low), high - 1)
+        return [
+            Partition(partition.overrides | {"price_min": low, "price_max": mid}),
+            Partition(partition.overrides | {"price_min": mid + 1, "price_max": high}),
+        ]
+
+    def _split_by_property_type(self, partition: Partition) -> list[Partition] | None:
+        property_types = partition.overrides.get("property_type", self.scraper.scraper_input.property_type)
+        if not property_types or len(property_types) < 2:
+            return None
+        return [Partition(partition.overrides | {"property_type": [property_type]}) for property_type in property_types]
+
+    def split(self, partition: Partition) -> list[Partition] | None:
+        """
+        Split a partition in two or more, or return None if it cannot be narrowed further.
+        """
+        for splitter in (self._split_by_date, self._split_by_price, self._split_by_property_type):
+            children = splitter(partition)
+            if children:
+                return children
+        return None
+
+    def plan(self, search_variables: dict, search_type: str) -> list[Partition]:
+        """
+        Find partitions that each fit under the result cap.
+
+        Returns:
+            Partitions with their probed totals (empty partitions are dropped)
+        """
+        search_variables = search_variables | {"offset": 0}
+        pending = [Partition()]
+        leaves = []
+
+        while pending:
+            self._probe(pending, search_variables, search_type)
+            next_level = []
+
+            for partition in pending:
+                if partition.total <= self.cap:
+                    if partition.total:
+                        leaves.append(partition)
+                    continue
+
+                children = self.split(partition)
+                if children is None:
+                    warnings.warn(
+                        f"Partition {partition.overrides or 'of the full search'} has {partition.total} results "
+                        f"and cannot be split further; only the first {self.cap} will be returned.",
+                        UserWarning,
+                    )
+                    leaves.append(partition)
+                else:
+                    next_level.extend(children)
+
+            pending = next_level
+
+        return leaves
+
+    def search(self, search_variables: dict, search_type: str) -> list:
+        """
+        Fetch every result of a search, past the 10,000 result cap.
+
+        The scraper's limit and offset are ignored.
+
+        Returns:
+            Deduplicated homes (Property objects or raw dicts), sorted if sort_by is set
+        """
+        with self.scraper.stats.span("partition_plan"):
+            leaves = self.plan(search_variables, search_type)
+
+        search_variables = search_variables | {"offset": 0}
+
+        def fetch(partition: Partition) -> list:
+            return self._child(partition.overrides).search_area(search_variables, search_type)
+
+        homes = []
+        seen = set()
+        with ThreadPoolExecutor(max_workers=self.scraper.max_workers) as executor:
+            for partition_homes in executor.map(fetch, leaves):
+                for home in partition_homes:
+                    property_id = home.get("property_id") if isinstance(home, dict) else home.property_id
+                    if property_id is not None:
+                        if property_id in seen:
+                            continue
+                        seen.add(property_id)
+                    homes.append(home)
+
+        if self.scraper.sort_by:
+            homes = self.scraper._apply_sort(homes)
+
+        return homes
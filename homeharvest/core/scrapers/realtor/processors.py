@@ -2,8 +2,8 @@
 Processors for realtor.com property data processing
 """
 
-from datetime import datetime
 from typing import Optional
+from ....dates import parse_datetime
 from ..models import (
     Property,
     ListingType,
@@ -14,10 +14,12 @@ from ..models import (
     Office,
     ReturnType
 )
+from .compact import CompactProperties
 from .parsers import (
     parse_open_houses,
     parse_units,
     parse_tax_record,
+    parse_property_history,
     parse_current_estimates,
     parse_estimates,
     parse_neighborhoods,
@@ -28,20 +30,22 @@ from .parsers import (
 )
 
 
-def process_advertisers(advertisers: list[dict] | None) -> Advertisers | None:
-    """Process advertisers data from GraphQL response"""
+def process_advertisers(advertisers: list[dict] | None, compact: CompactProperties | None = None) -> Advertisers | None:
+    """Process advertisers data from GraphQL response (shared records in compact mode)"""
     if not advertisers:
         return None
 
     def _parse_fulfillment_id(fulfillment_id: str | None) -> str | None:
         return fulfillment_id if fulfillment_id and fulfillment_id != "0" else None
 
-    processed_advertisers = Advertisers()
+    build = compact.entity if compact else lambda model, **fields: model(**fields)
+    entities = {}
 
     for advertiser in advertisers:
         advertiser_type = advertiser.get("type")
         if advertiser_type == "seller":  #: agent
-            processed_advertisers.agent = Agent(
+            entities["agent"] = build(
+                Agent,
                 uuid=_parse_fulfillment_id(advertiser.get("fulfillment_id")),
                 nrds_id=advertiser.get("nrds_id"),
                 mls_set=advertiser.get("mls_set"),
@@ -52,13 +56,15 @@ def process_advertisers(advertisers: list[dict] | None) -> Advertisers | None:
             )
 
             if advertiser.get("broker") and advertiser["broker"].get("name"):  #: has a broker
-                processed_advertisers.broker = Broker(
+                entities["broker"] = build(
+                    Broker,
                     uuid=_parse_fulfillment_id(advertiser["broker"].get("fulfillment_id")),
                     name=advertiser["broker"].get("name"),
                 )
 
             if advertiser.get("office"):  #: has an office
-                processed_advertisers.office = Office(
+                entities["office"] = build(
+                    Office,
                     uuid=_parse_fulfillment_id(advertiser["office"].get("fulfillment_id")),
                     mls_set=advertiser["office"].get("mls_set"),
                     name=advertiser["office"].get("name"),
@@ -68,18 +74,20 @@ def process_advertisers(advertisers: list[dict] | None) -> Advertisers | None:
 
         if advertiser_type == "community":  #: could be builder
             if advertiser.get("builder"):
-                processed_advertisers.builder = Builder(
+                entities["builder"] = build(
+                    Builder,
                     uuid=_parse_fulfillment_id(advertiser["builder"].get("fulfillment_id")),
                     name=advertiser["builder"].get("name"),
                 )
 
-    return processed_advertisers
+    return compact.advertisers(**entities) if compact else Advertisers(**entities)
 
 
 def process_property(result: dict, mls_only: bool = False, extra_property_data: bool = False, 
                     exclude_pending: bool = False, listing_type: ListingType = ListingType.FOR_SALE,
-                    get_key_func=None, process_extra_property_details_func=None) -> Property | None:
-    """Process property data from GraphQL response"""
+                    get_key_func=None, process_extra_property_details_func=None,
+                    compact: CompactProperties | None = None) -> Property | None:
+    """Process property data from GraphQL response (see compact.CompactProperties for compact mode)"""
     mls = result["source"].get("id") if "source" in result and isinstance(result["source"], dict) else None
 
     if not mls and mls_only:
@@ -104,7 +112,8 @@ def process_property(result: dict, mls_only: bool = False, extra_property_data:
     property_estimates_root = result.get("current_estimates") or result.get("estimates", {}).get("currentValues")
     estimated_value = get_key_func(property_estimates_root, [0, "estimate"]) if get_key_func else None
 
-    advertisers = process_advertisers(result.get("advertisers"))
+    advertisers = process_advertisers(result.get("advertisers"), compact)
+    keep = compact.keeps if compact else lambda field: True
 
     realty_property = Property(
         mls=mls,
@@ -121,18 +130,18 @@ def process_property(result: dict, mls_only: bool = False, extra_property_data:
         list_price=result["list_price"],
         list_price_min=result["list_price_min"],
         list_price_max=result["list_price_max"],
-        list_date=(datetime.fromisoformat(result["list_date"].replace('Z', '+00:00') if result["list_date"].endswith('Z') else result["list_date"]) if result.get("list_date") else None),
+        list_date=parse_datetime(result.get("list_date")),
         prc_sqft=result.get("price_per_sqft"),
-        last_sold_date=(datetime.fromisoformat(result["last_sold_date"].replace('Z', '+00:00') if result["last_sold_date"].endswith('Z') else result["last_sold_date"]) if result.get("last_sold_date") else None),
-        pending_date=(datetime.fromisoformat(result["pending_date"].replace('Z', '+00:00') if result["pending_date"].endswith('Z') else result["pending_date"]) if result.get("pending_date") else None),
-        last_status_change_date=(datetime.fromisoformat(result["last_status_change_date"].replace('Z', '+00:00') if result["last_status_change_date"].endswith('Z') else result["last_status_change_date"]) if result.get("last_status_change_date") else None),
-        last_update_date=(datetime.fromisoformat(result["last_update_date"].replace('Z', '+00:00') if result["last_update_date"].endswith('Z') else result["last_update_date"]) if result.get("last_update_date") else None),
+        last_sold_date=parse_datetime(result.get("last_sold_date")),
+        pending_date=parse_datetime(result.get("pending_date")),
+        last_status_change_date=parse_datetime(result.get("last_status_change_date")),
+        last_update_date=parse_datetime(result.get("last_update_date")),
         new_construction=result["flags"].get("is_new_construction") is True,
         hoa_fee=(result["hoa"]["fee"] if result.get("hoa") and isinstance(result["hoa"], dict) else None),
         latitude=(result["location"]["address"]["coordinate"].get("lat") if able_to_get_lat_long else None),
         longitude=(result["location"]["address"]["coordinate"].get("lon") if able_to_get_lat_long else None),
         address=parse_address(result, search_type="general_search"),
-        description=parse_description(result),
+        description=parse_description(result, alt_photos=keep("alt_photos")),
         neighborhoods=parse_neighborhoods(result),
         county=(result["location"]["county"].get("name") if result["location"]["county"] else None),
         fips_code=(result["location"]["county"].get("fips_code") if result["location"]["county"] else None),
@@ -142,26 +151,27 @@ def process_property(result: dict, mls_only: bool = False, extra_property_data:
         estimated_value=estimated_value if estimated_value else None,
         advertisers=advertisers,
         tax=prop_details.get("tax"),
-        tax_history=prop_details.get("tax_history"),
+        tax_history=prop_details.get("tax_history") if keep("tax_history") else None,
+        property_history=parse_property_history(result.get("property_history")) if keep("property_history") else None,
         
         # Additional fields from GraphQL
         mls_status=result.get("mls_status"),
         last_sold_price=result.get("last_sold_price"),
         tags=result.get("tags"),
-        details=result.get("details"),
-        open_houses=parse_open_houses(result.get("open_houses")),
+        details=result.get("details") if keep("details") else None,
+        open_houses=parse_open_houses(result.get("open_houses")) if keep("open_houses") else None,
         pet_policy=result.get("pet_policy"),
-        units=parse_units(result.get("units")),
+        units=parse_units(result.get("units")) if keep("units") else None,
         monthly_fees=result.get("monthly_fees"),
         one_time_fees=result.get("one_time_fees"),
         parking=result.get("parking"),
-        terms=result.get("terms"),
-        popularity=result.get("popularity"),
-        tax_record=parse_tax_record(result.get("tax_record")),
+        terms=result.get("terms") if keep("terms") else None,
+        popularity=result.get("popularity") if keep("popularity") else None,
+        tax_record=parse_tax_record(result.get("tax_record")) if keep("tax_record") else None,
         parcel_info=result.get("location", {}).get("parcel"),
-        current_estimates=parse_current_estimates(result.get("current_estimates")),
-        estimates=parse_estimates(result.get("estimates")),
-        photos=result.get("photos"),
+        current_estimates=parse_current_estimates(result.get("current_estimates")) if keep("current_estimates") else None,
+        estimates=parse_estimates(result.get("estimates")) if keep("estimates") else None,
+        photos=result.get("photos") if keep("photos") else None,
         flags=result.get("flags"),
     )
 
@@ -183,6 +193,9 @@ def process_property(result: dict, mls_only: bool = False, extra_property_data:
             if realty_property.last_sold_date.date() == realty_property.last_status_change_date.date():
                 realty_property.last_sold_date = realty_property.last_status_change_date
 
+    if compact:
+        compact.shrink(realty_property)
+
     return realty_property
 
 
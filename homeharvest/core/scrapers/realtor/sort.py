@@ -0,0 +1,146 @@
+"""
+homeharvest.core.scrapers.realtor.sort
+~~~~~~~~~~~~
+
+Client-side multi-key sort of search results.
+
+The key of every home is extracted once per sort field (dates parsed once per
+distinct string, calculated fields computed once), then the homes are ordered
+with one stable sort per field, from the last field to the first. Missing
+values sort last in either direction, as in sorting.sort_properties.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable
+
+from ....dates import parse_utc_datetime
+from .filters import FIELD_PATHS, HomeView, _lookup
+
+#: fields holding dates, compared as naive UTC datetimes
+DATE_SORT_FIELDS = ("list_date", "sold_date", "pending_date", "last_sold_date", "last_update_date")
+
+#: where sort fields that are not filter fields live on a Property or a raw API dict
+SORT_FIELD_PATHS = {
+    "price_per_sqft": (("price_per_sqft",), ("prc_sqft",)),
+    "sold_price": (("sold_price",), ("description", "sold_price")),
+    "sold_date": (("sold_date",), ("last_sold_date",)),
+    "full_baths": (("full_baths",), ("description", "baths_full")),
+}
+
+#: fields computed from other fields (see sorting.CALCULATED_FIELDS); never sent to the API
+CALCULATED_SORT_FIELDS = ("property_age", "value_per_sqft", "price_discount", "lot_ratio")
+
+
+def _ratio(numerator, denominator, scale: float = 1):
+    if numerator is None or denominator is None or not denominator:
+        return None
+    return (numerator / denominator) * scale
+
+
+def sort_fields(sort_by: str | list[str] | None, sort_direction: str | list[str] = "desc") -> list[tuple[str, bool]]:
+    """
+    Normalize sort parameters to (field, descending) pairs.
+
+    Raises:
+        ValueError: if sort_by and sort_direction are lists of different lengths
+    """
+    if not sort_by:
+        return []
+    fields = [sort_by] if isinstance(sort_by, str) else [field for field in sort_by if field]
+    directions = [sort_direction] * len(fields) if isinstance(sort_direction, str) else list(sort_direction)
+    if len(fields) != len(directions):
+        raise ValueError("sort_by and sort_direction must have same length")
+    return [(field, (direction or "desc") != "asc") for field, direction in zip(fields, directions)]
+
+
+class SortKeys:
+    """Typed sort key extraction, parsing each distinct date string once."""
+
+    def __init__(self, parse_date: Callable):
+        self._parse_date = parse_date
+        self._parsed: dict[str, datetime | None] = {}
+        self._current_year = datetime.now().year
+
+    def date(self, value):
+        if isinstance(value, datetime):
+            return value.replace(tzinfo=None)
+        if not isinstance(value, str):
+            return value
+        if value not in self._parsed:
+            self._parsed[value] = self._parse_date(value)
+        return self._parsed[value]
+
+    def extractor(self, field: str) -> Callable:
+        """Function returning the sort key of a home for one field (None when missing)."""
+        if field in CALCULATED_SORT_FIELDS:
+            return lambda home: self._calculated(HomeView(home, self.date), field)
+        if field == "baths":
+            return lambda home: HomeView(home, self.date).get("baths")
+
+        paths = SORT_FIELD_PATHS.get(field) or FIELD_PATHS.get(field) or ((field,),)
+        if len(paths) == 1 and len(paths[0]) == 1:
+            key = paths[0][0]
+
+            def get(home):
+                return home.get(key) if isinstance(home, dict) else getattr(home, key, None)
+        else:
+            def get(home):
+                for path in paths:
+                    value = _lookup(home, path)
+                    if value is not None:
+                        return value
+                return None
+
+        if field in DATE_SORT_FIELDS:
+            return lambda home: self.date(get(home))
+        return get
+
+    def _calculated(self, view: HomeView, field: str):
+        if field == "property_age":
+            year_built = view.get("year_built")
+            return None if year_built is None else self._current_year - year_built
+        if field == "value_per_sqft":
+            return _ratio(view.get("estimated_value"), view.get("sqft"))
+        if field == "price_discount":
+            list_price, estimated = view.get("list_price"), view.get("estimated_value")
+            if list_price is None:
+                return None
+            return _ratio(list_price - estimated if estimated is not None else None, estimated, 100)
+        return _ratio(view.get("sqft"), view.get("lot_sqft"))
+
+
+def sort_homes(homes: list, sort_by: str | list[str] | None, sort_direction: str | list[str] = "desc",
+               parse_date: Callable | None = None) -> list:
+    """
+    Sort homes (Property objects or raw API dicts) by one or more fields.
+
+    Args:
+        homes: Homes to sort
+        sort_by: Field name or list of field names
+        sort_direction: "asc" or "desc", or a list matching sort_by
+        parse_date: Parser for date strings returning a naive datetime or None
+
+    Returns:
+        New list of the homes; ties keep their input order and missing values come last
+    """
+    fields = sort_fields(sort_by, sort_direction)
+    if not homes or not fields:
+        return homes
+
+    keys = SortKeys(parse_date or parse_utc_datetime)
+    order = list(range(len(homes)))
+
+    # One stable sort per field, least significant first
+    for field, descending in reversed(fields):
+        values = list(map(keys.extractor(field), homes))
+        # Missing values (None, NaN) go last
+        missing = [value is None or value != value for value in values]
+        present = [position for position in order if not missing[position]]
+        missing = [position for position in order if missing[position]]
+        present.sort(key=values.__getitem__, reverse=descending)
+        order = present + missing
+
+    return [homes[position] for position in order]
+
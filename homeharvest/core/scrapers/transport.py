@@ -0,0 +1,188 @@
+"""
+homeharvest.core.scrapers.transport
+~~~~~~~~~~~~
+
+HTTP transport for the scrapers: pooled keep-alive sessions sized to the
+configured concurrency, one isolated session per proxy, and optional HTTP/2
+when httpx with h2 support is installed.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+
+DEFAULT_POOL_SIZE = 10
+
+#: distinct hosts we talk to (search API, autocomplete, auth) - one urllib3 pool each
+NUM_HOST_POOLS = 4
+
+RETRY_STATUSES = (429, 403)
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 4
+
+DEFAULT_HEADERS = {
+    "accept": "application/json, text/javascript",
+    "accept-language": "en-US,en;q=0.9",
+    "cache-control": "no-cache",
+    "content-type": "application/json",
+    "origin": "https://www.realtor.com",
+    "pragma": "no-cache",
+    "priority": "u=1, i",
+    "rdc-ab-tests": "commute_travel_time_variation:v1",
+    "sec-ch-ua": '"Not)A;Brand";v="99", "Google Chrome";v="127", "Chromium";v="127"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+}
+
+
+def _build_requests_session(proxy: str | None, pool_size: int) -> requests.Session:
+    session = requests.Session()
+    retries = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=list(RETRY_STATUSES),
+        allowed_methods=frozenset(["GET", "POST"]),
+    )
+
+    #: pool_block makes extra threads wait for a pooled connection instead of
+    #: opening a throwaway one ("Connection pool is full, discarding connection")
+    adapter = HTTPAdapter(
+        pool_connections=NUM_HOST_POOLS,
+        pool_maxsize=pool_size,
+        max_retries=retries,
+        pool_block=True,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+
+    if proxy:
+        session.proxies.update({"http": proxy, "https": proxy})
+
+    return session
+
+
+class Http2Session:
+    """
+    Minimal requests-compatible wrapper around an HTTP/2 httpx client.
+
+    Many concurrent page fetches are multiplexed over one TLS connection. Retries
+    on 429/403 use the same budget and backoff as the requests transport.
+    """
+
+    def __init__(self, proxy: str | None = None, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self.client = httpx.Client(
+            http2=True,
+            proxy=proxy,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=30.0,
+        )
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    def request(self, method: str, url: str, **kwargs):
+        history = []
+        for attempt in range(RETRY_TOTAL + 1):
+            response = self.client.request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                break
+            history.append(response)
+            time.sleep(RETRY_BACKOFF_FACTOR * (2 ** attempt))
+
+        response.retry_history = tuple(history)
+        return response
+
+    def get(self, url: str, params: dict | None = None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url: str, json: dict | None = None, data=None, **kwargs):
+        return self.request("POST", url, json=json, content=data, **kwargs)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class SessionPool:
+    """
+    Thread-safe registry of shared sessions, one per (proxy, http2) pair.
+
+    Sessions are never mutated per scraper: a different proxy always gets its own
+    session and connection pool. A request for a larger pool replaces the cached
+    session with a bigger one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: dict[tuple[str | None, bool], tuple[int, object]] = {}
+
+    def get(self, proxy: str | None = None, pool_size: int = DEFAULT_POOL_SIZE, http2: bool = False):
+        """
+        Get the shared session for a proxy, sized for `pool_size` concurrent requests.
+
+        Args:
+            proxy: Proxy URL, or None for a direct connection
+            pool_size: Number of keep-alive connections to hold per host
+            http2: Use an HTTP/2 client if one is installed
+
+        Returns:
+            A requests.Session, or an Http2Session when http2 is requested and available
+        """
+        if http2 and not HTTP2_AVAILABLE:
+            warnings.warn(
+                "HTTP/2 was requested but httpx[http2] is not installed; falling back to HTTP/1.1.",
+                UserWarning,
+            )
+            http2 = False
+
+        key = (proxy, http2)
+        with self._lock:
+            cached = self._sessions.get(key)
+            if cached and cached[0] >= pool_size:
+                return cached[1]
+
+            if http2:
+                session = Http2Session(proxy=proxy, pool_size=pool_size)
+            else:
+                session = _build_requests_session(proxy, pool_size)
+
+            self._sessions[key] = (pool_size, session)
+            return session
+
+    def clear(self) -> None:
+        """Close and forget all cached sessions."""
+        with self._lock:
+            for _, session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+SESSION_POOL = SessionPool()
+
+
+def get_session(proxy: str | None = None, pool_size: int = DEFAULT_POOL_SIZE, http2: bool = False):
+    """Get a pooled session from the module-wide SessionPool."""
+    return SESSION_POOL.get(proxy=proxy, pool_size=pool_size, http2=http2)
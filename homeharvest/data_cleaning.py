@@ -289,21 +289,22 @@ def validate_property_data(property_dict: dict) -> dict:
     return cleaned
 
 
-def clean_dataframe(df: pd.DataFrame, add_derived_fields: bool = True) -> pd.DataFrame:
+def clean_dataframe(df: pd.DataFrame, add_derived_fields: bool = True, inplace: bool = False) -> pd.DataFrame:
     """
     Clean and validate an entire DataFrame of properties.
 
     Args:
         df: DataFrame with property data
         add_derived_fields: Whether to add derived fields like price_per_sqft
+        inplace: Clean df itself instead of a copy (for frames nothing else references)
 
     Returns:
-        Cleaned DataFrame
+        Cleaned DataFrame (df itself when inplace)
     """
     if df.empty:
         return df
 
-    cleaned_df = df.copy()
+    cleaned_df = df if inplace else df.copy()
 
     # Clean numeric fields
     if 'list_price' in cleaned_df.columns:
@@ -385,9 +386,9 @@ def get_data_quality_report(df: pd.DataFrame) -> dict:
         "data_ranges": {},
     }
 
-    # Calculate completeness for each column
-    for col in df.columns:
-        non_null = df[col].notna().sum()
+    # Non-null counts of every column in one pass; reused to skip empty columns below
+    counts = df.count()
+    for col, non_null in zip(df.columns, counts.tolist()):
         report["completeness"][col] = {
             "count": int(non_null),
             "percentage": round((non_null / total) * 100, 2)
@@ -396,12 +397,13 @@ def get_data_quality_report(df: pd.DataFrame) -> dict:
     # Calculate ranges for numeric columns
     numeric_cols = ['list_price', 'sqft', 'lot_sqft', 'beds', 'baths', 'year_built', 'hoa_fee', 'stories']
     for col in numeric_cols:
-        if col in df.columns and df[col].notna().any():
+        if col in df.columns and counts[col] > 0:
+            values = df[col]
             report["data_ranges"][col] = {
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
-                "mean": round(float(df[col].mean()), 2),
-                "median": float(df[col].median())
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "mean": round(float(values.mean()), 2),
+                "median": float(values.median())
             }
 
     return report
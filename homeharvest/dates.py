@@ -0,0 +1,110 @@
+"""
+Shared ISO-8601 date parsing.
+
+Provides cached parsing of the date strings returned by the API (many listings
+share the same timestamps, so each distinct string is parsed once per process),
+naive (and naive UTC) datetime normalization for comparisons, cached CSV formatting and a
+vectorized path for DataFrame columns.
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
+
+import pandas as pd
+
+#: distinct date strings (and datetimes to format) kept in each cache
+DATE_CACHE_SIZE = 65_536
+
+#: output format of dates in results DataFrames
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_iso(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        pass
+
+    # Date-only prefix of an otherwise malformed timestamp, e.g. '2025-08-29T25:00'
+    if "T" in value:
+        try:
+            return datetime.strptime(value.split("T")[0], "%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO-8601 date string, keeping its timezone if it has one.
+
+    Args:
+        value: Date string ('Z' suffixes are accepted), datetime, or None
+
+    Returns:
+        datetime (the value itself for datetimes), or None when missing or unparseable
+    """
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    return _parse_iso(value)
+
+
+def parse_naive_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse a date string or datetime into a timezone-naive datetime.
+
+    The timezone is dropped without conversion, so that API dates compare with
+    the naive cutoffs the scraper builds.
+
+    Returns:
+        Naive datetime, or None when missing or unparseable
+    """
+    parsed = parse_datetime(value)
+    if parsed is None or parsed.tzinfo is None:
+        return parsed
+    return parsed.replace(tzinfo=None)
+
+
+def parse_utc_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse a date string or datetime into a naive UTC datetime.
+
+    Timezone-aware values are converted to UTC, the same way parse_datetime_series
+    does, so that row-wise and DataFrame filters agree.
+
+    Returns:
+        Naive datetime, or None when missing or unparseable
+    """
+    parsed = parse_datetime(value)
+    if parsed is None or parsed.tzinfo is None:
+        return parsed
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_datetime(value: datetime) -> str:
+    """Format a datetime for results DataFrames ('%Y-%m-%d %H:%M:%S')."""
+    return value.strftime(DATETIME_FORMAT)
+
+
+def parse_datetime_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized parsing of a column of date strings or datetimes.
+
+    Timezone-aware values are converted to UTC and returned naive; unparseable
+    values become NaT.
+
+    Returns:
+        datetime64 Series aligned with series
+    """
+    parsed = pd.to_datetime(series, errors="coerce", format="ISO8601", utc=True)
+    return parsed.dt.tz_localize(None)
+
+
+def clear_date_caches() -> None:
+    """Empty the parsing and formatting caches."""
+    _parse_iso.cache_clear()
+    format_datetime.cache_clear()
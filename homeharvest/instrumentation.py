@@ -0,0 +1,243 @@
+"""
+Timing and metrics instrumentation for the scrape pipeline.
+
+Provides per-stage spans, request counters, a returned stats object, metric
+hooks and a Prometheus text exporter.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+# Counter names recorded by the scraper
+BYTES_DOWNLOADED = "bytes_downloaded"
+REQUESTS = "requests"
+RETRIES = "retries"
+RATE_LIMITED = "rate_limited_429"
+CACHE_HITS = "cache_hits"
+PAGES_SKIPPED = "pages_skipped"
+
+def _transferred_bytes(response) -> int:
+    """Size of a response body on the wire (see ScrapeStats.record_response)."""
+    downloaded = getattr(response, "num_bytes_downloaded", None)  # httpx
+    if downloaded:
+        return int(downloaded)
+    length = (getattr(response, "headers", None) or {}).get("Content-Length")
+    if length and str(length).isdigit():
+        return int(length)
+    return len(getattr(response, "content", None) or b"")
+
+
+# Global hooks, called for every span and counter on every ScrapeStats
+_GLOBAL_HOOKS: List[Callable] = []
+
+
+def register_metrics_hook(hook: Callable[[str, str, float], None]) -> None:
+    """
+    Register a hook that receives every metric event.
+
+    Args:
+        hook: Callable taking (kind, name, value) where kind is "span" (value in
+            seconds) or "counter" (value is the increment)
+    """
+    if hook not in _GLOBAL_HOOKS:
+        _GLOBAL_HOOKS.append(hook)
+
+
+def unregister_metrics_hook(hook: Callable[[str, str, float], None]) -> None:
+    """Remove a hook previously added with register_metrics_hook."""
+    if hook in _GLOBAL_HOOKS:
+        _GLOBAL_HOOKS.remove(hook)
+
+
+def timed(stage: str):
+    """
+    Decorator timing a scraper method as a span of `stage` on `self.stats`.
+
+    Args:
+        stage: Stage name to record under
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.stats.span(stage):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StageTiming:
+    """Aggregated timings for one pipeline stage."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "min_seconds": round(self.min, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+        }
+
+
+class ScrapeStats:
+    """
+    Thread-safe collector of stage timings and counters for one or more scrapes.
+
+    Pass an instance to scrape_property(stats=...) or use return_stats=True to get
+    one back. Worker threads record into the same instance.
+    """
+
+    def __init__(self, hooks: Optional[List[Callable[[str, str, float], None]]] = None):
+        self._lock = threading.Lock()
+        self._timings: Dict[str, StageTiming] = {}
+        self._counters: Dict[str, float] = {}
+        self._hooks = list(hooks) if hooks else []
+        self.started_at = time.time()
+
+    def add_hook(self, hook: Callable[[str, str, float], None]) -> None:
+        """Add a hook that receives (kind, name, value) for this instance only."""
+        self._hooks.append(hook)
+
+    def _emit(self, kind: str, name: str, value: float) -> None:
+        for hook in self._hooks + _GLOBAL_HOOKS:
+            try:
+                hook(kind, name, value)
+            except Exception:
+                pass  # A broken hook must never break a scrape
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record one completed span of a stage."""
+        with self._lock:
+            timing = self._timings.get(stage)
+            if timing is None:
+                timing = self._timings[stage] = StageTiming()
+            timing.add(seconds)
+        self._emit("span", stage, seconds)
+
+    @contextmanager
+    def span(self, stage: str):
+        """Context manager timing the enclosed block as one span of `stage`."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def incr(self, counter: str, amount: float = 1) -> None:
+        """Increment a named counter."""
+        if not amount:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+        self._emit("counter", counter, amount)
+
+    def record_response(self, response) -> None:
+        """
+        Count a finished HTTP response: bytes downloaded, retries and 429s.
+
+        Bytes are counted as transferred, before gzip decoding: httpx's
+        num_bytes_downloaded, else the Content-Length header, else (chunked
+        responses without either) the decoded body size.
+
+        Retries performed by the transport are read from the urllib3 retry history
+        (or the HTTP/2 session's retry_history).
+        """
+        self.incr(REQUESTS)
+        transferred = _transferred_bytes(response)
+        if transferred:
+            self.incr(BYTES_DOWNLOADED, transferred)
+
+        history = getattr(response, "retry_history", None)  # HTTP/2 transport
+        if history is None:
+            retries = getattr(getattr(response, "raw", None), "retries", None)
+            history = getattr(retries, "history", None) or ()
+        self.incr(RETRIES, len(history))
+        # urllib3 history entries carry .status, httpx responses carry .status_code
+        rate_limited = sum(
+            1 for attempt in history
+            if getattr(attempt, "status", None) == 429 or getattr(attempt, "status_code", None) == 429
+        )
+        if getattr(response, "status_code", None) == 429:
+            rate_limited += 1
+        self.incr(RATE_LIMITED, rate_limited)
+
+    @property
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: timing.to_dict() for stage, timing in self._timings.items()}
+
+    @property
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Get a JSON-serializable summary.
+
+        Returns:
+            Dictionary with wall time, per-stage timings and counters
+        """
+        return {
+            "wall_seconds": round(time.time() - self.started_at, 6),
+            "timings": self.timings,
+            "counters": self.counters,
+        }
+
+    def merge(self, other: "ScrapeStats") -> "ScrapeStats":
+        """Fold another stats object into this one (e.g. from a batch of scrapes)."""
+        for stage, timing in other._timings.items():
+            with self._lock:
+                mine = self._timings.setdefault(stage, StageTiming())
+                mine.count += timing.count
+                mine.total += timing.total
+                mine.min = min(mine.min, timing.min)
+                mine.max = max(mine.max, timing.max)
+        for counter, value in other.counters.items():
+            with self._lock:
+                self._counters[counter] = self._counters.get(counter, 0) + value
+        return self
+
+    def to_prometheus(self, prefix: str = "homeharvest") -> str:
+        """
+        Render the stats in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Text suitable for a /metrics endpoint or a push gateway
+        """
+        lines = [
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, timing in sorted(self.timings.items()):
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {timing["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {timing["total_seconds"]}')
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{counter}_total counter")
+            lines.append(f"{prefix}_{counter}_total {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self) -> str:
+        return f"ScrapeStats(timings={self.timings}, counters={self.counters})"
@@ -0,0 +1,535 @@
+"""
+Precomputed market statistics by ZIP, property type, status and week.
+
+Provides a mergeable quantile sketch for medians, and a statistics cube that is
+built from snapshots, updated incrementally with new scrape results and keeps
+every rollup (e.g. one ZIP over all weeks) precomputed, so that market stat
+queries are dictionary lookups and multi-ZIP areas merge a few sketches instead
+of rescanning listings.
+"""
+import math
+import threading
+from datetime import date, datetime, timedelta
+from itertools import product
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .chunked import DEFAULT_CHUNKSIZE, Source, iter_chunks
+from .dates import parse_datetime_series
+
+#: wildcard member of a cube dimension (rolled up over all values)
+ALL = "*"
+
+#: value of a dimension missing from a listing
+UNKNOWN = "UNKNOWN"
+
+#: cube dimensions, in key order
+DIMENSIONS = ("zip_code", "property_type", "status", "week")
+
+#: listing columns aggregated per cell, and the name they take in stats dicts
+METRICS = {
+    "list_price": "price",
+    "sold_price": "sold_price",
+    "price_per_sqft": "price_per_sqft",
+    "days_on_mls": "days_on_market",
+}
+
+#: default relative accuracy of quantile sketches (1%)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+#: sketch bin of zero and negative values
+ZERO_BIN = int(np.iinfo(np.int64).min)
+
+_NO_BINS = np.empty(0, dtype=np.int64)
+
+CellKey = Tuple[Hashable, Hashable, Hashable, Hashable]
+Members = Union[None, Hashable, Iterable[Hashable]]
+
+
+def week_of(value: Union[date, datetime, str]) -> str:
+    """Start (Monday) of the week containing a date, as 'YYYY-MM-DD'."""
+    day = pd.Timestamp(value).date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative error guarantees (DDSketch).
+
+    Positive values are counted in logarithmic bins of ratio gamma, so any
+    quantile is estimated within relative_accuracy of a value of the right rank.
+    Sketches with the same accuracy merge exactly by adding bin counts. Values
+    that are zero or negative are counted together in ZERO_BIN. Bins are kept as
+    sorted arrays of bin indices and counts.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.indices = _NO_BINS
+        self.counts = _NO_BINS
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def bin_indices(self, values: np.ndarray) -> np.ndarray:
+        """Bin of each value (ZERO_BIN for zero and negative values)."""
+        positive = values > 0
+        indices = np.full(len(values), ZERO_BIN, dtype=np.int64)
+        indices[positive] = np.ceil(np.log(values[positive]) / math.log(self.gamma))
+        return indices
+
+    def add_bins(self, indices: np.ndarray, counts: np.ndarray) -> "QuantileSketch":
+        """Add counts of values per bin (sorted, distinct bin indices as given by bin_indices)."""
+        if not len(self.indices):
+            self.indices, self.counts = indices.astype(np.int64), counts.astype(np.int64)
+            return self
+        positions = np.searchsorted(self.indices, indices)
+        if positions[-1] < len(self.indices) and np.array_equal(self.indices[positions], indices):
+            # All bins already present (the common case once a cell has data)
+            self.counts[positions] += counts
+            return self
+        self.indices, positions = np.unique(np.concatenate([self.indices, indices]), return_inverse=True)
+        self.counts = np.bincount(positions, weights=np.concatenate([self.counts, counts])).astype(np.int64)
+        return self
+
+    def add(self, values) -> "QuantileSketch":
+        """Add an array of values (NaN ignored)."""
+        values = np.asarray(values, dtype=float)
+        return self.add_bins(*np.unique(self.bin_indices(values[~np.isnan(values)]), return_counts=True))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Quantile sketches must have the same relative accuracy to merge.")
+        return self.add_bins(other.indices, other.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (0 <= q <= 1), or None when empty."""
+        cumulative = np.cumsum(self.counts)
+        if not len(cumulative):
+            return None
+        position = int(np.searchsorted(cumulative, q * (cumulative[-1] - 1), side="right"))
+        index = int(self.indices[min(position, len(cumulative) - 1)])
+        if index == ZERO_BIN:
+            return 0.0
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def median(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+    def to_dict(self) -> dict:
+        return {"relative_accuracy": self.relative_accuracy, "indices": self.indices.tolist(),
+                "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        if data["indices"]:
+            sketch.indices = np.array(data["indices"], dtype=np.int64)
+            sketch.counts = np.array(data["counts"], dtype=np.int64)
+        return sketch
+
+
+class MetricStats:
+    """Count, sum, min, max and a quantile sketch of one metric."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def merge(self, other: "MetricStats") -> "MetricStats":
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def median(self) -> Optional[float]:
+        return self.sketch.median()
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.sketch.quantile(q)
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "total": self.total, "minimum": self.minimum, "maximum": self.maximum,
+                "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MetricStats":
+        metric = cls(data["sketch"]["relative_accuracy"])
+        metric.count, metric.total = data["count"], data["total"]
+        metric.minimum, metric.maximum = data["minimum"], data["maximum"]
+        metric.sketch = QuantileSketch.from_dict(data["sketch"])
+        return metric
+
+
+class MarketCell:
+    """Aggregates of the listings in one cube cell."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.listings = 0
+        #: MetricStats of the METRICS columns seen in the cell's listings
+        self.metrics: Dict[str, MetricStats] = {}
+
+    def metric(self, column: str) -> MetricStats:
+        metric = self.metrics.get(column)
+        if metric is None:
+            metric = self.metrics[column] = MetricStats(self.relative_accuracy)
+        return metric
+
+    def merge(self, other: "MarketCell") -> "MarketCell":
+        self.listings += other.listings
+        for column, metric in other.metrics.items():
+            self.metric(column).merge(metric)
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Market statistics of the cell.
+
+        Returns:
+            Dictionary with total_properties and avg_/median_ values of each
+            metric (e.g. avg_price, median_price, avg_days_on_market); None when
+            no listing has the metric
+        """
+        stats = {"total_properties": self.listings}
+        for column, name in METRICS.items():
+            metric = self.metrics.get(column)
+            stats[f"avg_{name}"] = metric.mean() if metric else None
+            stats[f"median_{name}"] = metric.median() if metric else None
+        return stats
+
+
+class MarketStatsCube:
+    """
+    Market statistics by ZIP x property type x status x week, maintained incrementally.
+
+    Every update adds the new listings to their cell and to each of its rollups
+    (the same key with any dimensions replaced by ALL), so a query for an area
+    at any granularity reads one precomputed cell. Listings already counted in
+    the same status and week (same property_id) are skipped, so overlapping
+    scrapes can be fed as they come. Instances built from disjoint data (e.g.
+    by different worker processes) combine with merge(); cubes pickle, and
+    to_dict()/from_dict() give a JSON-serializable form to ship or store them.
+
+    Example:
+        cube = MarketStatsCube.from_snapshot("phoenix.csv")
+        cube.update(new_scrape_df)
+        cube.stats(zip_code="85004", status="FOR_SALE")["median_price"]
+        cube.stats(zip_code=["85004", "85006"], since="2025-01-01")
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, date_column: str = "list_date",
+                 property_type_column: str = "style"):
+        """
+        Args:
+            relative_accuracy: Relative accuracy of medians
+            date_column: Date column listings are bucketed into weeks by
+            property_type_column: Column holding the property type
+        """
+        self.relative_accuracy = relative_accuracy
+        self.date_column = date_column
+        self.property_type_column = property_type_column
+        self._lock = threading.Lock()
+        self._cells: Dict[CellKey, MarketCell] = {}
+        self._weeks = set()
+        self._seen = set()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        """
+        JSON-serializable form of the cube (settings, cells, weeks and counted listings).
+
+        Returns:
+            Dictionary for from_dict
+        """
+        with self._lock:
+            return {
+                "relative_accuracy": self.relative_accuracy,
+                "date_column": self.date_column,
+                "property_type_column": self.property_type_column,
+                "cells": [
+                    {"key": list(key), "listings": cell.listings,
+                     "metrics": {column: metric.to_dict() for column, metric in cell.metrics.items()}}
+                    for key, cell in self._cells.items()
+                ],
+                "weeks": sorted(self._weeks),
+                "seen": [list(identity) for identity in self._seen],
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MarketStatsCube":
+        """Rebuild a cube from to_dict() output."""
+        cube = cls(data["relative_accuracy"], data["date_column"], data["property_type_column"])
+        for cell_data in data["cells"]:
+            cell = cube._cell(tuple(cell_data["key"]))
+            cell.listings = cell_data["listings"]
+            cell.metrics = {column: MetricStats.from_dict(metric) for column, metric in cell_data["metrics"].items()}
+        cube._weeks = set(data["weeks"])
+        cube._seen = {tuple(identity) for identity in data["seen"]}
+        return cube
+
+    @classmethod
+    def from_snapshot(cls, source: Source, chunksize: int = DEFAULT_CHUNKSIZE, **kwargs) -> "MarketStatsCube":
+        """
+        Build a cube from a stored snapshot in bounded memory.
+
+        Args:
+            source: DataFrame, .csv/.parquet path or iterable of DataFrames (see chunked.iter_chunks)
+            chunksize: Rows per chunk
+            **kwargs: MarketStatsCube arguments
+
+        Returns:
+            MarketStatsCube
+        """
+        cube = cls(**kwargs)
+        for chunk in iter_chunks(source, chunksize):
+            cube.update(chunk)
+        return cube
+
+    def __len__(self) -> int:
+        """Number of listings counted."""
+        cell = self._cells.get((ALL, ALL, ALL, ALL))
+        return cell.listings if cell else 0
+
+    def _column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        if column not in df.columns:
+            return pd.Series(UNKNOWN, index=df.index)
+        values = df[column]
+        present = values.notna()
+        if column == "zip_code" and pd.api.types.is_numeric_dtype(values):
+            # ZIP codes read back from CSV snapshots lose their leading zeros
+            values = values.astype("Int64").astype(str).str.zfill(5)
+        else:
+            values = values.astype(str)
+            if column != "zip_code":
+                values = values.str.upper()
+        return values.where(present, UNKNOWN)
+
+    def _keys(self, df: pd.DataFrame, as_of: Union[date, datetime, str, None]) -> pd.DataFrame:
+        keys = pd.DataFrame({
+            "zip_code": self._column(df, "zip_code"),
+            "property_type": self._column(df, self.property_type_column),
+            "status": self._column(df, "status"),
+        })
+        fallback = week_of(as_of or datetime.now())
+        if self.date_column in df.columns:
+            dates = parse_datetime_series(df[self.date_column])
+            weeks = (dates - pd.to_timedelta(dates.dt.weekday, unit="D")).dt.strftime("%Y-%m-%d")
+            keys["week"] = weeks.where(dates.notna(), fallback)
+        else:
+            keys["week"] = fallback
+        return keys
+
+    def _identities(self, df: pd.DataFrame, keys: pd.DataFrame) -> pd.Series:
+        """(property_id, status, week) of each row, None for rows without property_id."""
+        if "property_id" not in df.columns:
+            return pd.Series(None, index=df.index, dtype=object)
+        ids = df["property_id"]
+        identities = pd.Series(list(zip(ids.astype(str), keys["status"], keys["week"])), index=df.index)
+        return identities.where(ids.notna(), None)
+
+    def _cell(self, key: CellKey) -> MarketCell:
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = MarketCell(self.relative_accuracy)
+        return cell
+
+    def _add(self, df: pd.DataFrame, keys: pd.DataFrame) -> None:
+        # Each listing counts in its own cell and in the 15 rollups containing it
+        # (any subset of dimensions replaced by ALL). Every row gets the integer
+        # codes of its 16 cells, then each aggregate is a single groupby.
+        codes, members = [], []
+        for dimension in DIMENSIONS:
+            dimension_codes, uniques = pd.factorize(keys[dimension])
+            codes.append(dimension_codes)
+            members.append(list(uniques) + [ALL])
+        shape = tuple(len(dimension_members) for dimension_members in members)
+        cell_codes = np.concatenate([
+            np.ravel_multi_index([
+                np.full(len(keys), len(dimension_members) - 1) if rolled else dimension_codes
+                for dimension_codes, dimension_members, rolled in zip(codes, members, mask)
+            ], shape)
+            for mask in product((False, True), repeat=len(DIMENSIONS))
+        ])
+
+        distinct, listings = np.unique(cell_codes, return_counts=True)
+        cells = {}
+        for code, positions, count in zip(distinct.tolist(), zip(*np.unravel_index(distinct, shape)), listings.tolist()):
+            cell = cells[code] = self._cell(tuple(member[position] for member, position in zip(members, positions)))
+            cell.listings += count
+        self._weeks.update(keys["week"].unique())
+
+        binning = QuantileSketch(self.relative_accuracy)
+        repeats = len(cell_codes) // len(keys)
+        for column in METRICS:
+            if column not in df.columns:
+                continue
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+            present = np.tile(~np.isnan(values), repeats)
+            if not present.any():
+                continue
+            values = np.tile(values, repeats)[present]
+            frame = pd.DataFrame({"cell": cell_codes[present], "value": values, "bin": binning.bin_indices(values)})
+
+            summary = frame.groupby("cell")["value"].agg(["count", "sum", "min", "max"])
+            for code, count, total, minimum, maximum in summary.itertuples(name=None):
+                metric = cells[code].metric(column)
+                metric.count += int(count)
+                metric.total += float(total)
+                metric.minimum = min(metric.minimum, float(minimum))
+                metric.maximum = max(metric.maximum, float(maximum))
+
+            # Bin counts sorted by cell then bin: one contiguous slice per cell
+            bins = frame.groupby(["cell", "bin"]).size()
+            bin_cells = bins.index.get_level_values("cell").to_numpy()
+            indices, counts = bins.index.get_level_values("bin").to_numpy(), bins.to_numpy()
+            starts = np.flatnonzero(np.diff(bin_cells, prepend=-1))
+            ends = np.append(starts[1:], len(bins))
+            for code, start, end in zip(bin_cells[starts].tolist(), starts, ends):
+                cells[code].metric(column).sketch.add_bins(indices[start:end], counts[start:end])
+
+    def update(self, df: pd.DataFrame, as_of: Union[date, datetime, str, None] = None) -> "MarketStatsCube":
+        """
+        Add new listings (a scrape delta or a snapshot chunk).
+
+        Args:
+            df: Listings DataFrame (zip_code, status, property type and date columns,
+                plus the METRICS columns that are available)
+            as_of: Date of the scrape; listings without a date are counted in its
+                week (the current week when None)
+
+        Returns:
+            self
+        """
+        if df is None or len(df) == 0:
+            return self
+
+        keys = self._keys(df, as_of)
+        identities = self._identities(df, keys)
+        with self._lock:
+            # Skip listings already counted in this status and week, here or in an earlier update
+            seen = identities.map(lambda identity: identity is not None and identity in self._seen)
+            keep = ~(seen | (identities.duplicated() & identities.notna()))
+            if not keep.all():
+                df, keys, identities = df[keep], keys[keep], identities[keep]
+            self._seen.update(identities.dropna())
+            if len(df):
+                self._add(df, keys)
+        return self
+
+    def merge(self, other: "MarketStatsCube") -> "MarketStatsCube":
+        """
+        Fold another cube (e.g. from another worker, over different listings) into this one.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cubes must have the same relative accuracy to merge.")
+        with self._lock:
+            for key, cell in other._cells.items():
+                self._cell(key).merge(cell)
+            self._weeks.update(other._weeks)
+            self._seen.update(other._seen)
+        return self
+
+    def weeks(self, since: Union[date, datetime, str, None] = None) -> List[str]:
+        """Weeks with listings (week start dates), optionally from the week containing since."""
+        start = week_of(since) if since is not None else ""
+        return sorted(week for week in self._weeks if week >= start)
+
+    def cell(self, zip_code: Hashable = ALL, property_type: Hashable = ALL, status: Hashable = ALL,
+             week: Hashable = ALL) -> Optional[MarketCell]:
+        """Precomputed cell of one key (ALL rolls a dimension up), or None when empty."""
+        week = ALL if week is None or week == ALL else week_of(week)
+        return self._cells.get((self._member(zip_code), self._member(property_type, True),
+                                self._member(status, True), week))
+
+    @staticmethod
+    def _member(value: Hashable, upper: bool = False) -> Hashable:
+        if value is None or value == ALL:
+            return ALL
+        return str(value).upper() if upper else str(value)
+
+    def _members(self, value: Members, upper: bool = False) -> List[Hashable]:
+        if value is None or isinstance(value, (str, int)):
+            return [self._member(value, upper)]
+        return [self._member(member, upper) for member in value]
+
+    def query(self, zip_code: Members = None, property_type: Members = None, status: Members = None,
+              week: Members = None, since: Union[date, datetime, str, None] = None) -> MarketCell:
+        """
+        Aggregates over an area, merging precomputed cells.
+
+        Each dimension takes one value, a list of values (merged) or None for all.
+
+        Args:
+            zip_code: ZIP code(s)
+            property_type: Property type(s) (e.g. "SINGLE_FAMILY")
+            status: Status(es) (e.g. "FOR_SALE", "SOLD")
+            week: Week start date(s) ('YYYY-MM-DD')
+            since: Only the weeks from the one containing this date (ignored with week)
+
+        Returns:
+            MarketCell (empty when nothing matches)
+        """
+        if week is None and since is not None:
+            weeks = self.weeks(since)
+        elif week is None:
+            weeks = [ALL]
+        else:
+            weeks = [week_of(member) for member in ([week] if isinstance(week, (str, date)) else week)]
+
+        keys = product(self._members(zip_code), self._members(property_type, True),
+                       self._members(status, True), weeks)
+        with self._lock:
+            cells = [self._cells[key] for key in keys if key in self._cells]
+            if len(cells) == 1:
+                return cells[0]
+            merged = MarketCell(self.relative_accuracy)
+            for cell in cells:
+                merged.merge(cell)
+            return merged
+
+    def stats(self, zip_code: Members = None, property_type: Members = None, status: Members = None,
+              week: Members = None, since: Union[date, datetime, str, None] = None) -> dict:
+        """
+        Market statistics of an area (see query), e.g. median_price, avg_days_on_market.
+
+        Returns:
+            Dictionary from MarketCell.to_dict
+        """
+        return self.query(zip_code, property_type, status, week, since).to_dict()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The cube's base cells (no rollups) as a DataFrame.
+
+        Returns:
+            One row per ZIP, property type, status and week with total_properties
+            and the avg_/median_ columns of MarketCell.to_dict
+        """
+        with self._lock:
+            rows = [
+                dict(zip(DIMENSIONS, key), **cell.to_dict())
+                for key, cell in self._cells.items() if ALL not in key
+            ]
+        columns = list(DIMENSIONS) + list(MarketCell().to_dict())
+        return pd.DataFrame(rows, columns=columns).sort_values(list(DIMENSIONS), ignore_index=True)
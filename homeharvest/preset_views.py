@@ -0,0 +1,158 @@
+"""
+Evaluate many filter presets against one scrape.
+
+Provides a superset scrape per location (no preset filters applied) and
+per-preset views computed locally with vectorized masks, so N presets cost one
+scrape instead of N.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .core.scrapers.realtor.filters import compile_params_filters
+from .presets import FILTER_PRESETS, compile_presets
+from .tag_utils import expand_tag_search
+
+
+class PresetViews:
+    """
+    Per-preset views over one results DataFrame.
+
+    Each preset is compiled to a HomeFilter covering both the filters the API
+    would have applied (property type, beds/baths/sqft/price/lot/year ranges)
+    and the client-side ones (tags, HOA, stories, garage, flags), then evaluated
+    as a boolean mask. Masks are cached per preset combination.
+
+    Example:
+        views = PresetViews.scrape("Phoenix, AZ", listing_type="for_sale", past_days=30)
+        luxury = views.view("luxury")
+        views.counts()
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df if df is not None else pd.DataFrame()
+        self._lock = threading.Lock()
+        self._masks: Dict[Tuple[str, ...], pd.Series] = {}
+
+    @classmethod
+    def scrape(cls, location: str, **scrape_kwargs) -> "PresetViews":
+        """
+        Scrape a location once, without preset filters.
+
+        Any explicit filters in scrape_kwargs still apply to the superset scrape,
+        and so to every view.
+
+        Args:
+            location: Location to search
+            **scrape_kwargs: scrape_property arguments (preset and return_type are ignored)
+
+        Returns:
+            PresetViews over the results
+        """
+        from . import scrape_property
+
+        scrape_kwargs.pop("preset", None)
+        scrape_kwargs["return_type"] = "pandas"
+        if scrape_kwargs.get("return_stats"):
+            df, _ = scrape_property(location, **scrape_kwargs)
+        else:
+            df = scrape_property(location, **scrape_kwargs)
+        return cls(df)
+
+    def _params(self, preset_names: Tuple[str, ...], overrides: Dict[str, Any]) -> Dict[str, Any]:
+        params = {}
+        if preset_names:
+            compiled = compile_presets(*preset_names)
+            params = compiled.params()
+            if compiled.expanded_tag_filters:
+                params["tag_filters"] = list(compiled.expanded_tag_filters)
+            if compiled.expanded_tag_exclude:
+                params["tag_exclude"] = list(compiled.expanded_tag_exclude)
+
+        for field in ("tag_filters", "tag_exclude"):
+            if overrides.get(field):
+                overrides = overrides | {
+                    field: expand_tag_search(overrides[field], use_aliases=True, use_fuzzy=False)
+                }
+        return params | overrides
+
+    def mask(self, *preset_names: str, **overrides) -> pd.Series:
+        """
+        Boolean mask of the rows matching one preset (or a combination).
+
+        Args:
+            *preset_names: Preset names, combined as combine_presets does
+            **overrides: Filter parameters that take precedence over the presets
+
+        Returns:
+            Boolean Series aligned with the DataFrame's index
+        """
+        key = tuple(preset_names)
+        if not overrides:
+            cached = self._masks.get(key)
+            if cached is not None:
+                return cached
+
+        home_filter = compile_params_filters(self._params(key, overrides))
+        if self.df.empty:
+            mask = pd.Series(True, index=self.df.index, dtype=bool)
+        else:
+            mask = pd.Series(home_filter.mask(self.df).to_numpy(), index=self.df.index)
+
+        if not overrides:
+            with self._lock:
+                self._masks[key] = mask
+        return mask
+
+    def view(self, *preset_names: str, **overrides) -> pd.DataFrame:
+        """
+        Rows matching one preset (or a combination), as a new DataFrame.
+        """
+        return self.df[self.mask(*preset_names, **overrides)]
+
+    def views(self, preset_names: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Views for several presets.
+
+        Args:
+            preset_names: Presets to evaluate (all presets when None)
+
+        Returns:
+            Dictionary of preset name to DataFrame
+        """
+        names: List[str] = list(preset_names) if preset_names is not None else list(FILTER_PRESETS)
+        return {name: self.view(name) for name in names}
+
+    def counts(self, preset_names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Number of matching rows per preset.
+
+        Args:
+            preset_names: Presets to evaluate (all presets when None)
+
+        Returns:
+            Dictionary of preset name to count
+        """
+        names: List[str] = list(preset_names) if preset_names is not None else list(FILTER_PRESETS)
+        return {name: int(self.mask(name).sum()) for name in names}
+
+
+def scrape_presets(location: str, presets: Optional[List[str]] = None,
+                   **scrape_kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Scrape a location once and return a view for each preset.
+
+    Args:
+        location: Location to search
+        presets: Preset names (all presets when None)
+        **scrape_kwargs: scrape_property arguments shared by every preset
+
+    Returns:
+        Dictionary of preset name to DataFrame
+
+    Example:
+        >>> results = scrape_presets("Austin, TX", ["luxury", "pool_home"], listing_type="for_sale")
+        >>> results["luxury"].head()
+    """
+    return PresetViews.scrape(location, **scrape_kwargs).views(presets)
@@ -3,7 +3,12 @@ Smart filter presets for common property search scenarios.
 
 Provides pre-configured filter combinations for typical use cases.
 """
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from .tag_utils import expand_tag_search
 
 
 # Define filter presets for common search scenarios
@@ -250,6 +255,180 @@ def get_all_presets_info() -> Dict[str, str]:
     }
 
 
+# scrape_property parameters a preset can set, in signature order
+PRESET_FIELDS = (
+    "property_type",
+    "beds_min", "beds_max", "baths_min", "baths_max", "sqft_min", "sqft_max",
+    "price_min", "price_max", "lot_sqft_min", "lot_sqft_max", "year_built_min", "year_built_max",
+    "tag_filters", "tag_match_type", "tag_exclude",
+    "hoa_fee_min", "hoa_fee_max", "stories_min", "stories_max", "garage_spaces_min", "garage_spaces_max",
+    "has_pool", "has_garage", "waterfront", "has_view",
+)
+
+# List-valued parameters; stored as tuples so compiled presets stay immutable
+_LIST_FIELDS = ("property_type", "tag_filters", "tag_exclude")
+
+
+class CompiledPreset(BaseModel):
+    """
+    A validated, immutable preset (or combination of presets).
+
+    Unknown filter names are rejected, tag lists are stored as tuples and the
+    tag filters are alias-expanded once at compile time.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    name: str
+    description: str = ""
+
+    property_type: Optional[Tuple[str, ...]] = None
+    beds_min: Optional[int] = None
+    beds_max: Optional[int] = None
+    baths_min: Optional[float] = None
+    baths_max: Optional[float] = None
+    sqft_min: Optional[int] = None
+    sqft_max: Optional[int] = None
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+    lot_sqft_min: Optional[int] = None
+    lot_sqft_max: Optional[int] = None
+    year_built_min: Optional[int] = None
+    year_built_max: Optional[int] = None
+    tag_filters: Optional[Tuple[str, ...]] = None
+    tag_match_type: Optional[str] = None
+    tag_exclude: Optional[Tuple[str, ...]] = None
+    hoa_fee_min: Optional[int] = None
+    hoa_fee_max: Optional[int] = None
+    stories_min: Optional[int] = None
+    stories_max: Optional[int] = None
+    garage_spaces_min: Optional[int] = None
+    garage_spaces_max: Optional[int] = None
+    has_pool: Optional[bool] = None
+    has_garage: Optional[bool] = None
+    waterfront: Optional[bool] = None
+    has_view: Optional[bool] = None
+
+    # Alias-expanded tag lists (as expand_tag_search with aliases, without fuzzy matching)
+    expanded_tag_filters: Optional[Tuple[str, ...]] = None
+    expanded_tag_exclude: Optional[Tuple[str, ...]] = None
+
+    @field_validator("tag_match_type")
+    @classmethod
+    def _check_match_type(cls, value):
+        if value is not None and value not in ("any", "all", "exact"):
+            raise ValueError(f"Invalid tag_match_type '{value}'. Must be 'any', 'all' or 'exact'.")
+        return value
+
+    def params(self) -> Dict[str, Any]:
+        """
+        Get the preset's filter parameters as a new dictionary.
+
+        Returns:
+            Dictionary of the parameters the preset sets (lists as new lists)
+        """
+        params = {}
+        for field in PRESET_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                params[field] = list(value) if field in _LIST_FIELDS else value
+        return params
+
+    def merge(self, explicit: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill the preset's parameters into explicit scrape_property arguments.
+
+        Explicit values always win. A preset value is used when the argument is None,
+        and for tag_match_type when it is still the default "any".
+
+        Args:
+            explicit: Mapping of every PRESET_FIELDS name to its argument value
+
+        Returns:
+            New dictionary with the merged value of every PRESET_FIELDS name
+        """
+        merged = dict(explicit)
+        for field, value in self.params().items():
+            if field == "tag_match_type":
+                if merged.get(field) in (None, "any"):
+                    merged[field] = value
+            elif merged.get(field) is None:
+                merged[field] = value
+        return merged
+
+
+def _expanded(tags) -> Optional[Tuple[str, ...]]:
+    if not tags:
+        return None
+    return tuple(sorted(expand_tag_search(list(tags), use_aliases=True, use_fuzzy=False)))
+
+
+def _compile(name: str, description: str, filters: Dict[str, Any]) -> CompiledPreset:
+    filters = {
+        field: tuple(value) if field in _LIST_FIELDS and value is not None else value
+        for field, value in filters.items()
+    }
+    return CompiledPreset(
+        name=name,
+        description=description,
+        expanded_tag_filters=_expanded(filters.get("tag_filters")),
+        expanded_tag_exclude=_expanded(filters.get("tag_exclude")),
+        **filters,
+    )
+
+
+@lru_cache(maxsize=None)
+def _compile_preset(preset_name: str) -> CompiledPreset:
+    if preset_name not in FILTER_PRESETS:
+        available = ", ".join(get_available_presets())
+        raise ValueError(
+            f"Unknown preset '{preset_name}'. "
+            f"Available presets: {available}"
+        )
+    info = FILTER_PRESETS[preset_name]
+    return _compile(preset_name, info["description"], info["filters"])
+
+
+@lru_cache(maxsize=256)
+def _compile_combination(preset_names: Tuple[str, ...]) -> CompiledPreset:
+    presets = [_compile_preset(name) for name in preset_names]
+    if len(presets) == 1:
+        return presets[0]
+
+    combined: Dict[str, Any] = {}
+    for preset in presets:
+        combined.update(preset.params())
+
+    # Tag filters are combined instead of replaced (first occurrence order, no duplicates)
+    all_tag_filters = [tag for preset in presets for tag in (preset.tag_filters or ())]
+    if all_tag_filters:
+        combined["tag_filters"] = list(dict.fromkeys(all_tag_filters))
+
+    return _compile(
+        "+".join(preset_names),
+        "; ".join(preset.description for preset in presets),
+        combined,
+    )
+
+
+def compile_presets(*preset_names: str) -> CompiledPreset:
+    """
+    Get the compiled (memoized) preset for one or more preset names.
+
+    Later presets take precedence; tag_filters of all presets are combined.
+
+    Args:
+        *preset_names: Names of presets to combine
+
+    Returns:
+        Frozen CompiledPreset
+
+    Raises:
+        ValueError: If any preset_name is not found or a preset is invalid
+    """
+    return _compile_combination(tuple(name.lower() for name in preset_names))
+
+
 def apply_preset(preset_name: str, override_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Get filter parameters for a preset, with optional overrides.
@@ -264,17 +443,7 @@ def apply_preset(preset_name: str, override_params: Optional[Dict[str, Any]] = N
     Raises:
         ValueError: If preset_name is not found
     """
-    preset_name_lower = preset_name.lower()
-
-    if preset_name_lower not in FILTER_PRESETS:
-        available = ", ".join(get_available_presets())
-        raise ValueError(
-            f"Unknown preset '{preset_name}'. "
-            f"Available presets: {available}"
-        )
-
-    # Start with preset filters
-    params = FILTER_PRESETS[preset_name_lower]["filters"].copy()
+    params = compile_presets(preset_name).params()
 
     # Apply any overrides
     if override_params:
@@ -297,22 +466,7 @@ def combine_presets(*preset_names: str, override_params: Optional[Dict[str, Any]
     Raises:
         ValueError: If any preset_name is not found
     """
-    combined_params = {}
-
-    for preset_name in preset_names:
-        preset_params = apply_preset(preset_name)
-        combined_params.update(preset_params)
-
-    # Handle tag_filters specially - combine them instead of replacing
-    if len(preset_names) > 1:
-        all_tag_filters = []
-        for preset_name in preset_names:
-            preset_info = get_preset_info(preset_name)
-            if preset_info and "tag_filters" in preset_info["filters"]:
-                all_tag_filters.extend(preset_info["filters"]["tag_filters"])
-
-        if all_tag_filters:
-            combined_params["tag_filters"] = list(set(all_tag_filters))  # Remove duplicates
+    combined_params = compile_presets(*preset_names).params() if preset_names else {}
 
     # Apply overrides
     if override_params:
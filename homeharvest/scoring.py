@@ -0,0 +1,207 @@
+"""
+Vectorized, user-defined property scores.
+
+Provides scoring by column-wise callables, DataFrame.eval expressions
+(compiled with numexpr when it is installed) or declarative specs of weighted,
+normalized components, plus specs reproducing the built-in investment and
+wholesale scores.
+"""
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr  # noqa: F401
+
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+#: engine used for expression scores
+EVAL_ENGINE = "numexpr" if NUMEXPR_AVAILABLE else "python"
+
+#: a score: column-wise callable, eval expression or component spec
+Score = Union[Callable[[pd.DataFrame], Any], str, Dict[str, Dict[str, Any]]]
+
+
+def _minmax(values: pd.Series) -> pd.Series:
+    return (values - values.min()) / (values.max() - values.min()) * 100
+
+
+def _max_scale(values: pd.Series) -> Optional[pd.Series]:
+    maximum = values.max()
+    return values / maximum * 100 if maximum > 0 else None
+
+
+def _rank(values: pd.Series) -> pd.Series:
+    return values.rank(pct=True) * 100
+
+
+def _zscore(values: pd.Series) -> pd.Series:
+    return (values - values.mean()) / values.std()
+
+
+#: component transforms; a transform returning None falls back to the component default
+TRANSFORMS: Dict[str, Callable[[pd.Series], Optional[pd.Series]]] = {
+    "minmax": _minmax,
+    "max": _max_scale,
+    "rank": _rank,
+    "zscore": _zscore,
+}
+
+#: sorting.compute_investment_score as a spec (statistics taken over the scored frame)
+INVESTMENT_SCORE_SPEC = {
+    # Price per sqft (lower is better, so invert)
+    "ppsf_score": {"column": "price_per_sqft", "fill": "median", "transform": "minmax", "invert": True,
+                   "weight": 0.3, "default": 50},
+    # Price discount (below estimate is good)
+    "discount_score": {"expr": "-(list_price - estimated_value) / estimated_value * 100", "fill": 0,
+                       "clip": (0, 100), "weight": 0.4, "default": 50},
+    # Days on market (longer is better for negotiation)
+    "dom_score": {"column": "days_on_mls", "fill": 0, "transform": "max", "weight": 0.2, "default": 50},
+    # Lot size (bigger is better)
+    "lot_score": {"column": "lot_sqft", "fill": "median", "transform": "minmax", "weight": 0.1, "default": 50},
+}
+
+#: the wholesale score of agent_broker.get_wholesale_friendly_agents, over per-agent statistics
+WHOLESALE_SCORE_SPEC = {
+    "price_score": {"column": "avg_price", "transform": "max", "invert": True, "weight": 0.6, "default": 0},
+    "inventory_score": {"column": "listing_count", "transform": "max", "weight": 0.4, "default": 0},
+}
+
+
+def eval_score(df: pd.DataFrame, expr: str) -> pd.Series:
+    """
+    Evaluate an expression over the columns of df.
+
+    Args:
+        df: DataFrame with property data
+        expr: DataFrame.eval expression, e.g. "estimated_value / list_price * 100 - days_on_mls"
+
+    Returns:
+        Series aligned with df
+    """
+    result = df.eval(expr, engine=EVAL_ENGINE)
+    if not isinstance(result, pd.Series):
+        result = pd.Series(result, index=df.index)
+    return result
+
+
+def _fill(values: pd.Series, fill: Any) -> pd.Series:
+    if fill is None:
+        return values
+    if fill == "median":
+        return values.fillna(values.median())
+    if fill == "mean":
+        return values.fillna(values.mean())
+    return values.fillna(fill)
+
+
+def _component(df: pd.DataFrame, component: Dict[str, Any]) -> Union[pd.Series, float]:
+    default = component.get("default", np.nan)
+    try:
+        if "expr" in component:
+            values = eval_score(df, component["expr"])
+        else:
+            values = df[component["column"]]
+    except (KeyError, pd.errors.UndefinedVariableError):
+        return default
+
+    values = _fill(pd.to_numeric(values, errors="coerce"), component.get("fill"))
+
+    transform = component.get("transform")
+    if transform is not None:
+        values = (TRANSFORMS[transform] if isinstance(transform, str) else transform)(values)
+        if values is None:
+            return default
+
+    if component.get("invert"):
+        values = 100 - values
+    if component.get("clip") is not None:
+        lower, upper = component["clip"]
+        values = values.clip(lower=lower, upper=upper)
+    return values
+
+
+def score_components(df: pd.DataFrame, spec: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Evaluate each component of a score spec.
+
+    A component reads one column ("column") or an expression ("expr"), then
+    optionally fills missing values ("fill": a number, "median" or "mean"),
+    normalizes ("transform": "minmax", "max", "rank", "zscore" or a callable
+    taking and returning a Series), inverts to 100 - x ("invert") and clips
+    ("clip": (lower, upper)). When the input columns are missing, or a "max"
+    scale has no positive maximum, the component is its "default" instead.
+
+    Returns:
+        DataFrame with one column per component, aligned with df
+    """
+    components = pd.DataFrame(index=df.index)
+    for name, component in spec.items():
+        components[name] = _component(df, component)
+    return components
+
+
+def compute_score(df: pd.DataFrame, score: Score) -> pd.Series:
+    """
+    Compute a vectorized score for every row.
+
+    Args:
+        df: DataFrame with property data
+        score: Column-wise callable taking df and returning a Series or array,
+            DataFrame.eval expression, or component spec (see score_components;
+            the score is the weighted sum of the components, "weight" defaulting to 1)
+
+    Returns:
+        Series of scores aligned with df
+
+    Example:
+        >>> compute_score(df, "estimated_value - list_price")
+        >>> compute_score(df, INVESTMENT_SCORE_SPEC)
+        >>> compute_score(df, {"beds": {"column": "beds", "transform": "rank", "weight": 0.5},
+        ...                    "hoa": {"column": "hoa_fee", "fill": 0, "transform": "minmax", "invert": True}})
+    """
+    if isinstance(score, str):
+        return eval_score(df, score)
+
+    if isinstance(score, dict):
+        components = score_components(df, score)
+        total = pd.Series(0.0, index=df.index)
+        for name, component in score.items():
+            total = total + components[name] * component.get("weight", 1)
+        return total
+
+    result = score(df)
+    if not isinstance(result, pd.Series):
+        result = pd.Series(result, index=df.index)
+    return result
+
+
+def rank_by_score(df: pd.DataFrame, score: Score, score_name: str = "custom_score",
+                  top_k: Optional[int] = None) -> pd.DataFrame:
+    """
+    Properties ordered by a custom score, highest first.
+
+    Args:
+        df: DataFrame with property data
+        score: Score as accepted by compute_score
+        score_name: Name for the score column
+        top_k: Only the top_k properties (partial selection; all when None)
+
+    Returns:
+        DataFrame with the score column added
+    """
+    if df.empty:
+        return df
+
+    values = compute_score(df, score).reset_index(drop=True)
+    if top_k is not None:
+        order = values.nlargest(top_k).index.to_numpy()
+    else:
+        order = values.sort_values(ascending=False).index.to_numpy()
+
+    ranked = df.take(order).reset_index(drop=True)
+    ranked[score_name] = values.to_numpy()[order]
+    return ranked
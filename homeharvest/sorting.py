@@ -3,9 +3,13 @@ Advanced sorting utilities for property data.
 
 Provides multi-field sorting, calculated field sorting, and custom sort functions.
 """
+import numpy as np
 import pandas as pd
 from typing import List, Union, Callable, Optional
 
+from .change_tracker import ChangeTracker
+from .scoring import Score, compute_score
+
 
 # Available sort fields and their descriptions
 SORTABLE_FIELDS = {
@@ -107,18 +111,19 @@ CALCULATED_FIELDS = {
 }
 
 
-def add_calculated_sort_fields(df: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
+def add_calculated_sort_fields(df: pd.DataFrame, fields: List[str], inplace: bool = False) -> pd.DataFrame:
     """
     Add calculated fields to DataFrame for sorting.
 
     Args:
         df: DataFrame to add fields to
         fields: List of field names that might be calculated
+        inplace: Add the fields to df itself instead of a copy
 
     Returns:
         DataFrame with calculated fields added
     """
-    df_copy = df.copy()
+    df_copy = df if inplace else df.copy()
 
     for field in fields:
         if field in CALCULATED_FIELDS and field not in df_copy.columns:
@@ -127,23 +132,37 @@ def add_calculated_sort_fields(df: pd.DataFrame, fields: List[str]) -> pd.DataFr
     return df_copy
 
 
+def _sort_key(df: pd.DataFrame, field: str) -> Optional[pd.Series]:
+    """A sort column of df, calculating it if needed (without adding it to df)."""
+    if field in df.columns:
+        return df[field]
+    if field in CALCULATED_FIELDS:
+        return pd.Series(CALCULATED_FIELDS[field](df), index=df.index)
+    return None
+
+
 def sort_properties(
     df: pd.DataFrame,
     sort_by: Union[str, List[str]],
     sort_direction: Union[str, List[str]] = "desc",
-    na_position: str = "last"
+    na_position: str = "last",
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Sort properties by one or more fields with advanced options.
 
+    Only the sort columns are sorted; the rows of df are then taken once in
+    that order, without copying the frame to add calculated columns.
+
     Args:
         df: DataFrame to sort
         sort_by: Field name or list of field names to sort by
         sort_direction: "asc" or "desc", or list matching sort_by length
         na_position: Where to place NaN values ("first" or "last")
+        inplace: Reorder df itself (and reset its index) instead of returning a new frame
 
     Returns:
-        Sorted DataFrame
+        Sorted DataFrame (df itself when inplace)
     """
     if df.empty:
         return df
@@ -158,36 +177,59 @@ def sort_properties(
     if len(sort_by) != len(sort_direction):
         raise ValueError("sort_by and sort_direction must have same length")
 
-    # Add calculated fields if needed
-    df_with_calc = add_calculated_sort_fields(df, sort_by)
-
     # Convert directions to boolean (True = ascending)
     ascending = [d.lower() == "asc" for d in sort_direction]
 
-    # Filter to only sort by fields that exist
-    valid_fields = []
+    # Only sort by fields that exist or can be calculated
+    keys = {}
     valid_ascending = []
     for field, asc in zip(sort_by, ascending):
-        if field in df_with_calc.columns:
-            valid_fields.append(field)
+        key = _sort_key(df, field)
+        if key is not None and field not in keys:
+            keys[field] = key
             valid_ascending.append(asc)
 
-    if not valid_fields:
+    if not keys:
+        return df
+
+    if inplace:
+        # Reorder df itself: the calculated keys are added as temporary columns
+        calculated = [field for field in keys if field not in df.columns]
+        for field in calculated:
+            df[field] = keys[field]
+        df.sort_values(by=list(keys), ascending=valid_ascending, na_position=na_position,
+                       inplace=True, ignore_index=True)
+        df.drop(columns=calculated, inplace=True)
         return df
 
-    # Perform sort
-    sorted_df = df_with_calc.sort_values(
-        by=valid_fields,
+    # Sort the key columns only, then take the rows once
+    order = pd.DataFrame({field: key.reset_index(drop=True) for field, key in keys.items()}).sort_values(
+        by=list(keys),
         ascending=valid_ascending,
         na_position=na_position
-    )
+    ).index.to_numpy()
+
+    return df.take(order).reset_index(drop=True)
 
-    # Remove calculated fields that weren't in original
-    for field in CALCULATED_FIELDS.keys():
-        if field in sorted_df.columns and field not in df.columns:
-            sorted_df = sorted_df.drop(columns=[field])
 
-    return sorted_df.reset_index(drop=True)
+def _top_k_positions(values: pd.Series, limit: int, ascending: bool) -> np.ndarray:
+    """
+    Positions of the first limit rows if values were sorted (missing values last).
+
+    Numeric and datetime columns use a partial selection (nsmallest/nlargest);
+    other columns fall back to sorting the single column.
+    """
+    values = values.reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+        present = values.dropna()
+        selected = present.nsmallest(limit) if ascending else present.nlargest(limit)
+        positions = selected.index.to_numpy()
+        if len(positions) < limit:
+            missing = values.index[values.isna()].to_numpy()[:limit - len(positions)]
+            positions = np.concatenate([positions, missing])
+        return positions
+
+    return values.sort_values(ascending=ascending, na_position="last").index.to_numpy()[:limit]
 
 
 def get_best_deals(
@@ -209,24 +251,19 @@ def get_best_deals(
     if df.empty:
         return df
 
-    # Add calculated field if needed
-    df_with_calc = add_calculated_sort_fields(df, [criteria])
+    key = _sort_key(df, criteria)
+    if key is None:
+        raise KeyError(criteria)
 
-    # Sort based on criteria (lower is better for most)
-    if criteria in ["price_discount"]:
-        # For discount, most negative is best (furthest below estimate)
-        sorted_df = df_with_calc.sort_values(by=criteria, ascending=True)
-    else:
-        # For price per sqft, lower is better
-        sorted_df = df_with_calc.sort_values(by=criteria, ascending=True)
-
-    result = sorted_df.head(limit)
+    # Lower is better for every criteria: for discount, most negative is best
+    # (furthest below estimate); for price per sqft, lower is better
+    return df.take(_top_k_positions(key, limit, ascending=True)).reset_index(drop=True)
 
-    # Remove calculated field if it wasn't in original
-    if criteria in CALCULATED_FIELDS and criteria not in df.columns:
-        result = result.drop(columns=[criteria])
 
-    return result.reset_index(drop=True)
+def _latest(df: pd.DataFrame, field: str, limit: int) -> pd.DataFrame:
+    if df.empty or field not in df.columns:
+        return sort_properties(df, field, "desc").head(limit)
+    return df.take(_top_k_positions(df[field], limit, ascending=False)).reset_index(drop=True)
 
 
 def get_newest_listings(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
@@ -240,7 +277,7 @@ def get_newest_listings(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
     Returns:
         DataFrame with newest listings
     """
-    return sort_properties(df, "list_date", "desc").head(limit)
+    return _latest(df, "list_date", limit)
 
 
 def get_recently_updated(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
@@ -254,111 +291,187 @@ def get_recently_updated(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
     Returns:
         DataFrame with recently updated properties
     """
-    return sort_properties(df, "last_update_date", "desc").head(limit)
+    return _latest(df, "last_update_date", limit)
 
 
-def get_price_drops(df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
+def get_price_drops(df: pd.DataFrame, limit: int = 10, days: Optional[int] = None,
+                    tracker: Optional[ChangeTracker] = None) -> pd.DataFrame:
     """
-    Get properties with recent price changes (if available).
+    Get properties with recent price reductions.
+
+    Reductions are read from the tracker's change log when given, otherwise
+    from the property_history column of df. Without either, falls back to the
+    most recently updated properties.
 
     Args:
         df: DataFrame with property data
         limit: Number of results to return
+        days: Only reductions in the last days (all when None)
+        tracker: ChangeTracker fed with earlier snapshots
 
     Returns:
-        DataFrame with properties that may have price drops
+        DataFrame with the properties of df, latest price drop first
     """
-    # Sort by last_update_date to find recently changed properties
-    return get_recently_updated(df, limit)
+    if df.empty or "property_id" not in df.columns:
+        return get_recently_updated(df, limit)
+    if tracker is None:
+        if "property_history" not in df.columns:
+            return get_recently_updated(df, limit)
+        tracker = ChangeTracker().update(df)
+
+    dropped = tracker.price_drops(days=days)["property_id"].drop_duplicates()
+    ids = df["property_id"].astype(str)
+    first_positions = pd.Series(np.arange(len(df)), index=ids)[~ids.duplicated().to_numpy()]
+    positions = first_positions.reindex(dropped).dropna().astype(np.int64).to_numpy()[:limit]
+    return df.take(positions).reset_index(drop=True)
 
 
 def create_custom_score(
     df: pd.DataFrame,
-    score_function: Callable[[pd.Series], float],
-    score_name: str = "custom_score"
+    score_function: Union[Callable[[pd.Series], float], Score],
+    score_name: str = "custom_score",
+    inplace: bool = False,
+    vectorized: bool = False
 ) -> pd.DataFrame:
     """
     Create a custom scoring function for properties.
 
+    Row-wise functions build a Series per row; prefer a vectorized score
+    (see scoring.compute_score) for large frames.
+
     Args:
         df: DataFrame with property data
-        score_function: Function that takes a row and returns a score
+        score_function: Function that takes a row and returns a score, or a
+            vectorized score: a DataFrame.eval expression, a component spec, or
+            (with vectorized=True) a function that takes the DataFrame
         score_name: Name for the score column
+        inplace: Add the score column to df itself instead of a copy
+        vectorized: Call a function score_function once with the whole DataFrame
 
     Returns:
         DataFrame with custom score added
+
+    Example:
+        >>> create_custom_score(df, "estimated_value - list_price", "equity")
+        >>> create_custom_score(df, lambda d: d["beds"] * 10 - d["hoa_fee"].fillna(0), vectorized=True)
     """
-    df_copy = df.copy()
-    df_copy[score_name] = df_copy.apply(score_function, axis=1)
+    df_copy = df if inplace else df.copy()
+    if vectorized or not callable(score_function):
+        df_copy[score_name] = compute_score(df_copy, score_function)
+    else:
+        df_copy[score_name] = df_copy.apply(score_function, axis=1)
     return df_copy
 
 
-def rank_by_investment_potential(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Rank properties by investment potential using multiple factors.
+#: weights of the investment score components
+INVESTMENT_WEIGHTS = {
+    'ppsf_score': 0.3,
+    'discount_score': 0.4,
+    'dom_score': 0.2,
+    'lot_score': 0.1
+}
 
-    Considers:
-    - Price per sqft (lower is better)
-    - Price vs estimated value (discount is better)
-    - Days on market (longer may indicate motivated seller)
-    - Lot size (bigger is better for investment)
+
+def investment_score_params(df: pd.DataFrame) -> dict:
+    """
+    Collect the global statistics the investment score normalizes by.
 
     Args:
         df: DataFrame with property data
 
     Returns:
-        DataFrame with investment_score column added
+        Dictionary with ppsf_median/min/max, dom_max and lot_median/min/max
+        (None for missing columns)
     """
-    if df.empty:
-        return df
+    params = dict.fromkeys(['ppsf_median', 'ppsf_min', 'ppsf_max', 'dom_max', 'lot_median', 'lot_min', 'lot_max'])
+
+    for column, prefix in (('price_per_sqft', 'ppsf'), ('lot_sqft', 'lot')):
+        if column in df.columns:
+            median = df[column].median()
+            filled = df[column].fillna(median)
+            params[f'{prefix}_median'] = median
+            params[f'{prefix}_min'] = filled.min()
+            params[f'{prefix}_max'] = filled.max()
+
+    if 'days_on_mls' in df.columns:
+        params['dom_max'] = df['days_on_mls'].fillna(0).max()
+
+    return params
 
-    df_copy = df.copy()
 
+def compute_investment_score(df: pd.DataFrame, params: dict) -> pd.Series:
+    """
+    Investment score of each property, normalized with precomputed statistics.
+
+    Args:
+        df: DataFrame with property data (a full frame or one chunk of it)
+        params: Statistics from investment_score_params over the full data
+
+    Returns:
+        Series of scores aligned with df
+    """
     # Calculate individual scores (0-100 scale)
-    scores = pd.DataFrame(index=df_copy.index)
+    scores = pd.DataFrame(index=df.index)
 
     # Price per sqft score (lower is better, so invert)
-    if 'price_per_sqft' in df_copy.columns:
-        ppsf = df_copy['price_per_sqft'].fillna(df_copy['price_per_sqft'].median())
-        scores['ppsf_score'] = 100 - ((ppsf - ppsf.min()) / (ppsf.max() - ppsf.min()) * 100)
+    if 'price_per_sqft' in df.columns:
+        ppsf = df['price_per_sqft'].fillna(params['ppsf_median'])
+        scores['ppsf_score'] = 100 - ((ppsf - params['ppsf_min']) / (params['ppsf_max'] - params['ppsf_min']) * 100)
     else:
         scores['ppsf_score'] = 50
 
     # Price discount score
-    if 'list_price' in df_copy.columns and 'estimated_value' in df_copy.columns:
-        discount = calculate_price_discount(df_copy).fillna(0)
+    if 'list_price' in df.columns and 'estimated_value' in df.columns:
+        discount = calculate_price_discount(df).fillna(0)
         # Negative discount (below estimate) is good
-        scores['discount_score'] = discount.apply(lambda x: min(100, max(0, -x)))
+        scores['discount_score'] = (-discount).clip(lower=0, upper=100)
     else:
         scores['discount_score'] = 50
 
     # Days on market score (longer is better for negotiation)
-    if 'days_on_mls' in df_copy.columns:
-        dom = df_copy['days_on_mls'].fillna(0)
-        scores['dom_score'] = (dom / dom.max() * 100) if dom.max() > 0 else 50
+    if 'days_on_mls' in df.columns:
+        dom = df['days_on_mls'].fillna(0)
+        scores['dom_score'] = (dom / params['dom_max'] * 100) if params['dom_max'] > 0 else 50
     else:
         scores['dom_score'] = 50
 
     # Lot size score (bigger is better)
-    if 'lot_sqft' in df_copy.columns:
-        lot = df_copy['lot_sqft'].fillna(df_copy['lot_sqft'].median())
-        scores['lot_score'] = ((lot - lot.min()) / (lot.max() - lot.min()) * 100)
+    if 'lot_sqft' in df.columns:
+        lot = df['lot_sqft'].fillna(params['lot_median'])
+        scores['lot_score'] = ((lot - params['lot_min']) / (params['lot_max'] - params['lot_min']) * 100)
     else:
         scores['lot_score'] = 50
 
-    # Calculate weighted average (you can adjust weights)
-    weights = {
-        'ppsf_score': 0.3,
-        'discount_score': 0.4,
-        'dom_score': 0.2,
-        'lot_score': 0.1
-    }
+    # Calculate weighted average
+    return sum(scores[col] * weight for col, weight in INVESTMENT_WEIGHTS.items())
+
+
+def rank_by_investment_potential(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rank properties by investment potential using multiple factors.
+
+    Considers:
+    - Price per sqft (lower is better)
+    - Price vs estimated value (discount is better)
+    - Days on market (longer may indicate motivated seller)
+    - Lot size (bigger is better for investment)
+
+    Args:
+        df: DataFrame with property data
+
+    Returns:
+        DataFrame with investment_score column added
+    """
+    if df.empty:
+        return df
 
-    df_copy['investment_score'] = sum(
-        scores[col] * weight for col, weight in weights.items()
-    )
+    score = compute_investment_score(df, investment_score_params(df)).reset_index(drop=True)
+    order = score.sort_values(ascending=False).index.to_numpy()
 
-    return df_copy.sort_values('investment_score', ascending=False).reset_index(drop=True)
+    # Take the rows once in score order instead of copying and then sorting the frame
+    ranked = df.take(order).reset_index(drop=True)
+    ranked['investment_score'] = score.to_numpy()[order]
+    return ranked
 
 
 def get_available_sort_fields() -> dict:
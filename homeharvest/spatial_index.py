@@ -0,0 +1,408 @@
+"""
+Geospatial index over stored listings.
+
+Provides radius, k-nearest and bounding-box queries with haversine distances
+over a uniform latitude/longitude grid, filtering by status and date, and
+local answers to comps searches for areas a previous scrape already covered.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .core.scrapers.models import ListingType
+from .core.scrapers.realtor.filters import compile_params_filters
+from .dates import parse_datetime_series
+from .sorting import sort_properties
+
+EARTH_RADIUS_MILES = 3958.8
+
+#: miles per degree of latitude
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * np.pi / 180
+
+#: grid cell size in degrees (about 0.7 miles of latitude)
+DEFAULT_CELL_DEGREES = 0.01
+
+#: statuses of the listings each listing type returns
+LISTING_STATUSES = {
+    ListingType.FOR_SALE: ("FOR_SALE", "PENDING", "CONTINGENT"),
+    ListingType.FOR_RENT: ("FOR_RENT",),
+    ListingType.PENDING: ("PENDING", "CONTINGENT"),
+    ListingType.SOLD: ("SOLD",),
+    ListingType.OFF_MARKET: ("OFF_MARKET",),
+}
+
+#: date column the past_days window applies to, per listing type
+LISTING_DATE_FIELDS = {
+    ListingType.SOLD: "last_sold_date",
+    ListingType.PENDING: "pending_date",
+}
+
+ListingTypes = Union[ListingType, List[ListingType], None]
+
+
+def haversine_miles(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in miles (vectorized, broadcasting)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _normalize_address(address: str) -> str:
+    return " ".join(re.sub(r"[,.#]", " ", address.lower()).split())
+
+
+def _listing_types(listing_type: ListingTypes) -> Optional[frozenset]:
+    if listing_type is None:
+        return None
+    return frozenset(listing_type if isinstance(listing_type, list) else [listing_type])
+
+
+@dataclass(frozen=True)
+class Coverage:
+    """Circle a scrape returned every listing of (for the given listing types and window)."""
+
+    latitude: float
+    longitude: float
+    radius: float
+    listing_types: Optional[frozenset]
+    since: Optional[datetime]
+    scraped_at: datetime
+
+    def covers(self, latitude: float, longitude: float, radius: float, listing_types: Optional[frozenset],
+               since: Optional[datetime]) -> bool:
+        if self.listing_types is not None and (listing_types is None or not listing_types <= self.listing_types):
+            return False
+        if self.since is not None and (since is None or since < self.since):
+            return False
+        distance = float(haversine_miles(self.latitude, self.longitude, latitude, longitude))
+        return distance + radius <= self.radius + 1e-9
+
+
+class SpatialIndex:
+    """
+    Grid index of listings by latitude/longitude.
+
+    Listings are bucketed into cells of cell_degrees; a query selects the
+    occupied cells overlapping its bounding box, then computes exact haversine
+    distances for the listings in them only.
+
+    Example:
+        index = SpatialIndex(snapshot_df)
+        index.radius(33.45, -112.07, miles=1.5, status="SOLD", since="2025-01-01")
+        index.nearest(33.45, -112.07, k=10)
+
+        # Comps answered locally once an area has been scraped
+        df = scrape_property("2530 Al Lipscomb Way", radius=1, listing_type="sold", spatial_index=index)
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, cell_degrees: float = DEFAULT_CELL_DEGREES,
+                 max_age: Optional[timedelta] = None):
+        """
+        Args:
+            df: Listings with latitude and longitude columns
+            cell_degrees: Grid cell size in degrees
+            max_age: Coverage older than this is not used for local comps (never expires when None)
+        """
+        self.cell_degrees = cell_degrees
+        self.max_age = max_age
+        self._frames: List[pd.DataFrame] = []
+        self._df: Optional[pd.DataFrame] = None
+        self._coverage: List[Coverage] = []
+        self._geocodes: Dict[str, Tuple[float, float]] = {}
+        self._address_index: Optional[Dict[str, int]] = None
+        if df is not None:
+            self.add(df)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def add(self, df: pd.DataFrame, center: Optional[Tuple[float, float]] = None, radius: Optional[float] = None,
+            location: Optional[str] = None, listing_type: ListingTypes = None,
+            past_days: Optional[int] = None) -> "SpatialIndex":
+        """
+        Add listings, optionally recording the comps search that returned them.
+
+        Args:
+            df: Listings (a later listing with the same property_id replaces an earlier one)
+            center: (latitude, longitude) the search was centered on
+            radius: Search radius in miles; with center, marks the circle as covered
+            location: Location string of the search, remembered as a geocode of center
+            listing_type: Listing type(s) searched (None for an unrestricted search)
+            past_days: Date window of the search
+        """
+        if df is not None and not df.empty and {"latitude", "longitude"} <= set(df.columns):
+            self._frames.append(df)
+            self._df = None
+            self._address_index = None
+
+        if center is not None:
+            if location:
+                self._geocodes[_normalize_address(location)] = center
+            if radius:
+                now = datetime.now()
+                since = now - timedelta(days=past_days) if past_days else None
+                self._coverage.append(
+                    Coverage(center[0], center[1], radius, _listing_types(listing_type), since, now)
+                )
+        return self
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """All indexed listings with coordinates."""
+        if self._df is None:
+            self._build()
+        return self._df
+
+    def _build(self) -> None:
+        if not self._frames:
+            self._df = pd.DataFrame(columns=["latitude", "longitude"])
+        else:
+            df = pd.concat(self._frames, ignore_index=True) if len(self._frames) > 1 else self._frames[0]
+            if "property_id" in df.columns:
+                df = df.drop_duplicates("property_id", keep="last")
+            latitude = pd.to_numeric(df["latitude"], errors="coerce")
+            longitude = pd.to_numeric(df["longitude"], errors="coerce")
+            df = df[latitude.notna() & longitude.notna()].reset_index(drop=True)
+            self._frames = [df]
+            self._df = df
+
+        self._lat = pd.to_numeric(self._df["latitude"], errors="coerce").to_numpy(dtype=float)
+        self._lon = pd.to_numeric(self._df["longitude"], errors="coerce").to_numpy(dtype=float)
+
+        # Rows sorted by cell; each occupied cell is a slice of _order
+        lat_cells = np.floor(self._lat / self.cell_degrees).astype(np.int64)
+        lon_cells = np.floor(self._lon / self.cell_degrees).astype(np.int64)
+        keys = lat_cells * (1 << 32) + lon_cells
+        self._order = np.argsort(keys, kind="stable")
+        _, self._starts, counts = np.unique(keys[self._order], return_index=True, return_counts=True)
+        self._ends = self._starts + counts
+        first = self._order[self._starts]
+        self._cell_lat = lat_cells[first]
+        self._cell_lon = lon_cells[first]
+
+    def _candidates(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Positions of the listings in the cells overlapping a bounding box."""
+        df = self.df
+        if df.empty:
+            return np.array([], dtype=np.intp)
+        cell = self.cell_degrees
+        selected = np.flatnonzero(
+            (self._cell_lat >= np.floor(south / cell)) & (self._cell_lat <= np.floor(north / cell))
+            & (self._cell_lon >= np.floor(west / cell)) & (self._cell_lon <= np.floor(east / cell))
+        )
+        if not len(selected):
+            return np.array([], dtype=np.intp)
+        return np.concatenate([self._order[self._starts[i]:self._ends[i]] for i in selected])
+
+    def _filter(self, positions: np.ndarray, status: Union[str, Iterable[str], None],
+                date_field: Optional[str], since, until) -> np.ndarray:
+        df = self.df
+        if status is not None and len(positions):
+            statuses = {status.upper()} if isinstance(status, str) else {value.upper() for value in status}
+            values = df["status"].to_numpy(dtype=object)[positions] if "status" in df.columns else np.full(len(positions), None)
+            positions = positions[[isinstance(value, str) and value.upper() in statuses for value in values]]
+
+        if (since is not None or until is not None) and len(positions):
+            if date_field not in df.columns:
+                return positions[:0]
+            dates = parse_datetime_series(df[date_field].iloc[positions]).to_numpy()
+            keep = ~pd.isna(dates)
+            if since is not None:
+                keep &= dates >= np.datetime64(pd.Timestamp(since).tz_localize(None))
+            if until is not None:
+                keep &= dates <= np.datetime64(pd.Timestamp(until).tz_localize(None))
+            positions = positions[keep]
+        return positions
+
+    def radius(self, latitude: float, longitude: float, miles: float, status: Union[str, Iterable[str], None] = None,
+               date_field: str = "list_date", since=None, until=None) -> pd.DataFrame:
+        """
+        Listings within a distance of a point, nearest first.
+
+        Args:
+            latitude, longitude: Center
+            miles: Radius in miles
+            status: Status or statuses to keep (e.g. "SOLD")
+            date_field: Date column since/until apply to
+            since, until: Date bounds (datetime or ISO string)
+
+        Returns:
+            DataFrame of the listings with a distance_miles column
+        """
+        lat_span = miles / MILES_PER_DEGREE
+        lon_span = lat_span / max(np.cos(np.radians(min(abs(latitude) + lat_span, 89.9))), 1e-6)
+        positions = self._candidates(latitude - lat_span, longitude - lon_span, latitude + lat_span, longitude + lon_span)
+        positions = self._filter(positions, status, date_field, since, until)
+
+        distances = haversine_miles(latitude, longitude, self._lat[positions], self._lon[positions])
+        within = distances <= miles
+        positions, distances = positions[within], distances[within]
+        order = np.lexsort((positions, distances))
+        return self._rows(positions[order], distances[order])
+
+    def nearest(self, latitude: float, longitude: float, k: int = 10, status: Union[str, Iterable[str], None] = None,
+                date_field: str = "list_date", since=None, until=None, start_miles: float = 0.5) -> pd.DataFrame:
+        """
+        The k listings nearest a point (after filtering), nearest first.
+
+        The search radius doubles from start_miles until k listings are found, so
+        only the cells around the point are scanned.
+
+        Returns:
+            DataFrame of at most k listings with a distance_miles column
+        """
+        miles = start_miles
+        while True:
+            found = self.radius(latitude, longitude, miles, status, date_field, since, until)
+            if len(found) >= k or miles >= np.pi * EARTH_RADIUS_MILES:
+                return found.head(k)
+            miles *= 2
+
+    def bbox(self, south: float, west: float, north: float, east: float,
+             status: Union[str, Iterable[str], None] = None, date_field: str = "list_date",
+             since=None, until=None) -> pd.DataFrame:
+        """Listings inside a latitude/longitude bounding box, in index order."""
+        positions = np.sort(self._candidates(south, west, north, east))
+        lat, lon = self._lat[positions], self._lon[positions]
+        positions = positions[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+        positions = self._filter(positions, status, date_field, since, until)
+        return self.df.iloc[positions].reset_index(drop=True)
+
+    def _rows(self, positions: np.ndarray, distances: np.ndarray) -> pd.DataFrame:
+        rows = self.df.iloc[positions].reset_index(drop=True)
+        rows["distance_miles"] = distances
+        return rows
+
+    def geocode(self, location: str) -> Optional[Tuple[float, float]]:
+        """
+        Coordinates of a location from previous searches or an indexed listing's address.
+
+        Returns:
+            (latitude, longitude), or None if the location is unknown
+        """
+        key = _normalize_address(location)
+        if key in self._geocodes:
+            return self._geocodes[key]
+
+        if self._address_index is None:
+            self._address_index = {}
+            df = self.df
+            for column in ("formatted_address", "full_street_line"):
+                if column in df.columns:
+                    for position, address in enumerate(df[column]):
+                        if isinstance(address, str):
+                            self._address_index.setdefault(_normalize_address(address), position)
+        position = self._address_index.get(key)
+        if position is None:
+            return None
+        return float(self._lat[position]), float(self._lon[position])
+
+    def covers(self, latitude: float, longitude: float, radius: float, listing_type: ListingTypes = None,
+               past_days: Optional[int] = None) -> bool:
+        """Check if a previous search returned every listing a comps search would."""
+        now = datetime.now()
+        listing_types = _listing_types(listing_type)
+        since = now - timedelta(days=past_days) if past_days else None
+        return any(
+            coverage.covers(latitude, longitude, radius, listing_types, since)
+            for coverage in self._coverage
+            if self.max_age is None or now - coverage.scraped_at <= self.max_age
+        )
+
+    def comps(self, location: str, radius: float, listing_type: ListingTypes = None,
+              past_days: Optional[int] = None, exclude_pending: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Answer a comps search locally when its area is covered.
+
+        Args:
+            location: Address searched
+            radius: Radius in miles
+            listing_type: Listing type(s), as for scrape_property
+            past_days: Date window (on the listing type's date field)
+            exclude_pending: Drop pending/contingent listings unless listing_type is PENDING
+
+        Returns:
+            DataFrame of the comps, nearest first, or None when the location is not
+            geocoded or the area is not covered (the search must go to the network)
+        """
+        center = self.geocode(location)
+        if center is None or not self.covers(center[0], center[1], radius, listing_type, past_days):
+            return None
+
+        listing_types = _listing_types(listing_type)
+        statuses = None
+        date_field = "list_date"
+        if listing_types is not None:
+            statuses = {status for lt in listing_types for status in LISTING_STATUSES.get(lt, (lt.value,))}
+            if exclude_pending and ListingType.PENDING not in listing_types:
+                statuses -= {"PENDING", "CONTINGENT"}
+            date_fields = {LISTING_DATE_FIELDS.get(lt, "list_date") for lt in listing_types}
+            date_field = date_fields.pop() if len(date_fields) == 1 else "list_date"
+
+        since = datetime.now() - timedelta(days=past_days) if past_days else None
+        return self.radius(center[0], center[1], radius, statuses, date_field, since)
+
+
+def _has_unindexed_filters(scraper_input) -> bool:
+    """Check if a search uses filters the index cannot apply (MLS, foreclosure and date/update windows)."""
+    return bool(
+        scraper_input.mls_only or scraper_input.foreclosure
+        or scraper_input.past_hours or scraper_input.date_from or scraper_input.date_to
+        or scraper_input.updated_since or scraper_input.updated_in_past_hours
+    )
+
+
+def _is_complete(scraper_input) -> bool:
+    """Check if a search returns every listing of its area (nothing filtered or truncated)."""
+    return not (
+        compile_params_filters(scraper_input.model_dump()).active
+        or _has_unindexed_filters(scraper_input) or scraper_input.exclude_pending or scraper_input.offset
+    )
+
+
+def local_comps(index: SpatialIndex, scraper_input) -> Optional[pd.DataFrame]:
+    """
+    Answer a scrape_property comps search from the index.
+
+    Applies the search's filters and sort and its offset/limit to the covered listings.
+    Searches with MLS, foreclosure or date/update-window filters always go to the network.
+
+    Returns:
+        DataFrame shaped like scrape_property results, or None when the search must go to the network
+    """
+    if _has_unindexed_filters(scraper_input):
+        return None
+    df = index.comps(scraper_input.location, scraper_input.radius, scraper_input.listing_type,
+                     scraper_input.last_x_days, scraper_input.exclude_pending)
+    if df is None:
+        return None
+    df = df.drop(columns="distance_miles")
+
+    home_filter = compile_params_filters(scraper_input.model_dump())
+    if home_filter.active and not df.empty:
+        df = df[home_filter.mask(df)]
+    if scraper_input.sort_by:
+        df = sort_properties(df, scraper_input.sort_by, scraper_input.sort_direction)
+    return df.iloc[scraper_input.offset:scraper_input.offset + scraper_input.limit].reset_index(drop=True)
+
+
+def record_comps(index: SpatialIndex, location_info: Optional[dict], scraper_input, df: pd.DataFrame,
+                 result_count: int) -> None:
+    """
+    Add the results of a network comps search to the index.
+
+    The searched circle is marked as covered only when the search was unfiltered
+    and not truncated by its limit.
+    """
+    centroid = (location_info or {}).get("centroid") or {}
+    center = (centroid["lat"], centroid["lon"]) if "lat" in centroid and "lon" in centroid else None
+    covered = center is not None and result_count < scraper_input.limit and _is_complete(scraper_input)
+
+    index.add(
+        df, center=center, radius=scraper_input.radius if covered else None, location=scraper_input.location,
+        listing_type=scraper_input.listing_type, past_days=scraper_input.last_x_days,
+    )
@@ -0,0 +1,201 @@
+"""
+Bitmap index for tag filtering.
+
+Provides tag interning over the TAG_CATEGORIES/TAG_ALIASES vocabulary, per-property
+tag bitmasks, and "any"/"all"/"exact"/exclude matching as bitwise operations on
+single properties or on a DataFrame tags column.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .tag_utils import TAG_CATEGORIES, TAG_ALIASES
+
+WORD_BITS = 64
+
+
+class TagIndex:
+    """
+    Interns lower-cased tags to integer ids.
+
+    The vocabulary is seeded from TAG_CATEGORIES and TAG_ALIASES; tags seen in live
+    data are added on first use. A property's tags are stored as a Python int
+    bitmask (bit i set when it has tag id i), or as a row of uint64 words for
+    DataFrame columns.
+    """
+
+    def __init__(self, vocabulary: Optional[Iterable[str]] = None):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._tags: List[str] = []
+        self._substring_masks: Dict[Tuple[str, ...], Tuple[int, int]] = {}
+
+        if vocabulary is None:
+            vocabulary = set(TAG_ALIASES) | set(TAG_ALIASES.values())
+            for category_tags in TAG_CATEGORIES.values():
+                vocabulary.update(category_tags)
+            vocabulary = sorted(vocabulary)
+
+        for tag in vocabulary:
+            self.intern(tag)
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    @property
+    def tags(self) -> List[str]:
+        """Interned tags, indexed by id."""
+        return list(self._tags)
+
+    def intern(self, tag: str) -> int:
+        """Get the id of a tag, adding it to the vocabulary if needed."""
+        tag = tag.lower()
+        tag_id = self._ids.get(tag)
+        if tag_id is None:
+            with self._lock:
+                tag_id = self._ids.get(tag)
+                if tag_id is None:
+                    tag_id = self._ids[tag] = len(self._tags)
+                    self._tags.append(tag)
+        return tag_id
+
+    def encode(self, tags: Optional[Iterable[str]]) -> int:
+        """
+        Encode a property's tags as a bitmask.
+
+        Args:
+            tags: Tag names (any case), or None
+
+        Returns:
+            Integer bitmask
+        """
+        bits = 0
+        if tags:
+            for tag in tags:
+                if isinstance(tag, str):
+                    bits |= 1 << self.intern(tag)
+        return bits
+
+    def decode(self, bits: int) -> List[str]:
+        """Get the tag names of a bitmask."""
+        return [tag for tag_id, tag in enumerate(self._tags) if bits >> tag_id & 1]
+
+    def substring_mask(self, substrings: Tuple[str, ...]) -> int:
+        """
+        Bitmask of every interned tag containing any of the substrings.
+
+        Recomputed only when the vocabulary has grown since the last call.
+        """
+        cached = self._substring_masks.get(substrings)
+        if cached and cached[0] == len(self._tags):
+            return cached[1]
+
+        size = len(self._tags)
+        bits = 0
+        for tag_id, tag in enumerate(self._tags[:size]):
+            if any(substring in tag for substring in substrings):
+                bits |= 1 << tag_id
+        self._substring_masks[substrings] = (size, bits)
+        return bits
+
+    def to_words(self, bits: int, num_words: int) -> np.ndarray:
+        """Split a bitmask into little-endian uint64 words."""
+        return np.array(
+            [(bits >> (WORD_BITS * word)) & 0xFFFFFFFFFFFFFFFF for word in range(num_words)],
+            dtype=np.uint64,
+        )
+
+    def encode_series(self, tags: pd.Series) -> np.ndarray:
+        """
+        Encode a DataFrame tags column (lists of tags) as a word matrix.
+
+        Args:
+            tags: Series of tag lists (None/NaN for no tags)
+
+        Returns:
+            uint64 array of shape (len(tags), words)
+        """
+        codes = [self.encode(value) if isinstance(value, (list, tuple, set)) else 0 for value in tags]
+        num_words = max(1, -(-len(self._tags) // WORD_BITS))
+        words = np.zeros((len(codes), num_words), dtype=np.uint64)
+        for word in range(num_words):
+            shift = WORD_BITS * word
+            words[:, word] = [(bits >> shift) & 0xFFFFFFFFFFFFFFFF for bits in codes]
+        return words
+
+    def query(self, tags: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+              match_type: str = "any") -> "TagQuery":
+        """
+        Compile a tag filter.
+
+        Args:
+            tags: Tags to match (any case)
+            exclude: Tags that reject a property
+            match_type: "any", "all" or "exact"
+
+        Returns:
+            TagQuery
+        """
+        return TagQuery(self, tags, exclude, match_type)
+
+
+class TagQuery:
+    """A compiled tag filter: include/exclude bitmasks plus a match type."""
+
+    def __init__(self, index: TagIndex, tags: Optional[Iterable[str]], exclude: Optional[Iterable[str]],
+                 match_type: str = "any"):
+        self.index = index
+        self.include = index.encode(tags)
+        self.exclude = index.encode(exclude)
+        self.match_type = match_type
+
+    def matches(self, bits: int) -> bool:
+        """Check one property's tag bitmask."""
+        if bits & self.exclude:
+            return False
+        if not self.include:
+            return True
+        if self.match_type == "any":
+            return bool(bits & self.include)
+        if self.match_type == "all":
+            return bits & self.include == self.include
+        if self.match_type == "exact":
+            return bits == self.include
+        return False
+
+    def matches_words(self, words: np.ndarray) -> np.ndarray:
+        """
+        Vectorized matches() over a word matrix from TagIndex.encode_series.
+
+        Returns:
+            Boolean array, one entry per row
+        """
+        num_words = words.shape[1]
+        if self.include >> (WORD_BITS * num_words) and self.match_type in ("all", "exact"):
+            return np.zeros(len(words), dtype=bool)  # a required tag was interned after encoding
+
+        include = self.index.to_words(self.include, num_words)
+        exclude = self.index.to_words(self.exclude, num_words)
+
+        keep = ~(words & exclude).any(axis=1)
+        if not self.include:
+            return keep
+        if self.match_type == "any":
+            return keep & (words & include).any(axis=1)
+        if self.match_type == "all":
+            return keep & ((words & include) == include).all(axis=1)
+        if self.match_type == "exact":
+            return keep & (words == include).all(axis=1)
+        return np.zeros(len(words), dtype=bool)
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Filter a DataFrame by its tags column."""
+        if "tags" not in df.columns:
+            return df
+        return df[self.matches_words(self.index.encode_series(df["tags"]))]
+
+
+#: shared module-level index
+TAG_INDEX = TagIndex()
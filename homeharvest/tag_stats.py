@@ -0,0 +1,290 @@
+"""
+Incremental tag statistics across scrapes.
+
+Provides a mergeable tag counter partitioned by location and time period,
+vectorized DataFrame updates, top-k queries and an optional count-min sketch
+for bounded-memory frequency estimates over very large corpora.
+"""
+import hashlib
+import heapq
+import json
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dates import parse_datetime_series
+
+#: partition key used when no location/period is given
+ALL = "*"
+
+PartitionKey = Tuple[Hashable, Hashable]
+
+
+class CountMinSketch:
+    """
+    Count-min sketch: fixed-size frequency estimates that never undercount.
+
+    With width w and depth d, an estimate exceeds the true count by at most
+    2N/w (N = total count) with probability 1 - (1/2)^d.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=8 * self.depth).digest()
+        return [int.from_bytes(digest[8 * row:8 * row + 8], "little") % self.width for row in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> None:
+        for row, column in enumerate(self._columns(item)):
+            self.table[row, column] += count
+        self.total += count
+
+    def estimate(self, item: str) -> int:
+        return int(min(self.table[row, column] for row, column in enumerate(self._columns(item))))
+
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        """Add many (item, count) pairs at once."""
+        if not counts:
+            return
+        columns = np.array([self._columns(item) for item in counts], dtype=np.int64)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[:, row], values)
+        self.total += int(values.sum())
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-min sketches must have the same width and depth to merge.")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def to_dict(self) -> Dict:
+        return {"width": self.width, "depth": self.depth, "total": self.total, "table": self.table.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CountMinSketch":
+        sketch = cls(data["width"], data["depth"])
+        sketch.table = np.array(data["table"], dtype=np.int64).reshape(sketch.depth, sketch.width)
+        sketch.total = data["total"]
+        return sketch
+
+
+class TagStats:
+    """
+    Tag counts maintained incrementally as properties stream in.
+
+    Counts are kept per (location, period) partition, so a query can cover one
+    market, one month or everything without recounting. Instances from different
+    workers combine with merge(); they pickle, and to_dict()/from_dict() (or
+    save()/load()) store them as JSON. When sketch_width is set, a count-min
+    sketch also tracks global frequencies in fixed memory.
+
+    Example:
+        stats = TagStats()
+        stats.update(df, location_column="zip_code", period_column="list_date", period_freq="M")
+        stats.top_k(10, location="85281")
+    """
+
+    def __init__(self, sketch_width: Optional[int] = None, sketch_depth: int = 4):
+        self._lock = threading.Lock()
+        self._counts: Dict[PartitionKey, Counter] = {}
+        self._properties: Counter = Counter()
+        self.sketch = CountMinSketch(sketch_width, sketch_depth) if sketch_width else None
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _add(self, partition: PartitionKey, tag_counts: Dict[str, int], properties: int,
+             sketch: bool = True) -> None:
+        with self._lock:
+            counts = self._counts.get(partition)
+            if counts is None:
+                counts = self._counts[partition] = Counter()
+            counts.update(tag_counts)
+            self._properties[partition] += properties
+            if sketch and self.sketch is not None:
+                self.sketch.add_counts(tag_counts)
+
+    def add_property(self, tags: Optional[Iterable[str]], location: Hashable = ALL, period: Hashable = ALL) -> None:
+        """
+        Count one property's tags.
+
+        Args:
+            tags: The property's tags (None for no tags)
+            location: Partition location (e.g. zip code or city)
+            period: Partition period (e.g. "2025-01")
+        """
+        tag_counts = Counter(tag for tag in tags or () if isinstance(tag, str))
+        self._add((location, period), tag_counts, 1)
+
+    def update(self, properties, location: Hashable = ALL, period: Hashable = ALL,
+               location_column: Optional[str] = None, period_column: Optional[str] = None,
+               period_freq: str = "M") -> "TagStats":
+        """
+        Count the tags of a batch of properties.
+
+        Args:
+            properties: DataFrame or list of property dicts with a tags column
+            location: Partition location for the whole batch (ignored with location_column)
+            period: Partition period for the whole batch (ignored with period_column)
+            location_column: Column holding each property's location (e.g. "zip_code")
+            period_column: Date column each property's period is derived from (e.g. "list_date")
+            period_freq: pandas period frequency for period_column ("M" monthly, "W" weekly, ...)
+
+        Returns:
+            self
+        """
+        df = pd.DataFrame(properties) if isinstance(properties, list) else properties
+        if df is None or len(df) == 0:
+            return self
+
+        keys = pd.DataFrame(index=df.index)
+        keys["location"] = df[location_column].fillna(ALL) if location_column else location
+        if period_column:
+            dates = parse_datetime_series(df[period_column])
+            keys["period"] = dates.dt.to_period(period_freq).astype(str).where(dates.notna(), ALL)
+        else:
+            keys["period"] = period
+
+        #: object dtype so .str works below even when every tag list is missing (float NaN column)
+        keys["tags"] = df["tags"].astype(object) if "tags" in df.columns else None
+
+        properties_per_partition = keys.groupby(["location", "period"]).size()
+        exploded = keys.explode("tags", ignore_index=True)
+        #: .str yields NaN for anything but strings (missing tags, empty lists, stray values)
+        exploded = exploded[exploded["tags"].str.len().notna()]
+        counts = exploded.groupby(["location", "period", "tags"]).size()
+
+        # counts is sorted by partition: slice each partition's tags out of flat arrays
+        locations, periods, tags = (counts.index.get_level_values(level) for level in range(3))
+        values = counts.to_numpy().tolist()
+        tags = tags.tolist()
+        partition_codes = counts.index.codes[0].astype(np.int64) * len(counts.index.levels[1]) + counts.index.codes[1]
+        starts = np.flatnonzero(np.diff(partition_codes, prepend=-1))
+        ends = np.append(starts[1:], len(counts))
+        tag_counts: Dict[PartitionKey, Dict[str, int]] = {
+            (locations[start], periods[start]): dict(zip(tags[start:end], values[start:end]))
+            for start, end in zip(starts.tolist(), ends.tolist())
+        }
+
+        for partition, properties_count in zip(properties_per_partition.index, properties_per_partition.tolist()):
+            self._add(partition, tag_counts.get(partition, {}), properties_count, sketch=False)
+        if self.sketch is not None:
+            with self._lock:
+                self.sketch.add_counts(exploded["tags"].value_counts(sort=False).to_dict())
+
+        return self
+
+    def merge(self, other: "TagStats") -> "TagStats":
+        """
+        Fold another accumulator (e.g. from another worker) into this one.
+
+        The other instance's exact counts also feed this instance's sketch.
+        """
+        for partition, counts in other._counts.items():
+            self._add(partition, counts, 0)
+        with self._lock:
+            self._properties.update(other._properties)
+        return self
+
+    def to_dict(self) -> Dict:
+        """
+        JSON-serializable form, e.g. to store next to location/period partitions.
+
+        Returns:
+            Dictionary with one entry per partition and the sketch (if any)
+        """
+        with self._lock:
+            return {
+                "partitions": [
+                    {"location": location, "period": period, "properties": self._properties[(location, period)],
+                     "counts": dict(counts)}
+                    for (location, period), counts in self._counts.items()
+                ],
+                "sketch": self.sketch.to_dict() if self.sketch is not None else None,
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TagStats":
+        """Rebuild an accumulator from to_dict() output."""
+        stats = cls()
+        for partition in data["partitions"]:
+            key = (partition["location"], partition["period"])
+            stats._counts[key] = Counter(partition["counts"])
+            stats._properties[key] = partition["properties"]
+        if data.get("sketch"):
+            stats.sketch = CountMinSketch.from_dict(data["sketch"])
+        return stats
+
+    def save(self, path) -> None:
+        """Write the accumulator to a JSON file."""
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle)
+
+    @classmethod
+    def load(cls, path) -> "TagStats":
+        """Read an accumulator written by save()."""
+        with open(path, encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+    def partitions(self) -> List[PartitionKey]:
+        """All (location, period) partitions seen so far."""
+        return list(self._counts)
+
+    def _matching(self, location: Optional[Hashable], period: Optional[Hashable]) -> List[PartitionKey]:
+        return [
+            partition for partition in self._counts
+            if (location is None or partition[0] == location) and (period is None or partition[1] == period)
+        ]
+
+    def counts(self, location: Optional[Hashable] = None, period: Optional[Hashable] = None) -> Counter:
+        """
+        Tag counts over the matching partitions.
+
+        Args:
+            location: Only this location (all when None)
+            period: Only this period (all when None)
+        """
+        with self._lock:
+            matching = self._matching(location, period)
+            if len(matching) == 1:
+                return Counter(self._counts[matching[0]])
+            total = Counter()
+            for partition in matching:
+                total.update(self._counts[partition])
+            return total
+
+    def total_properties(self, location: Optional[Hashable] = None, period: Optional[Hashable] = None) -> int:
+        """Number of properties counted in the matching partitions."""
+        with self._lock:
+            return sum(self._properties[partition] for partition in self._matching(location, period))
+
+    def top_k(self, k: int = 20, location: Optional[Hashable] = None,
+              period: Optional[Hashable] = None) -> List[Tuple[str, int]]:
+        """
+        Most common tags, via a bounded heap.
+
+        Returns:
+            List of (tag, count), highest count first (ties by tag name)
+        """
+        return heapq.nsmallest(k, self.counts(location, period).items(), key=lambda item: (-item[1], item[0]))
+
+    def estimate(self, tag: str) -> int:
+        """Global count of a tag from the count-min sketch (exact count when no sketch is kept)."""
+        if self.sketch is None:
+            return self.counts()[tag]
+        return self.sketch.estimate(tag)
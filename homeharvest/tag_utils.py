@@ -3,6 +3,9 @@ Tag utilities for enhanced tag filtering and discovery.
 
 Provides tag categorization, aliases, and discovery functions.
 """
+import threading
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Set, Optional
 from difflib import SequenceMatcher
 
@@ -180,32 +183,29 @@ def discover_tags(properties_data) -> Dict[str, any]:
     """
     Discover and analyze tags from property data.
 
+    Discovered tags are also added to the fuzzy matching universe (see add_known_tags).
+
     Args:
-        properties_data: DataFrame or list of properties with tags
+        properties_data: DataFrame or list of properties with tags, or a TagStats
+            accumulator (reads its counts without touching the properties again)
 
     Returns:
         Dictionary with tag statistics and information
     """
-    import pandas as pd
+    from .tag_stats import TagStats
 
-    # Convert to DataFrame if needed
-    if isinstance(properties_data, list):
-        df = pd.DataFrame(properties_data)
+    if isinstance(properties_data, TagStats):
+        stats = properties_data
     else:
-        df = properties_data
-
-    # Collect all tags
-    all_tags = []
-    tag_counts = {}
+        stats = TagStats().update(properties_data)
 
-    for tags in df.get('tags', []):
-        if isinstance(tags, list):
-            for tag in tags:
-                all_tags.append(tag)
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    tag_counts = dict(stats.counts())
 
     # Get unique tags
-    unique_tags = sorted(set(all_tags))
+    unique_tags = sorted(tag_counts)
+
+    # Make live tags available to fuzzy tag search
+    add_known_tags(unique_tags)
 
     # Categorize tags
     categorized = {}
@@ -221,7 +221,7 @@ def discover_tags(properties_data) -> Dict[str, any]:
             uncategorized.append(tag)
 
     # Get most common tags
-    most_common = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:20]
+    most_common = stats.top_k(20)
 
     return {
         "total_unique_tags": len(unique_tags),
@@ -230,10 +230,137 @@ def discover_tags(properties_data) -> Dict[str, any]:
         "most_common": most_common,
         "by_category": categorized,
         "uncategorized": uncategorized,
-        "total_properties": len(df),
+        "total_properties": stats.total_properties(),
     }
 
 
+class FuzzyTagIndex:
+    """
+    Prebuilt fuzzy matcher over the known tag universe.
+
+    Scores are SequenceMatcher(None, search, tag).ratio(), as before, but only for
+    candidate tags whose upper bound can reach the threshold. Candidates come from
+    unigram inverted lists: summing min(count in search, count in tag) over the
+    search's characters gives the multiset overlap m, and 2*m/(len(search)+len(tag))
+    bounds the ratio from above (difflib's quick_ratio).
+    """
+
+    def __init__(self, tags: Optional[Set[str]] = None):
+        self._tags: List[str] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[tuple]] = {}
+        self._known: Set[str] = set()
+        self._lock = threading.Lock()
+        self.add(tags or ())
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._known
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def add(self, tags) -> int:
+        """
+        Add tags to the universe.
+
+        Returns:
+            Number of tags that were new
+        """
+        added = 0
+        with self._lock:
+            for tag in sorted(set(tags) - self._known):
+                tag_id = len(self._tags)
+                self._tags.append(tag)
+                self._lengths.append(len(tag))
+                self._known.add(tag)
+                for char, count in Counter(tag).items():
+                    self._postings.setdefault(char, []).append((tag_id, count))
+                added += 1
+        return added
+
+    def search(self, search_lower: str, threshold: float) -> List[tuple]:
+        """
+        Find (tag, ratio) pairs with ratio >= threshold, best first.
+
+        Args:
+            search_lower: Normalized search term
+            threshold: Minimum similarity ratio (0.0 to 1.0)
+        """
+        search_length = len(search_lower)
+        overlap: Dict[int, int] = {}
+        for char, count in Counter(search_lower).items():
+            for tag_id, tag_count in self._postings.get(char, ()):
+                overlap[tag_id] = overlap.get(tag_id, 0) + min(count, tag_count)
+
+        if threshold <= 0:
+            #: every tag qualifies, including ones sharing no character
+            candidates = range(len(self._tags))
+        else:
+            candidates = overlap
+
+        matches = []
+        for tag_id in candidates:
+            total_length = search_length + self._lengths[tag_id]
+            if not total_length:
+                continue
+            if 2.0 * overlap.get(tag_id, 0) / total_length < threshold:
+                continue
+            tag = self._tags[tag_id]
+            ratio = SequenceMatcher(None, search_lower, tag).ratio()
+            if ratio >= threshold:
+                matches.append((tag, ratio))
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+
+def _build_fuzzy_index() -> FuzzyTagIndex:
+    all_tags = set()
+    for category_tags in TAG_CATEGORIES.values():
+        all_tags.update(category_tags)
+    all_tags.update(TAG_ALIASES.keys())
+    all_tags.update(TAG_ALIASES.values())
+    return FuzzyTagIndex(all_tags)
+
+
+FUZZY_TAG_INDEX = _build_fuzzy_index()
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_match_cached(search_lower: str, threshold: float) -> tuple:
+    # Calculate similarity scores
+    matches = FUZZY_TAG_INDEX.search(search_lower, threshold)
+
+    # If it's an alias, return the actual tag; remove duplicates (keep highest score)
+    seen = set()
+    unique_matches = []
+    for tag, score in matches:
+        actual_tag = TAG_ALIASES.get(tag, tag)
+        if actual_tag not in seen:
+            seen.add(actual_tag)
+            unique_matches.append((actual_tag, score))
+
+    return tuple(unique_matches)
+
+
+def add_known_tags(tags) -> int:
+    """
+    Add tags (e.g. discovered from live data) to the fuzzy matching universe.
+
+    Args:
+        tags: Iterable of tag names
+
+    Returns:
+        Number of tags that were new
+    """
+    added = FUZZY_TAG_INDEX.add(
+        tag.lower().strip().replace(" ", "_") for tag in tags if isinstance(tag, str) and tag.strip()
+    )
+    if added:
+        _fuzzy_match_cached.cache_clear()
+    return added
+
+
 def fuzzy_match_tag(search_term: str, threshold: float = 0.6) -> List[tuple]:
     """
     Find tags that fuzzy match a search term.
@@ -251,36 +378,7 @@ def fuzzy_match_tag(search_term: str, threshold: float = 0.6) -> List[tuple]:
     if search_lower in TAG_ALIASES:
         return [(TAG_ALIASES[search_lower], 1.0)]
 
-    # Collect all possible tags (from categories)
-    all_tags = set()
-    for category_tags in TAG_CATEGORIES.values():
-        all_tags.update(category_tags)
-
-    # Add all aliases
-    all_tags.update(TAG_ALIASES.keys())
-    all_tags.update(TAG_ALIASES.values())
-
-    # Calculate similarity scores
-    matches = []
-    for tag in all_tags:
-        ratio = SequenceMatcher(None, search_lower, tag).ratio()
-        if ratio >= threshold:
-            # If it's an alias, return the actual tag
-            actual_tag = TAG_ALIASES.get(tag, tag)
-            matches.append((actual_tag, ratio))
-
-    # Sort by similarity score (highest first)
-    matches.sort(key=lambda x: x[1], reverse=True)
-
-    # Remove duplicates (keep highest score)
-    seen = set()
-    unique_matches = []
-    for tag, score in matches:
-        if tag not in seen:
-            seen.add(tag)
-            unique_matches.append((tag, score))
-
-    return unique_matches
+    return list(_fuzzy_match_cached(search_lower, float(threshold)))
 
 
 def expand_tag_search(tags: List[str], use_aliases: bool = True, use_fuzzy: bool = False,
@@ -0,0 +1,169 @@
+import pandas as pd
+
+from homeharvest.agent_broker import (
+    analyze_agent_specialization, categorize_prices, count_price_cuts, extract_phone_numbers, extract_primary_phone,
+    extract_primary_phones, filter_by_agent_contact, find_most_active_agents, get_agent_activity,
+    get_broker_activity, get_contact_export, get_wholesale_friendly_agents, normalize_contacts, normalize_phones,
+    score_agent_frustration,
+)
+
+PHONES = [
+    [{"number": "(480) 555-1234", "type": "Mobile"}, {"number": "602.555.9876"}],
+    "(480) 555-0000, 602-555-1111; 12",
+    ["480-555-2222", 5, {"phone": "6025553333"}, {"number": None}],
+    {"number": "4805554444"},
+    [],
+    None,
+    float("nan"),
+    "",
+    [{"number": "555-1234"}],
+]
+
+
+def test_vectorized_phones_match_the_scalar_functions():
+    phones = pd.Series(PHONES, index=range(100, 100 + len(PHONES)))
+
+    numbers = normalize_phones(phones)
+    primary = extract_primary_phones(phones)
+
+    assert numbers.index.equals(phones.index)
+    assert numbers.tolist() == [extract_phone_numbers(value) for value in PHONES]
+    assert primary.tolist() == [extract_primary_phone(value) for value in PHONES]
+    assert normalize_phones(pd.Series([], dtype=object)).tolist() == []
+
+
+def test_normalize_contacts():
+    df = pd.DataFrame({
+        "agent_phones": PHONES[:3],
+        "agent_email": ["a@example.com", "", None],
+    })
+
+    contacts = normalize_contacts(df)
+
+    assert contacts["agent_primary_phone"].tolist() == ["4805551234", "4805550000", "4805552222"]
+    assert contacts["agent_email"].tolist() == ["a@example.com", None, None]
+    assert contacts["office_phone_numbers"].tolist() == [[], [], []]
+
+
+def test_contact_filter_and_export():
+    df = pd.DataFrame({
+        "agent_name": ["A", "B", "C"],
+        "agent_email": [None, "b@example.com", None],
+        "agent_phones": [PHONES[0], PHONES[8], None],
+        "agent_id": ["1", "2", "3"],
+        "broker_name": ["X", "Y", "Z"],
+        "office_name": ["O1", "O2", "O3"],
+        "office_phones": [None, PHONES[1], None],
+        "office_email": [None, None, None],
+    })
+
+    assert filter_by_agent_contact(df, require_phone=True)["agent_name"].tolist() == ["A"]
+
+    export = get_contact_export(df)
+    assert export["agent_name"].tolist() == ["A", "B"]
+    assert export["agent_primary_phone"].tolist() == ["4805551234", None]
+    assert export["office_primary_phone"].tolist() == [None, "4805550000"]
+
+
+def _history(*events):
+    return [{"date": date, "event_name": name, "price": price} for date, name, price in events]
+
+
+def test_price_cuts_from_current_listing_history():
+    df = pd.DataFrame({"property_history": [
+        _history(("2024-01-01", "Listed", 500), ("2024-02-01", "Price Changed", 480),
+                 ("2024-03-01", "Price Changed", 490), ("2024-04-01", "Price Changed", 470)),
+        _history(("2023-01-01", "Listed", 500), ("2023-02-01", "Price Changed", 400), ("2024-01-01", "Listed", 450)),
+        None,
+        [],
+    ]}, index=list("abcd"))
+
+    assert count_price_cuts(df).tolist() == [2, 0, 0, 0]
+    # Histories read back from CSV are text: no events, but the parsed rows still count
+    text = df.assign(property_history=[str(df.loc["a", "property_history"]), df.loc["a", "property_history"], None, []])
+    assert count_price_cuts(text).tolist() == [0, 2, 0, 0]
+    assert count_price_cuts(pd.DataFrame({"is_price_reduced": [True, None]})).tolist() == [1, 0]
+
+
+def test_frustration_score_follows_the_documented_formula():
+    df = pd.DataFrame({
+        "agent_name": ["A", "A", "A", "B", "B", None, "C"],
+        "days_on_mls": [100, 200, 10, 95, None, 300, 30],
+        "is_price_reduced": [True, False, False, False, False, True, True],
+    })
+
+    scores = score_agent_frustration(df).set_index("agent_name")
+
+    assert scores.index.tolist() == ["A", "B", "C"]
+    assert scores.loc["A", "stale_count"] == 2
+    assert scores.loc["A", "frustration_score"] == 20 + 150 * 0.25
+    assert scores.loc["B", "frustration_score"] == 10 + 95 * 0.25
+    assert scores.loc["C", "frustration_score"] == 0
+    assert scores.loc["A", "median_days_on_market"] == 100
+    assert scores.loc["A", "price_cut_listings"] == 1
+    assert score_agent_frustration(df, stale_days=20).loc[0, "listing_score"] == 20
+
+
+def _agents_frame():
+    rows = []
+    for agent, listings, price in (("A", 5, 100000), ("B", 3, 900000), ("C", 4, 300000), ("D", 1, 50000)):
+        for number in range(listings):
+            rows.append({
+                "property_id": f"{agent}{number}", "agent_name": agent, "list_price": price,
+                "agent_email": None if agent == "C" else f"{agent.lower()}@example.com",
+                "agent_phones": [{"number": f"480555000{number}"}], "agent_id": agent,
+                "broker_name": f"Broker {agent}", "broker_id": agent, "office_name": "Main", "style": "SINGLE_FAMILY",
+            })
+    return pd.DataFrame(rows)
+
+
+def test_top_k_matches_the_head_of_the_full_ranking():
+    df = _agents_frame()
+
+    top = get_agent_activity(df, top_k=2)
+    full = get_agent_activity(df)
+    assert top.equals(full.head(2))
+    assert find_most_active_agents(df, limit=3)["agent_name"].tolist() == ["A", "C", "B"]
+    assert get_broker_activity(df, top_k=1)["broker_name"].tolist() == ["Broker A"]
+    assert analyze_agent_specialization(df, top_k=2)["agent_name"].tolist() == ["A", "C"]
+
+
+def test_wholesale_top_k():
+    df = _agents_frame()
+
+    full = get_wholesale_friendly_agents(df, min_listings=2)
+    top = get_wholesale_friendly_agents(df, min_listings=2, top_k=2)
+
+    assert full["agent_name"].tolist() == ["A", "C", "B"]
+    assert top.equals(full.head(2))
+    assert top["primary_phone"].tolist() == ["4805550000", "4805550000"]
+
+
+def test_specialization_columns_and_common_style():
+    df = pd.DataFrame({
+        "property_id": ["1", "2", "3", "4", "5", "6"],
+        "agent_name": ["A", "A", "A", "B", "B", "C"],
+        "list_price": [150000, 250000, 250000, 2000000, None, None],
+        "agent_email": [None, "a@example.com", None, "b@example.com", None, None],
+        "sqft": [1000, 2000, 3000, 4000, 5000, None],
+        "beds": [2, 3, 4, 5, 6, None],
+        "full_baths": [1, 2, 3, 4, 5, None],
+        "style": ["CONDOS", "SINGLE_FAMILY", "SINGLE_FAMILY", "TOWNHOMES", "CONDOS", None],
+    })
+
+    specialization = analyze_agent_specialization(df).set_index("agent_name")
+
+    assert specialization.loc["A", "avg_sqft"] == 2000
+    assert specialization.loc["A", "agent_email"] == "a@example.com"
+    assert specialization.loc["A", "common_style"] == "SINGLE_FAMILY"
+    assert specialization.loc["B", "common_style"] == "CONDOS"  # tie: smallest value, like mode()
+    assert pd.isna(specialization.loc["C", "common_style"])
+    assert specialization["price_category"].to_dict() == {"A": "Mid-Range", "B": "Luxury", "C": "Unknown"}
+
+
+def test_categorize_prices_bounds():
+    prices = pd.Series([0, 199999, 200000, 499999, 500000, 999999, 1000000, None])
+
+    assert categorize_prices(prices).tolist() == [
+        "Budget", "Budget", "Mid-Range", "Mid-Range", "Upper-Mid", "Upper-Mid", "Luxury", "Unknown",
+    ]
@@ -0,0 +1,83 @@
+import pandas as pd
+
+from homeharvest import AgentIndex
+from homeharvest.agent_broker import (
+    analyze_agent_specialization, find_properties_by_agent, find_properties_by_broker, get_agent_activity,
+)
+
+
+def _batch_one():
+    return pd.DataFrame({
+        "property_id": ["1", "2", "3", "4"],
+        "agent_name": ["Jane Doe", "Jane Doe", "Bob Ray", None],
+        "agent_id": ["a1", "a2", None, None],
+        "agent_nrds_id": [None, "n2", "n3", None],
+        "agent_email": [None, None, "BOB@example.com", None],
+        "broker_name": ["Acme Realty", None, "Acme Realty", None],
+        "broker_id": [None, None, "b1", None],
+        "office_name": ["Main St", "Main St", None, None],
+        "office_id": [None, None, None, None],
+        "list_price": [100, 200, 300, 400],
+        "agent_phones": [None, None, [{"number": "480-555-1234"}], None],
+    })
+
+
+def _batch_two():
+    return pd.DataFrame({
+        "property_id": ["5", "6"],
+        "agent_name": ["bob  ray", "J. Doe"],
+        "agent_id": ["a3", None],
+        "agent_nrds_id": ["n3", "n2"],
+        "agent_email": [None, None],
+        "list_price": [500, 600],
+    })
+
+
+def test_same_name_agents_stay_separate():
+    index = AgentIndex(_batch_one())
+
+    assert sorted(index.keys_by_name("jane doe", partial=False)) == ["id:a1", "id:a2"]
+    assert index.properties("id:a1")["property_id"].tolist() == ["1"]
+    assert index.resolve(email="bob@example.com") == "nrds:n3"
+
+
+def test_identifiers_link_across_batches():
+    index = AgentIndex(_batch_one()).add(_batch_two())
+
+    assert len(index) == 6
+    assert index.resolve(email="bob@example.com") == "id:a3"
+    assert index.properties("id:a3")["property_id"].tolist() == ["3", "5"]
+    assert index.properties("id:a2")["property_id"].tolist() == ["2", "6"]
+    assert index.agent_keys.tolist() == ["id:a1", "id:a2", "id:a3", None, "id:a3", "id:a2"]
+
+
+def test_lookups_match_the_column_scan():
+    df = _batch_one()
+    index = AgentIndex(df)
+
+    for name in ("jane", "BOB", "nobody"):
+        assert find_properties_by_agent(df, name, index=index).equals(find_properties_by_agent(df, name))
+    assert find_properties_by_broker(df, "acme", index=index).equals(find_properties_by_broker(df, "acme"))
+
+
+def test_activity_groups_by_resolved_agent():
+    activity = AgentIndex(_batch_one()).add(_batch_two()).activity()
+
+    assert activity["agent_key"].tolist() == ["id:a2", "id:a3", "id:a1"]
+    assert activity["listing_count"].tolist() == [2, 2, 1]
+    assert activity.loc[1, "avg_price"] == 400
+    assert activity.loc[1, "primary_phone"] == "4805551234"
+
+
+def test_aggregations_reuse_the_index_grouping():
+    df = pd.concat([_batch_one(), _batch_two()], ignore_index=True)
+    index = AgentIndex(_batch_one()).add(_batch_two())
+
+    assert get_agent_activity(df, top_k=2, index=index)["agent_key"].tolist() == ["id:a2", "id:a3"]
+
+    specialization = analyze_agent_specialization(df, index=index).set_index("agent_key")
+    assert specialization.loc["id:a3", "agent_name"] == "Bob Ray"
+    assert specialization.loc["id:a3", "listing_count"] == 2
+    assert specialization.loc["id:a2", "avg_price"] == 400
+    # Grouping by name splits Bob Ray's listings and merges the two Jane Does
+    assert analyze_agent_specialization(df).set_index("agent_name").loc["Jane Doe", "listing_count"] == 2
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from homeharvest.core import scrapers
+from homeharvest.core.scrapers import Scraper, ScraperInput
+from homeharvest.core.scrapers.auth import TokenManager
+
+
+def _counting_mint(expires_in=3600):
+    calls = []
+    lock = threading.Lock()
+
+    def mint(device_id):
+        with lock:
+            calls.append(device_id)
+            return f"token-{len(calls)}", expires_in
+
+    return mint, calls
+
+
+def test_token_manager_shares_token_across_threads():
+    mint, calls = _counting_mint()
+    manager = TokenManager(pool_size=1, mint=mint)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(executor.map(lambda _: manager.get_token(), range(50)))
+
+    assert set(tokens) == {"token-1"}
+    assert len(calls) == 1
+
+
+def test_scraper_counts_token_cache_hits(monkeypatch):
+    mint, calls = _counting_mint()
+    monkeypatch.setattr(scrapers, "TOKEN_MANAGER", TokenManager(pool_size=1, mint=mint))
+    scraper = Scraper(ScraperInput(location="85281", listing_type=None))
+
+    scraper.get_access_token()
+    scraper.get_access_token()
+
+    assert len(calls) == 1
+    assert scraper.stats.counters["cache_hits"] == 1
+
+
+def test_token_manager_identity_pool():
+    mint, calls = _counting_mint()
+    manager = TokenManager(pool_size=3, mint=mint)
+
+    tokens = {manager.get_token(worker=i) for i in range(6)}
+
+    assert len(tokens) == 3
+    assert len(set(calls)) == 3  #: one device id per identity
+
+
+def test_token_manager_spreads_threads_across_identities():
+    mint, calls = _counting_mint()
+    manager = TokenManager(pool_size=3, mint=mint)
+    barrier = threading.Barrier(3)
+
+    def worker(_):
+        barrier.wait()  #: keep three distinct threads alive at once
+        return manager.get_token()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        tokens = set(executor.map(worker, range(3)))
+
+    assert len(tokens) == 3
+    assert len(set(calls)) == 3
+
+
+def test_token_manager_refreshes_before_expiry():
+    mint, calls = _counting_mint(expires_in=10)
+    manager = TokenManager(pool_size=1, refresh_margin=60, mint=mint)
+
+    first = manager.get_token()
+    second = manager.get_token()  #: inside the refresh margin - still served, refresh starts
+    assert first == second == "token-1"
+
+    deadline = time.time() + 2
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) == 2
+
+    manager.invalidate()
+    assert manager.get_token() == "token-3"
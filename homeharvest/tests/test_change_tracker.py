@@ -0,0 +1,93 @@
+import pandas as pd
+
+from homeharvest import ChangeTracker, get_price_drops
+
+
+def _history(*events):
+    return [{"date": date, "event_name": name, "price": price} for date, name, price in events]
+
+
+def _snapshot(prices, statuses=None, list_dates=None):
+    ids = list(prices)
+    return pd.DataFrame({
+        "property_id": ids,
+        "zip_code": ["85004" if int(property_id) % 2 else "85006" for property_id in ids],
+        "status": statuses or ["FOR_SALE"] * len(ids),
+        "list_price": list(prices.values()),
+        "list_date": list_dates or ["2025-01-01"] * len(ids),
+    })
+
+
+def test_successive_snapshots_log_price_status_and_relist_events():
+    tracker = ChangeTracker()
+    tracker.update(_snapshot({"1": 500_000, "2": 400_000, "3": 300_000}), as_of="2025-03-01")
+    assert len(tracker) == 0
+
+    tracker.update(_snapshot({"1": 480_000, "2": 400_000, "3": 310_000},
+                             statuses=["FOR_SALE", "PENDING", "FOR_SALE"]), as_of="2025-03-08")
+    tracker.update(_snapshot({"2": 400_000, "3": 290_000}, statuses=["FOR_SALE", "FOR_SALE"],
+                             list_dates=["2025-03-10", "2025-01-01"]), as_of="2025-03-15")
+
+    events = tracker.events()
+    assert sorted(events["event"].value_counts().items()) == [("price_change", 3), ("relisted", 1), ("status_change", 2)]
+    assert tracker.history("2")["new_status"].dropna().tolist() == ["PENDING", "FOR_SALE"]
+
+    drops = tracker.price_drops(days=None)
+    assert drops[["property_id", "old_price", "new_price"]].values.tolist() == [
+        ["3", 310_000.0, 290_000.0], ["1", 500_000.0, 480_000.0],
+    ]
+    assert drops["drop_percent"].tolist() == [6.45, 4.0]
+
+    recent = tracker.price_drops(zip_code="85004", days=7, as_of="2025-03-16")
+    assert recent["property_id"].tolist() == ["3"]
+    assert tracker.price_drops(zip_code="85006", days=None)["property_id"].tolist() == []
+
+
+def test_first_sighting_imports_property_history():
+    df = _snapshot({"1": 470_000, "2": 450_000})
+    df["property_history"] = [
+        _history(("2025-01-01", "Listed", 500_000), ("2025-02-01", "Price Changed", 480_000),
+                 ("2025-02-20", "Price Changed", 470_000)),
+        _history(("2023-01-01", "Listed", 500_000), ("2023-05-01", "Sold", 495_000),
+                 ("2025-01-05", "Listed", 450_000)),
+    ]
+
+    tracker = ChangeTracker().update(df)
+
+    drops = tracker.price_drops(days=None)
+    assert drops["new_price"].tolist() == [470_000.0, 480_000.0]
+    history = tracker.history("2")
+    assert history["event"].tolist() == ["status_change", "relisted"]
+    assert history["new_status"].tolist() == ["SOLD", None]
+    assert history["old_price"].tolist()[1] == 500_000.0
+
+    # History is only imported once
+    tracker.update(df)
+    assert len(tracker) == 4
+
+
+def test_save_and_load_round_trip(tmp_path):
+    tracker = ChangeTracker()
+    tracker.update(_snapshot({"1": 500_000, "2": 400_000}), as_of="2025-03-01")
+    tracker.update(_snapshot({"1": 450_000, "2": 400_000}), as_of="2025-03-08")
+
+    path = tmp_path / "changes.npz"
+    tracker.save(path)
+    loaded = ChangeTracker.load(path)
+
+    pd.testing.assert_frame_equal(loaded.events(), tracker.events())
+    loaded.update(_snapshot({"1": 440_000, "2": 400_000}), as_of="2025-03-15")
+    assert loaded.price_drops(days=None)["new_price"].tolist() == [440_000.0, 450_000.0]
+
+
+def test_get_price_drops_reads_property_history():
+    df = _snapshot({"1": 470_000, "2": 450_000, "3": 300_000})
+    df["last_update_date"] = ["2025-01-01", "2025-03-01", "2025-02-01"]
+    df["property_history"] = [
+        _history(("2025-01-01", "Listed", 500_000), ("2025-02-01", "Price Changed", 470_000)),
+        None,
+        _history(("2025-01-01", "Listed", 320_000), ("2025-02-15", "Price Changed", 300_000)),
+    ]
+
+    assert get_price_drops(df)["property_id"].tolist() == ["3", "1"]
+    assert get_price_drops(df.drop(columns="property_history"), limit=1)["property_id"].tolist() == ["2"]
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from homeharvest.chunked import (
+    ReservoirSample, clean_chunks, investment_params, iter_chunks, rank_by_investment_potential_chunked,
+    score_chunks, write_chunks,
+)
+from homeharvest.sorting import investment_score_params, rank_by_investment_potential
+
+
+def _snapshot(rows=5000, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def with_gaps(values):
+        values = values.astype(float)
+        values[rng.random(rows) < 0.1] = np.nan
+        return values
+
+    return pd.DataFrame({
+        "property_id": np.arange(rows),
+        "price_per_sqft": with_gaps(rng.random(rows) * 500),
+        "list_price": with_gaps(rng.random(rows) * 1e6),
+        "estimated_value": with_gaps(rng.random(rows) * 1e6),
+        "days_on_mls": with_gaps(rng.integers(0, 400, rows)),
+        "lot_sqft": with_gaps(rng.random(rows) * 1e4),
+        "sqft": with_gaps(rng.random(rows) * 3000),
+    })
+
+
+def test_chunks_are_row_blocks():
+    df = _snapshot(25)
+    chunks = list(iter_chunks(df, 10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert pd.concat(chunks).equals(df)
+
+
+def test_two_pass_params_match_the_in_memory_params():
+    df = _snapshot()
+
+    assert investment_params(df, chunksize=700) == pytest.approx(investment_score_params(df), nan_ok=True)
+
+
+def test_chunked_scores_match_the_in_memory_ranking(tmp_path):
+    df = _snapshot()
+    expected = rank_by_investment_potential(df)
+
+    scored = pd.concat(score_chunks(df, chunksize=700))
+    assert scored["property_id"].tolist() == df["property_id"].tolist()
+    assert np.allclose(
+        scored.set_index("property_id").loc[expected["property_id"], "investment_score"], expected["investment_score"]
+    )
+
+    path = tmp_path / "snapshot.csv"
+    df.to_csv(path, index=False)
+    top = rank_by_investment_potential_chunked(path, top_k=25, chunksize=700)
+    assert top["property_id"].tolist() == expected["property_id"].head(25).tolist()
+
+
+def test_streamed_cleaning_and_writing(tmp_path):
+    df = _snapshot(1000).assign(list_price=lambda frame: frame["list_price"].map(lambda price: f"${price:,.0f}"))
+    out = tmp_path / "clean.csv"
+
+    rows = write_chunks(clean_chunks(df, chunksize=300), out)
+
+    written = pd.read_csv(out)
+    assert rows == len(written) == 1000
+    assert written["list_price"].dtype == float
+    assert "price_per_sqft" in written.columns
+
+
+def test_one_shot_iterables_need_params():
+    df = _snapshot(100)
+
+    with pytest.raises(ValueError):
+        next(score_chunks(iter([df])))
+
+    params = investment_score_params(df)
+    assert len(next(score_chunks(iter([df]), params=params))) == 100
+
+
+def test_reservoir_median():
+    sample = ReservoirSample(size=1000)
+    sample.add(np.arange(501, dtype=float))
+    assert sample.median() == 250
+
+    sample = ReservoirSample(size=2000, seed=1)
+    for start in range(0, 100000, 10000):
+        sample.add(np.arange(start, start + 10000, dtype=float))
+    assert sample.seen == 100000
+    assert abs(sample.median() - 50000) < 5000
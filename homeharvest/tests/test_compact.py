@@ -0,0 +1,94 @@
+import pytest
+
+from homeharvest import CompactProperties, HEAVY_FIELDS
+from homeharvest.core.scrapers.realtor import get_key, process_extra_property_details
+from homeharvest.core.scrapers.realtor.processors import process_property
+
+
+def _home(i):
+    return {
+        "property_id": str(1000 + i),
+        "listing_id": str(i),
+        "href": f"https://www.realtor.com/realestateandhomes-detail/{i}",
+        "status": "for_sale",
+        "list_price": 300_000 + i,
+        "list_price_min": None,
+        "list_price_max": None,
+        "list_date": "2025-01-10T12:00:00Z",
+        "flags": {"is_pending": False, "is_contingent": False},
+        "location": {
+            "address": {"line": f"{i} Main St", "street_number": str(i), "street_name": "Main", "street_suffix": "St",
+                        "unit": None, "city": "Macon", "state_code": "GA", "postal_code": "31201"},
+            "county": {"name": "Bibb", "fips_code": "13021"},
+        },
+        "description": {"type": "single_family", "beds": 3, "baths_full": 2, "sqft": 1500},
+        "tags": ["swimming_pool", "garage_2_or_more"],
+        "advertisers": [{
+            "type": "seller",
+            "name": f"Agent {i % 2}",
+            "fulfillment_id": str(i % 2 + 1),
+            "email": f"agent{i % 2}@example.com",
+            "phones": [{"number": "478-555-0100", "type": "mobile"}],
+            "broker": {"name": "Broker", "fulfillment_id": "9"},
+            "office": {"name": "Office", "fulfillment_id": "0", "phones": [{"number": "478-555-9999"}]},
+        }],
+        "photos": [{"href": f"https://ap.rdcpix.com/{i}-{j}s.jpg"} for j in range(3)],
+        "details": [{"category": "Interior", "text": ["Fireplace"]}],
+    }
+
+
+def _process(result, compact=None):
+    return process_property(result, False, True, False, None, get_key, process_extra_property_details,
+                            compact=compact)
+
+
+def test_advertiser_records_are_shared_by_id():
+    compact = CompactProperties()
+    homes = [_process(_home(i), compact) for i in range(4)]
+
+    assert homes[0].advertisers is homes[2].advertisers
+    assert homes[0].advertisers.agent is not homes[1].advertisers.agent
+    # Offices without a fulfillment id are shared by their fields
+    assert homes[0].advertisers.office is homes[1].advertisers.office
+    assert homes[0].advertisers.broker.uuid == "9"
+
+
+def test_heavy_fields_are_dropped_and_the_rest_matches():
+    full = _process(_home(1))
+    compact = _process(_home(1), CompactProperties())
+
+    assert compact.photos is None and compact.details is None and compact.description.alt_photos is None
+    assert full.photos and full.description.alt_photos
+    for field in set(type(full).model_fields) - set(HEAVY_FIELDS) - {"description"}:
+        assert getattr(compact, field) == getattr(full, field), field
+    assert compact.description == full.description.model_copy(update={"alt_photos": None})
+
+    kept = _process(_home(1), CompactProperties(drop_fields=["details"]))
+    assert kept.photos == full.photos and kept.details is None
+
+
+def test_fields_that_are_not_dropped_are_rejected():
+    with pytest.raises(ValueError, match="not_a_field"):
+        CompactProperties(drop_fields=["photos", "not_a_field"])
+    # Property fields process_property always fills
+    with pytest.raises(ValueError, match="advertisers, description, flags, pet_policy"):
+        CompactProperties(drop_fields=["flags", "advertisers", "description", "pet_policy"])
+
+    raw = dict(_home(1), property_history=[{"date": "2025-01-10", "event_name": "Listed", "price": 300_001}])
+    assert _process(raw, CompactProperties()).property_history
+    home = _process(raw, CompactProperties(drop_fields=["property_history"]))
+    assert home.property_history is None and home.photos
+
+
+def test_records_with_another_mls_set_are_not_shared():
+    compact = CompactProperties()
+    home = _home(0)
+    home["advertisers"][0]["mls_set"] = "A-MLS"
+    other_mls = _home(2)
+    other_mls["advertisers"][0]["mls_set"] = "B-MLS"
+
+    first, second = _process(home, compact), _process(other_mls, compact)
+
+    assert first.advertisers.agent is not second.advertisers.agent
+    assert second.advertisers.agent.mls_set == "B-MLS"
+    assert first.advertisers.broker is second.advertisers.broker
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from homeharvest.core.scrapers.realtor.parsers import calculate_days_on_mls
+from homeharvest.dates import (
+    _parse_iso, clear_date_caches, format_datetime, parse_datetime, parse_datetime_series, parse_naive_datetime,
+    parse_utc_datetime,
+)
+
+
+def test_parse_datetime_keeps_the_timezone():
+    assert parse_datetime("2025-01-10T12:00:00Z") == datetime(2025, 1, 10, 12, tzinfo=timezone.utc)
+    assert parse_datetime("2025-01-10") == datetime(2025, 1, 10)
+    assert parse_datetime("2025-08-29 00:00:00") == datetime(2025, 8, 29)
+    assert parse_datetime(datetime(2025, 1, 1)) == datetime(2025, 1, 1)
+    assert parse_datetime(None) is None
+    assert parse_datetime("") is None
+    assert parse_datetime("not a date") is None
+
+
+def test_parse_naive_datetime_drops_the_timezone_without_converting():
+    assert parse_naive_datetime("2025-01-10T12:00:00-05:00") == datetime(2025, 1, 10, 12)
+    assert parse_naive_datetime(datetime(2025, 1, 10, 12, tzinfo=timezone.utc)) == datetime(2025, 1, 10, 12)
+    assert parse_naive_datetime("2025-01-10T99:00:00") == datetime(2025, 1, 10)
+
+
+def test_parse_utc_datetime_converts_offsets_like_the_series_path():
+    values = ["2025-01-10T20:00:00-07:00", "2025-01-10T12:00:00Z", "2025-01-10"]
+
+    assert [parse_utc_datetime(value) for value in values] == parse_datetime_series(pd.Series(values)).tolist()
+    assert parse_utc_datetime("2025-01-10T20:00:00-07:00") == datetime(2025, 1, 11, 3)
+
+
+def test_each_distinct_string_is_parsed_once():
+    clear_date_caches()
+    for _ in range(100):
+        parse_datetime("2025-01-10T12:00:00Z")
+        calculate_days_on_mls({"status": "for_sale", "list_date": "2025-01-10T12:00:00Z"})
+
+    info = _parse_iso.cache_info()
+    assert info.misses == 1
+    assert info.hits == 199
+
+
+def test_format_and_series_parsing():
+    assert format_datetime(datetime(2025, 1, 10, 12, 30)) == "2025-01-10 12:30:00"
+
+    parsed = parse_datetime_series(pd.Series(["2025-01-10T12:00:00Z", None, "garbage", "2025-01-11"]))
+    assert parsed.tolist()[0] == pd.Timestamp("2025-01-10 12:00:00")
+    assert parsed.isna().tolist() == [False, True, True, False]
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from homeharvest.core.scrapers import ScraperInput
+from homeharvest.core.scrapers.models import ListingType
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.core.scrapers.realtor.filters import compile_filters
+
+
+def _filter(**kwargs):
+    scraper_input = ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE, **kwargs)
+    return compile_filters(RealtorScraper(scraper_input))
+
+
+def test_compiled_filter_reads_nested_raw_fields():
+    home_filter = _filter(has_garage=True, hoa_fee_max=100, tag_exclude=["Basement"])
+    homes = [
+        {"property_id": "1", "tags": ["central_air"], "description": {"garage": 2}, "hoa": {"fee": 50}},
+        {"property_id": "2", "tags": ["basement"], "description": {"garage": 2}, "hoa": {"fee": 50}},
+        {"property_id": "3", "tags": [], "description": {"garage": 0}, "hoa": {"fee": 50}},
+        {"property_id": "4", "tags": ["garage_1_or_more"], "hoa": {"fee": 250}},
+    ]
+
+    assert [home["property_id"] for home in home_filter.apply(homes)] == ["1"]
+
+
+def test_inactive_filter_keeps_everything():
+    home_filter = _filter(has_pool=False)  #: falsy additional filters do not switch the filters on
+
+    assert not home_filter.active
+    assert home_filter.apply([{"property_id": "1"}]) == [{"property_id": "1"}]
+
+
+def test_mask_matches_predicate():
+    home_filter = _filter(tag_filters=["waterfront", "view"], tag_match_type="all", has_pool=True)
+    df = pd.DataFrame(
+        {
+            "property_id": ["1", "2", "3", "4"],
+            "tags": [["waterfront", "view", "swimming_pool"], ["waterfront", "view"], None, ["Waterfront", "View", "spa"]],
+            "parking_garage": [None, 1, None, None],
+        },
+        index=[10, 11, 12, 13],
+    )
+
+    mask = home_filter.mask(df)
+
+    assert list(mask.index) == [10, 11, 12, 13]
+    assert list(df[mask].property_id) == ["1", "4"]
+    assert list(df[mask].property_id) == [
+        row["property_id"] for row in df.to_dict("records") if home_filter(row)
+    ]
+
+
+def test_offset_dates_are_compared_in_utc_by_both_paths():
+    # 2025-03-01T20:00-07:00 is 2025-03-02T03:00 UTC
+    home_filter = _filter(date_from="2025-03-02T00:00:00", date_from_precision="hour")
+    homes = [
+        {"property_id": "1", "list_date": "2025-03-01T20:00:00-07:00"},
+        {"property_id": "2", "list_date": "2025-03-01T16:00:00-07:00"},
+    ]
+
+    assert [home["property_id"] for home in home_filter.apply(homes)] == ["1"]
+    assert list(pd.DataFrame(homes)[home_filter.mask(pd.DataFrame(homes))].property_id) == ["1"]
+
+
+def test_offset_bounds_and_past_hours_are_utc():
+    # the bound is 2025-03-02T03:00 UTC
+    home_filter = _filter(date_from="2025-03-01T20:00:00-07:00", date_from_precision="hour")
+    homes = [
+        {"property_id": "1", "list_date": "2025-03-02T04:00:00Z"},
+        {"property_id": "2", "list_date": "2025-03-02T01:00:00Z"},
+    ]
+    assert [home["property_id"] for home in home_filter.apply(homes)] == ["1"]
+    assert list(pd.DataFrame(homes)[home_filter.mask(pd.DataFrame(homes))].property_id) == ["1"]
+
+    now = datetime.now(timezone.utc)
+    recent = {"property_id": "1", "list_date": (now - timedelta(minutes=30)).isoformat()}
+    stale = {"property_id": "2", "list_date": (now - timedelta(hours=3)).astimezone(timezone(timedelta(hours=9))).isoformat()}
+    assert _filter(past_hours=2).apply([recent, stale]) == [recent]
+
+    scraper = RealtorScraper(ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE, sort_by="list_date"))
+    sorted_ids = [home["property_id"] for home in scraper._apply_sort([
+        {"property_id": "late", "list_date": "2025-03-01T23:00:00-07:00"},  #: 06:00 UTC
+        {"property_id": "early", "list_date": "2025-03-02T01:00:00Z"},
+    ])]
+    assert sorted_ids == ["late", "early"]
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from homeharvest import ScrapeStats, register_metrics_hook, unregister_metrics_hook
+
+
+def test_stats_spans_and_counters():
+    stats = ScrapeStats()
+
+    for _ in range(3):
+        with stats.span("general_search"):
+            pass
+    stats.incr("cache_hits", 2)
+
+    summary = stats.summary()
+    assert summary["timings"]["general_search"]["count"] == 3
+    assert summary["counters"]["cache_hits"] == 2
+
+    exported = stats.to_prometheus()
+    assert 'homeharvest_stage_seconds_count{stage="general_search"} 3' in exported
+    assert "homeharvest_cache_hits_total 2" in exported
+
+
+def test_stats_record_response_counts_bytes_retries_and_429s():
+    stats = ScrapeStats()
+    history = (SimpleNamespace(status=429), SimpleNamespace(status=403))
+    response = SimpleNamespace(
+        content=b"x" * 128,
+        status_code=200,
+        raw=SimpleNamespace(retries=SimpleNamespace(history=history)),
+    )
+
+    stats.record_response(response)
+
+    counters = stats.counters
+    assert counters["requests"] == 1
+    assert counters["bytes_downloaded"] == 128
+    assert counters["retries"] == 2
+    assert counters["rate_limited_429"] == 1
+
+    # Compressed responses count the bytes transferred, not the decoded body
+    stats.record_response(SimpleNamespace(content=b"x" * 1000, status_code=200, headers={"Content-Length": "120"}))
+    assert stats.counters["bytes_downloaded"] == 128 + 120
+
+    # HTTP/2 transport: httpx responses in retry_history expose status_code
+    stats.record_response(SimpleNamespace(content=b"", status_code=200,
+                                          retry_history=(SimpleNamespace(status_code=429),)))
+    assert stats.counters["rate_limited_429"] == 2
+
+
+def test_stats_hooks():
+    events = []
+    hook = lambda kind, name, value: events.append((kind, name))
+
+    register_metrics_hook(hook)
+    try:
+        stats = ScrapeStats()
+        with stats.span("clean_dataframe"):
+            pass
+        stats.incr("retries")
+    finally:
+        unregister_metrics_hook(hook)
+
+    assert ("span", "clean_dataframe") in events
+    assert ("counter", "retries") in events
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from homeharvest import MarketStatsCube, QuantileSketch, get_data_quality_report, week_of
+
+
+def _listings(rows=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "property_id": [str(i) for i in range(rows)],
+        "zip_code": rng.choice(["85004", "85006", "85281"], rows),
+        "style": rng.choice(["SINGLE_FAMILY", "CONDOS"], rows),
+        "status": rng.choice(["FOR_SALE", "SOLD"], rows),
+        "list_date": (pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D")).astype(str),
+        "list_price": rng.lognormal(13, 0.4, rows),
+        "price_per_sqft": rng.normal(250, 40, rows),
+        "days_on_mls": rng.integers(0, 120, rows).astype(float),
+    })
+
+
+def test_sketch_quantiles_are_within_relative_accuracy_and_merge():
+    values = np.random.default_rng(1).lognormal(12, 1, 10001)
+    left = QuantileSketch().add(values[:4000])
+    right = QuantileSketch().add(values[4000:])
+
+    merged = left.merge(right)
+
+    assert merged.count == len(values)
+    for q in (0.1, 0.5, 0.9):
+        assert merged.quantile(q) == pytest.approx(np.quantile(values, q, method="lower"), rel=0.011)
+    assert QuantileSketch().add([0, 0, 5]).median() == 0.0
+    assert QuantileSketch().median() is None
+
+
+def test_cube_lookups_and_rollups_match_a_rescan():
+    df = _listings()
+    cube = MarketStatsCube().update(df)
+
+    stats = cube.stats(zip_code="85004", status="for_sale")
+    rows = df[(df["zip_code"] == "85004") & (df["status"] == "FOR_SALE")]
+    assert stats["total_properties"] == len(rows)
+    assert stats["avg_price"] == pytest.approx(rows["list_price"].mean())
+    assert stats["median_price"] == pytest.approx(rows["list_price"].median(), rel=0.02)
+    assert stats["avg_sold_price"] is None
+
+    area = cube.stats(zip_code=["85004", "85006"], property_type="condos", since="2025-02-10")
+    rows = df[df["zip_code"].isin(["85004", "85006"]) & (df["style"] == "CONDOS")
+              & (pd.to_datetime(df["list_date"]) >= pd.Timestamp(week_of("2025-02-10")))]
+    assert area["total_properties"] == len(rows)
+    assert area["avg_days_on_market"] == pytest.approx(rows["days_on_mls"].mean())
+
+    week = week_of("2025-01-15")
+    cell = cube.cell("85281", "SINGLE_FAMILY", "SOLD", "2025-01-15")
+    rows = df[(df["zip_code"] == "85281") & (df["style"] == "SINGLE_FAMILY") & (df["status"] == "SOLD")
+              & (pd.to_datetime(df["list_date"]).dt.strftime("%Y-%m-%d").map(week_of) == week)]
+    assert cell.listings == len(rows)
+
+    frame = cube.to_frame()
+    assert frame["total_properties"].sum() == len(df)
+
+
+def test_incremental_updates_skip_listings_already_counted():
+    df = _listings()
+    cube = MarketStatsCube().update(df.iloc[:2000])
+    cube.update(df.iloc[1500:])
+
+    assert len(cube) == len(df)
+    assert cube.stats() == pytest.approx(MarketStatsCube().update(df).stats())
+
+    relisted = df.iloc[:1].assign(status="SOLD", list_price=1.0)
+    cube.update(relisted)
+    assert len(cube) == len(df) + (df["status"].iloc[0] != "SOLD")
+
+
+def test_snapshots_and_merged_workers_give_the_same_cube(tmp_path):
+    df = _listings()
+    path = tmp_path / "snapshot.csv"
+    df.to_csv(path, index=False)
+
+    from_snapshot = MarketStatsCube.from_snapshot(path, chunksize=700)
+    merged = MarketStatsCube().update(df.iloc[:1000]).merge(MarketStatsCube().update(df.iloc[1000:]))
+    whole = MarketStatsCube().update(df).stats(zip_code="85006")
+
+    assert from_snapshot.stats(zip_code="85006") == pytest.approx(whole)
+    assert merged.stats(zip_code="85006") == pytest.approx(whole)
+
+
+def test_data_quality_report():
+    df = pd.DataFrame({"list_price": [100.0, None, 300.0], "beds": [None, None, None], "zip_code": ["1", "2", None]})
+
+    report = get_data_quality_report(df)
+
+    assert report["completeness"]["list_price"] == {"count": 2, "percentage": 66.67}
+    assert report["data_ranges"] == {"list_price": {"min": 100.0, "max": 300.0, "mean": 200.0, "median": 200.0}}
+
+
+def test_cubes_pickle_and_round_trip_through_json():
+    import json
+    import pickle
+
+    df = _listings()
+    cube = MarketStatsCube().update(df.iloc[:2000])
+
+    for copy in (pickle.loads(pickle.dumps(cube)), MarketStatsCube.from_dict(json.loads(json.dumps(cube.to_dict())))):
+        assert copy.stats(zip_code="85004") == pytest.approx(cube.stats(zip_code="85004"))
+        copy.update(df.iloc[1500:])  # listings already counted are still skipped
+        assert copy.stats() == pytest.approx(MarketStatsCube().update(df).stats())
+
+    # Cubes built in other processes merge after the trip
+    other = pickle.loads(pickle.dumps(MarketStatsCube().update(df.iloc[2000:])))
+    assert MarketStatsCube().update(df.iloc[:2000]).merge(other).stats(status="SOLD") == pytest.approx(
+        MarketStatsCube().update(df).stats(status="SOLD"))
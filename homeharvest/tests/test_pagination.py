@@ -0,0 +1,20 @@
+from homeharvest.core.scrapers.realtor.pagination import PageWindow
+
+
+def test_page_window_descending_stops_below_lower_bound():
+    window = PageWindow(lambda home: home["list_price"], lower=100, upper=500, descending=True)
+
+    assert not window.exhausted([{"list_price": 400}, {"list_price": 150}])
+    assert window.exhausted([{"list_price": 120}, {"list_price": 90}])
+    #: homes without a value never end the window
+    assert not window.exhausted([{"list_price": 150}, {"list_price": None}])
+    assert not window.exhausted([])
+
+
+def test_page_window_ascending_stops_above_upper_bound():
+    window = PageWindow.from_date_range(
+        lambda home: home["date"], {"type": "until", "date": 10}, descending=False
+    )
+
+    assert not window.exhausted([{"date": 5}, {"date": 10}])
+    assert window.exhausted([{"date": 9}, {"date": 11}])
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from homeharvest.core.scrapers import ScraperInput
+from homeharvest.core.scrapers.models import ListingType, SearchPropertyType
+from homeharvest.core.scrapers.realtor import RealtorScraper
+from homeharvest.core.scrapers.realtor.partitioning import Partition, SearchPartitioner, PRICE_CEILING
+
+
+def _partitioner(**kwargs):
+    scraper_input = ScraperInput(location="Dallas, TX", **kwargs)
+    return SearchPartitioner(SimpleNamespace(scraper_input=scraper_input))
+
+
+def test_split_prefers_date_windows():
+    partitioner = _partitioner(listing_type=ListingType.SOLD, date_from="2024-01-01", date_to="2024-12-31")
+
+    first, second = partitioner.split(Partition())
+
+    assert (first.overrides["date_from"], first.overrides["date_to"]) == ("2024-01-01", "2024-07-01")
+    assert (second.overrides["date_from"], second.overrides["date_to"]) == ("2024-07-02", "2024-12-31")
+
+
+def test_split_falls_back_to_price_then_property_type():
+    partitioner = _partitioner(
+        listing_type=ListingType.PENDING,
+        property_type=[SearchPropertyType.SINGLE_FAMILY, SearchPropertyType.CONDOS],
+    )
+
+    low, high = partitioner.split(Partition())
+    assert low.overrides == {"price_min": 0, "price_max": PRICE_CEILING}
+    assert high.overrides == {"price_min": PRICE_CEILING + 1, "price_max": None}
+
+    narrow = Partition({"price_min": 100000, "price_max": 100500})
+    by_type = partitioner.split(narrow)
+    assert [p.overrides["property_type"] for p in by_type] == [
+        [SearchPropertyType.SINGLE_FAMILY],
+        [SearchPropertyType.CONDOS],
+    ]
+
+
+def test_partitions_page_serially():
+    scraper = RealtorScraper(ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE))
+    assert scraper.parallel
+
+    child = SearchPartitioner(scraper)._child({"price_min": 0, "price_max": PRICE_CEILING})
+
+    #: leaves already run on the partitioner's pool
+    assert child.parallel is False
+    assert child.stats is scraper.stats
@@ -0,0 +1,71 @@
+import pandas as pd
+
+import homeharvest
+from homeharvest import PresetViews, compile_presets, scrape_presets
+from homeharvest.core.scrapers.realtor.filters import compile_params_filters
+
+
+def _frame():
+    return pd.DataFrame([
+        {"property_id": "1", "style": "SINGLE_FAMILY", "beds": 4, "full_baths": 2, "half_baths": 1, "sqft": 3200,
+         "list_price": 900000, "lot_sqft": 8000, "year_built": 2015, "hoa_fee": 0,
+         "tags": ["swimming_pool", "view"]},
+        {"property_id": "2", "style": "CONDOS", "beds": 2, "full_baths": 2, "half_baths": None, "sqft": 1100,
+         "list_price": 350000, "lot_sqft": None, "year_built": 1990, "hoa_fee": 400, "tags": ["garage_1_or_more"]},
+        {"property_id": "3", "style": "SINGLE_FAMILY", "beds": 3, "full_baths": 1, "half_baths": None, "sqft": 1500,
+         "list_price": 220000, "lot_sqft": 6000, "year_built": 1962, "hoa_fee": None,
+         "tags": ["fixer_upper", "investment_opportunity"]},
+        {"property_id": "4", "style": None, "beds": None, "full_baths": None, "half_baths": None, "sqft": None,
+         "list_price": None, "lot_sqft": None, "year_built": None, "hoa_fee": None, "tags": None},
+    ], index=[10, 11, 12, 13])
+
+
+def test_views_match_the_row_filter():
+    df = _frame()
+    views = PresetViews(df)
+
+    for name in ("luxury", "fixer_upper", "investor_friendly", "no_hoa"):
+        compiled = compile_presets(name)
+        params = compiled.params()
+        if compiled.expanded_tag_filters:
+            params["tag_filters"] = list(compiled.expanded_tag_filters)
+        home_filter = compile_params_filters(params)
+        expected = [row["property_id"] for row in df.to_dict("records") if home_filter(row)]
+
+        assert views.view(name)["property_id"].tolist() == expected, name
+
+
+def test_view_contents_and_overrides():
+    views = PresetViews(_frame())
+
+    assert views.view("luxury")["property_id"].tolist() == ["1"]
+    assert views.view("fixer_upper").index.tolist() == [12]
+    assert views.view("luxury", price_min=1000000).empty
+    assert views.view(property_type=["condos"])["property_id"].tolist() == ["2"]
+    assert views.view(baths_min=2.5)["property_id"].tolist() == ["1"]
+
+
+def test_masks_are_cached_and_counted():
+    views = PresetViews(_frame())
+
+    assert views.mask("luxury") is views.mask("luxury")
+    counts = views.counts(["luxury", "fixer_upper"])
+    assert counts == {"luxury": 1, "fixer_upper": 1}
+    assert set(views.views()) == set(homeharvest.FILTER_PRESETS)
+
+
+def test_scrape_presets_scrapes_once(monkeypatch):
+    calls = []
+
+    def fake_scrape(location, **kwargs):
+        calls.append((location, kwargs))
+        return _frame()
+
+    monkeypatch.setattr(homeharvest, "scrape_property", fake_scrape)
+
+    results = scrape_presets("Phoenix, AZ", ["luxury", "fixer_upper"], preset="luxury", listing_type="for_sale")
+
+    assert len(calls) == 1
+    assert "preset" not in calls[0][1]
+    assert results["luxury"]["property_id"].tolist() == ["1"]
+    assert results["fixer_upper"]["property_id"].tolist() == ["3"]
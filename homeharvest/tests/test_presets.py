@@ -0,0 +1,41 @@
+import pytest
+from pydantic import ValidationError
+
+from homeharvest import PRESET_FIELDS, combine_presets, compile_presets
+from homeharvest.presets import _compile
+
+
+def test_compiled_presets_are_memoized_and_frozen():
+    preset = compile_presets("Pool_Home")
+
+    assert preset is compile_presets("pool_home")
+    assert "pool" in preset.expanded_tag_filters
+    with pytest.raises(ValidationError):
+        preset.has_pool = False
+
+
+def test_merge_keeps_explicit_arguments():
+    explicit = dict.fromkeys(PRESET_FIELDS)
+    explicit |= {"price_min": 750000, "tag_match_type": "any"}
+
+    merged = compile_presets("luxury").merge(explicit)
+
+    assert merged["price_min"] == 750000
+    assert merged["sqft_min"] == 2500
+    assert merged["tag_filters"] == ["swimming_pool", "gourmet_kitchen", "high_ceiling", "view"]
+    assert merged["has_pool"] is None
+
+
+def test_combined_presets_union_tags():
+    combined = combine_presets("waterfront", "pool_home", override_params={"price_max": 900000})
+
+    assert combined["tag_filters"] == ["waterfront", "water_view", "lake", "swimming_pool"]
+    assert combined["waterfront"] is True and combined["has_pool"] is True
+    assert combined["price_max"] == 900000
+
+
+def test_invalid_preset_definitions_are_rejected():
+    with pytest.raises(ValidationError):
+        _compile("broken", "", {"tag_match_type": "some"})
+    with pytest.raises(ValidationError):
+        _compile("broken", "", {"pool": True})
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from homeharvest import (
+    INVESTMENT_SCORE_SPEC, WHOLESALE_SCORE_SPEC, compute_score, create_custom_score, get_wholesale_friendly_agents,
+    rank_by_score, score_components,
+)
+from homeharvest.sorting import compute_investment_score, investment_score_params
+
+
+def _frame(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "list_price": rng.uniform(1e5, 1e6, rows).round(-3),
+        "estimated_value": rng.uniform(1e5, 1e6, rows).round(-3),
+        "price_per_sqft": rng.uniform(50, 500, rows),
+        "days_on_mls": rng.integers(0, 200, rows).astype(float),
+        "lot_sqft": rng.uniform(1000, 20000, rows),
+        "beds": rng.integers(1, 6, rows),
+        "hoa_fee": rng.choice([0.0, 150.0, np.nan], rows),
+        "agent_name": rng.choice(["Ann", "Bob", "Cy", "Di"], rows),
+        "agent_email": rng.choice(["a@x.com", None], rows),
+        "agent_phones": [[{"number": "555-010-2000"}]] * rows,
+        "agent_id": None, "broker_name": "Realty", "office_name": "Main St", "property_id": np.arange(rows).astype(str),
+    })
+    for column in ("estimated_value", "price_per_sqft", "days_on_mls", "lot_sqft"):
+        df.loc[rng.random(rows) < 0.1, column] = np.nan
+    return df
+
+
+def test_investment_spec_matches_the_builtin_score():
+    df = _frame()
+    expected = compute_investment_score(df, investment_score_params(df))
+    assert np.allclose(compute_score(df, INVESTMENT_SCORE_SPEC), expected)
+
+    partial = df.drop(columns=["days_on_mls", "estimated_value"])
+    expected = compute_investment_score(partial, investment_score_params(partial))
+    assert np.allclose(compute_score(partial, INVESTMENT_SCORE_SPEC), expected)
+
+
+def test_wholesale_spec_matches_the_builtin_score():
+    agents = get_wholesale_friendly_agents(_frame(), min_listings=1)
+    components = score_components(agents, WHOLESALE_SCORE_SPEC)
+
+    assert np.allclose(components["price_score"], agents["price_score"] * 100)
+    assert np.allclose(compute_score(agents, WHOLESALE_SCORE_SPEC), agents["wholesale_score"])
+
+
+def test_expressions_and_callables():
+    df = _frame(20)
+    expected = df["estimated_value"] - df["list_price"]
+
+    pd.testing.assert_series_equal(compute_score(df, "estimated_value - list_price"), expected, check_names=False)
+    pd.testing.assert_series_equal(compute_score(df, lambda d: (d["estimated_value"] - d["list_price"]).to_numpy()),
+                                   expected, check_names=False)
+
+
+def test_create_custom_score_keeps_row_functions():
+    df = _frame(20)
+
+    row_wise = create_custom_score(df, lambda row: row["beds"] * 10)
+    vectorized = create_custom_score(df, lambda d: d["beds"] * 10, vectorized=True)
+    expression = create_custom_score(df, "beds * 10")
+
+    assert row_wise["custom_score"].tolist() == (df["beds"] * 10).tolist()
+    assert vectorized["custom_score"].tolist() == row_wise["custom_score"].tolist()
+    assert expression["custom_score"].tolist() == row_wise["custom_score"].tolist()
+    assert "custom_score" not in df.columns
+
+
+def test_spec_defaults_and_rank_by_score():
+    df = pd.DataFrame({"beds": [3, 5, 1], "hoa_fee": [None, 200.0, 100.0]})
+    spec = {
+        "beds": {"column": "beds", "transform": "minmax", "weight": 0.5},
+        "hoa": {"column": "hoa_fee", "fill": 0, "transform": "max", "invert": True, "weight": 0.5},
+        "pool": {"column": "pool", "default": 10, "weight": 1},
+    }
+
+    assert compute_score(df, spec).tolist() == [85.0, 60.0, 35.0]
+
+    top = rank_by_score(df, spec, "fit", top_k=2)
+    assert top["beds"].tolist() == [3, 5]
+    assert top["fit"].tolist() == [85.0, 60.0]
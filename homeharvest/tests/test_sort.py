@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from homeharvest.core.scrapers.realtor.sort import sort_fields, sort_homes
+from homeharvest.sorting import sort_properties
+
+
+def _homes(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    homes = []
+    for position in range(rows):
+        list_date = None
+        if rng.random() > 0.1:
+            list_date = f"2024-0{rng.integers(1, 10)}-1{rng.integers(0, 10)}T0{rng.integers(0, 10)}:00:00Z"
+        homes.append({
+            "property_id": str(position),
+            "list_price": None if rng.random() < 0.1 else int(rng.integers(1, 20)) * 50_000,
+            "list_date": list_date,
+            "estimated_value": int(rng.integers(1, 20)) * 50_000,
+            "description": {"beds": None if rng.random() < 0.1 else int(rng.integers(1, 6)),
+                            "sqft": int(rng.integers(5, 40)) * 100},
+        })
+    return homes
+
+
+def _frame(homes):
+    return pd.DataFrame([{
+        "property_id": home["property_id"],
+        "list_price": home["list_price"],
+        "list_date": pd.to_datetime(home["list_date"]).tz_localize(None) if home["list_date"] else pd.NaT,
+        "estimated_value": home["estimated_value"],
+        "beds": home["description"]["beds"],
+        "sqft": home["description"]["sqft"],
+    } for home in homes])
+
+
+@pytest.mark.parametrize("sort_by, sort_direction", [
+    ("list_price", "desc"),
+    ("list_date", "asc"),
+    (["beds", "list_price"], ["desc", "asc"]),
+    (["beds", "list_date", "sqft"], "asc"),
+    (["price_discount", "property_id"], ["asc", "desc"]),
+])
+def test_sort_homes_matches_sort_properties(sort_by, sort_direction):
+    homes = _homes()
+    fields = [sort_by] if isinstance(sort_by, str) else sort_by
+
+    got = _frame(sort_homes(homes, sort_by, sort_direction))
+    expected = sort_properties(_frame(homes), sort_by, sort_direction)
+
+    # Ties may be ordered differently, the keys must not
+    for field in fields:
+        if field != "price_discount":
+            pd.testing.assert_series_equal(got[field], expected[field])
+    assert sorted(got["property_id"]) == sorted(expected["property_id"])
+
+
+def test_missing_values_sort_last_in_both_directions():
+    homes = [{"list_price": None}, {"list_price": 2}, {"list_price": 1}]
+
+    assert [home["list_price"] for home in sort_homes(homes, "list_price", "desc")] == [2, 1, None]
+    assert [home["list_price"] for home in sort_homes(homes, "list_price", "asc")] == [1, 2, None]
+
+
+def test_dates_and_datetimes_compare_together():
+    homes = [
+        {"list_date": "2024-05-01T12:00:00Z"},
+        {"list_date": datetime(2024, 6, 1)},
+        {"list_date": "not a date"},
+        {"list_date": "2024-04-01 00:00:00"},
+    ]
+
+    result = sort_homes(homes, "list_date", "desc")
+
+    assert [home["list_date"] for home in result] == [
+        datetime(2024, 6, 1), "2024-05-01T12:00:00Z", "2024-04-01 00:00:00", "not a date",
+    ]
+
+
+def test_sort_fields_validates_lengths():
+    assert sort_fields(["beds", "list_price"], "asc") == [("beds", False), ("list_price", False)]
+    assert sort_fields("beds") == [("beds", True)]
+
+    with pytest.raises(ValueError):
+        sort_fields(["beds", "list_price"], ["asc"])
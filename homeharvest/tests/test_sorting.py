@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from homeharvest.sorting import (
+    add_calculated_sort_fields, get_best_deals, get_newest_listings, get_recently_updated,
+    rank_by_investment_potential, sort_properties,
+)
+
+
+def _frame():
+    return pd.DataFrame({
+        "property_id": ["a", "b", "c", "d", "e"],
+        "list_price": [300000.0, 450000.0, 200000.0, 450000.0, None],
+        "estimated_value": [400000.0, 400000.0, None, 500000.0, 300000.0],
+        "sqft": [1500.0, 2000.0, 1000.0, 1800.0, 1200.0],
+        "list_date": ["2024-03-01", None, "2024-05-01", "2024-01-15", "2024-04-01"],
+        "last_update_date": pd.to_datetime(["2024-06-01", "2024-06-03", None, "2024-06-02", "2024-05-30"]),
+    }, index=[7, 3, 9, 1, 4])
+
+
+def test_sort_properties_by_calculated_field_leaves_columns_unchanged():
+    df = _frame()
+    result = sort_properties(df, ["price_discount", "list_price"], ["asc", "desc"])
+
+    assert result["property_id"].tolist() == ["a", "d", "b", "c", "e"]
+    assert list(result.columns) == list(df.columns)
+    assert result.index.tolist() == [0, 1, 2, 3, 4]
+    assert df["property_id"].tolist() == ["a", "b", "c", "d", "e"]
+
+
+def test_sort_properties_inplace():
+    df = _frame()
+    expected = sort_properties(df, "price_discount", "asc")
+
+    assert sort_properties(df, "price_discount", "asc", inplace=True) is df
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_add_calculated_sort_fields_inplace():
+    df = _frame()
+    assert "property_age" not in add_calculated_sort_fields(df, ["price_discount"]).columns
+    assert "price_discount" not in df.columns
+
+    assert add_calculated_sort_fields(df, ["price_discount"], inplace=True) is df
+    assert df["price_discount"].iloc[0] == -25.0
+
+
+def test_top_k_helpers_match_a_full_sort():
+    df = _frame()
+
+    for limit in (2, 5):
+        deals = get_best_deals(df, limit)
+        assert deals["property_id"].tolist() == ["a", "d", "b", "c", "e"][:limit]
+        assert "price_discount" not in deals.columns
+
+        newest = get_newest_listings(df, limit)
+        assert newest["property_id"].tolist() == ["c", "e", "a", "d", "b"][:limit]
+
+        updated = get_recently_updated(df, limit)
+        assert updated["property_id"].tolist() == ["b", "d", "a", "e", "c"][:limit]
+        assert updated.index.tolist() == list(range(limit))
+
+
+def test_rank_by_investment_potential_keeps_input_intact():
+    df = _frame()
+    df["days_on_mls"] = [10.0, 90.0, 30.0, np.nan, 5.0]
+    ranked = rank_by_investment_potential(df)
+
+    assert ranked["investment_score"].is_monotonic_decreasing
+    assert "investment_score" not in df.columns
+    assert sorted(ranked["property_id"]) == sorted(df["property_id"])
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+import homeharvest
+from homeharvest import SpatialIndex, haversine_miles, local_comps, record_comps
+from homeharvest.core.scrapers import ScraperInput
+from homeharvest.core.scrapers.models import ListingType
+
+CENTER = (33.45, -112.07)
+
+
+def _listings(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "property_id": [str(i) for i in range(rows)],
+        "formatted_address": [f"{i} Main St, Phoenix, AZ 85004" for i in range(rows)],
+        "latitude": CENTER[0] + rng.normal(0, 0.05, rows),
+        "longitude": CENTER[1] + rng.normal(0, 0.05, rows),
+        "status": rng.choice(["FOR_SALE", "SOLD", "PENDING"], rows),
+        "list_date": pd.date_range("2025-01-01", periods=rows, freq="h").astype(str),
+        "last_sold_date": pd.date_range("2024-06-01", periods=rows, freq="h").astype(str),
+        "beds": rng.integers(1, 6, rows),
+        "list_price": rng.integers(100, 900, rows) * 1000,
+    })
+
+
+def test_radius_matches_a_full_scan():
+    df = _listings()
+    index = SpatialIndex(df)
+    distances = haversine_miles(*CENTER, df["latitude"], df["longitude"])
+
+    for miles in (0.1, 1.0, 3.0, 50.0):
+        found = index.radius(*CENTER, miles)
+        expected = df["property_id"][distances <= miles]
+        assert sorted(found["property_id"]) == sorted(expected)
+        assert found["distance_miles"].is_monotonic_increasing
+
+
+def test_filters_nearest_and_bbox():
+    df = _listings()
+    index = SpatialIndex(df)
+    distances = pd.Series(haversine_miles(*CENTER, df["latitude"], df["longitude"]))
+
+    sold = index.radius(*CENTER, 2.0, status="sold", date_field="last_sold_date", since="2024-07-01")
+    expected = df[(distances <= 2.0) & (df["status"] == "SOLD") & (df["last_sold_date"] >= "2024-07-01")]
+    assert sorted(sold["property_id"]) == sorted(expected["property_id"])
+
+    nearest = index.nearest(*CENTER, k=15)
+    assert nearest["property_id"].tolist() == df["property_id"][distances.nsmallest(15).index].tolist()
+
+    box = index.bbox(33.44, -112.08, 33.46, -112.06)
+    inside = df[df["latitude"].between(33.44, 33.46) & df["longitude"].between(-112.08, -112.06)]
+    assert box["property_id"].tolist() == inside["property_id"].tolist()
+
+
+def test_comps_need_a_covering_search():
+    df = _listings()
+    index = SpatialIndex(df)
+    address = "17 Main St, Phoenix, AZ 85004"
+
+    assert index.geocode("17 main st phoenix az 85004") == (df["latitude"][17], df["longitude"][17])
+    assert index.comps(address, 0.5) is None
+
+    lat, lon = index.geocode(address)
+    index.add(None, center=(lat, lon), radius=2.0, listing_type=ListingType.SOLD)
+
+    comps = index.comps(address, 0.5, ListingType.SOLD)
+    assert set(comps["status"]) == {"SOLD"}
+    assert (comps["distance_miles"] <= 0.5).all()
+    assert index.comps(address, 3.0, ListingType.SOLD) is None
+    assert index.comps(address, 0.5, ListingType.FOR_SALE) is None
+
+
+def test_scrape_property_answers_covered_comps_locally(monkeypatch):
+    df = _listings()
+    index = SpatialIndex()
+    scraper_input = ScraperInput(location="1 Main St, Phoenix, AZ 85004", listing_type=ListingType.SOLD, radius=1.0)
+    record_comps(index, {"centroid": {"lon": CENTER[1], "lat": CENTER[0]}}, scraper_input, df, len(df))
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("network search")
+
+    monkeypatch.setattr(homeharvest, "RealtorScraper", no_network)
+
+    result = homeharvest.scrape_property(
+        "1 Main St, Phoenix, AZ 85004", listing_type="sold", radius=0.5, beds_min=3,
+        sort_by="list_price", sort_direction="asc", spatial_index=index,
+    )
+
+    distances = haversine_miles(*CENTER, df["latitude"], df["longitude"])
+    expected = df[(distances <= 0.5) & (df["status"] == "SOLD") & (df["beds"] >= 3)]
+    assert sorted(result["property_id"]) == sorted(expected["property_id"])
+    assert result["list_price"].is_monotonic_increasing
+    assert "distance_miles" not in result.columns
+
+
+def test_truncated_or_filtered_searches_are_not_covering():
+    df = _listings(50)
+    index = SpatialIndex()
+    location_info = {"centroid": {"lon": CENTER[1], "lat": CENTER[0]}}
+
+    record_comps(index, location_info, ScraperInput(location="x", listing_type=None, radius=1.0, limit=50), df, 50)
+    record_comps(index, location_info, ScraperInput(location="y", listing_type=None, radius=1.0, beds_min=2), df, 10)
+
+    assert len(index) == 50
+    assert not index.covers(*CENTER, 0.5)
+
+
+def test_filters_the_index_cannot_apply_go_to_the_network():
+    df = _listings()
+    index = SpatialIndex()
+    location = "1 Main St, Phoenix, AZ 85004"
+    covering = ScraperInput(location=location, listing_type=None, radius=1.0)
+    record_comps(index, {"centroid": {"lon": CENTER[1], "lat": CENTER[0]}}, covering, df, len(df))
+
+    assert len(local_comps(index, ScraperInput(location=location, listing_type=None, radius=0.5))) > 0
+    for unindexed in ({"foreclosure": True}, {"mls_only": True}, {"past_hours": 24}, {"date_from": "2026-01-01"},
+                      {"date_to": "2026-01-01"}, {"updated_since": "2026-01-01"}, {"updated_in_past_hours": 24}):
+        scraper_input = ScraperInput(location=location, listing_type=None, radius=0.5, **unindexed)
+        assert local_comps(index, scraper_input) is None, unindexed
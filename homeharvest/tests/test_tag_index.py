@@ -0,0 +1,28 @@
+import pandas as pd
+
+from homeharvest import TagIndex
+
+
+def test_tag_query_match_types_and_exclude():
+    index = TagIndex()
+    home = index.encode(["Swimming_Pool", "view", "unseen_live_tag"])
+
+    assert index.query(["view", "basement"], match_type="any").matches(home)
+    assert not index.query(["view", "basement"], match_type="all").matches(home)
+    assert index.query(["swimming_pool", "view", "unseen_live_tag"], match_type="exact").matches(home)
+    assert not index.query(["view"], exclude=["swimming_pool"]).matches(home)
+
+
+def test_tag_query_filters_dataframe_like_bitmasks():
+    index = TagIndex(vocabulary=[f"tag_{i}" for i in range(100)])  #: forces two words per row
+    df = pd.DataFrame({"tags": [["tag_1", "tag_99"], ["tag_99"], None, ["TAG_1"], ["tag_1", "new_tag"]]})
+
+    for query in (
+        index.query(["tag_1", "tag_99"], match_type="all"),
+        index.query(["tag_1"], match_type="exact"),
+        index.query(["tag_99", "missing"], exclude=["new_tag"], match_type="any"),
+    ):
+        expected = [query.matches(index.encode(tags)) for tags in df["tags"]]
+        assert list(query.matches_words(index.encode_series(df["tags"]))) == expected
+
+    assert list(index.query(["tag_1"], match_type="exact").filter(df).index) == [3]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from homeharvest import TagStats, discover_tags
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "zip_code": ["85281", "85281", "85004", "85004"],
+            "list_date": ["2025-01-03 10:00:00", "2025-02-11 09:00:00", "2025-01-20 12:00:00", None],
+            "tags": [["swimming_pool", "garage_2_or_more"], ["swimming_pool"], ["view"], None],
+        }
+    )
+
+
+def test_partitioned_counts_and_top_k():
+    stats = TagStats().update(_frame(), location_column="zip_code", period_column="list_date")
+
+    assert stats.total_properties() == 4
+    assert stats.counts(location="85281") == {"swimming_pool": 2, "garage_2_or_more": 1}
+    assert stats.counts(period="2025-01") == {"swimming_pool": 1, "garage_2_or_more": 1, "view": 1}
+    assert stats.top_k(2) == [("swimming_pool", 2), ("garage_2_or_more", 1)]
+
+
+def test_missing_tag_columns_are_counted_as_untagged():
+    untagged = pd.DataFrame({"zip_code": ["85281", "85004"], "tags": [np.nan, np.nan]})
+    stats = TagStats().update(untagged, location_column="zip_code")
+    stats.update(untagged.drop(columns="tags"), location_column="zip_code")
+
+    assert stats.total_properties() == 4
+    assert stats.counts() == {}
+
+
+def test_merge_and_sketch():
+    left = TagStats(sketch_width=256)
+    left.update(_frame().iloc[:2])
+    right = TagStats()
+    right.add_property(["swimming_pool", "view"], location="85004")
+
+    left.merge(right)
+
+    assert left.counts()["swimming_pool"] == 3
+    assert left.total_properties() == 3
+    assert left.estimate("swimming_pool") >= 3
+
+
+def test_discover_tags_reads_accumulator():
+    stats = TagStats().update(_frame())
+
+    assert discover_tags(stats) == discover_tags(_frame())
+    assert discover_tags(stats)["most_common"][0] == ("swimming_pool", 2)
+
+
+def test_pickle_and_json_round_trips(tmp_path):
+    import pickle
+
+    stats = TagStats(sketch_width=256).update(_frame(), location_column="zip_code", period_column="list_date")
+
+    unpickled = pickle.loads(pickle.dumps(stats))
+    unpickled.add_property(["view"], location="85004", period="2025-01")
+    assert unpickled.counts(location="85004") == {"view": 2}
+
+    path = tmp_path / "tag_stats.json"
+    stats.save(path)
+    loaded = TagStats.load(path)
+    assert loaded.counts(period="2025-01") == stats.counts(period="2025-01")
+    assert loaded.total_properties(location="85004") == 2
+    assert loaded.estimate("swimming_pool") == stats.estimate("swimming_pool")
+    assert TagStats.from_dict(TagStats().to_dict()).partitions() == []
@@ -0,0 +1,34 @@
+from difflib import SequenceMatcher
+
+import pytest
+
+from homeharvest import tag_utils
+from homeharvest.tag_utils import FuzzyTagIndex, add_known_tags, fuzzy_match_tag
+
+
+@pytest.fixture
+def fresh_fuzzy_index(monkeypatch):
+    """A pristine global fuzzy index, restored (with an empty match cache) afterwards."""
+    monkeypatch.setattr(tag_utils, "FUZZY_TAG_INDEX", tag_utils._build_fuzzy_index())
+    tag_utils._fuzzy_match_cached.cache_clear()
+    yield tag_utils.FUZZY_TAG_INDEX
+    tag_utils._fuzzy_match_cached.cache_clear()
+
+
+def test_fuzzy_index_matches_full_scan():
+    tags = {"swimming_pool", "spa_or_hot_tub", "garage_1_or_more", "waterfront", "water_view", "view"}
+    index = FuzzyTagIndex(tags)
+
+    for term in ("swiming_pool", "garge", "water", "vew", "zzz"):
+        for threshold in (0.0, 0.5, 0.8):
+            expected = {tag for tag in tags if SequenceMatcher(None, term, tag).ratio() >= threshold}
+            assert {tag for tag, _ in index.search(term, threshold)} == expected
+
+
+def test_fuzzy_match_sees_live_tags(fresh_fuzzy_index):
+    assert not any(tag == "wine_cellar_room" for tag, _ in fuzzy_match_tag("wine celar room", 0.8))
+
+    assert add_known_tags(["Wine_Cellar_Room"]) == 1
+    assert add_known_tags(["wine_cellar_room"]) == 0
+
+    assert fuzzy_match_tag("wine celar room", 0.8)[0][0] == "wine_cellar_room"
@@ -0,0 +1,32 @@
+from homeharvest.core.scrapers.transport import SessionPool
+
+
+def test_session_pool_isolates_proxies():
+    pool = SessionPool()
+
+    direct = pool.get(proxy=None)
+    proxied = pool.get(proxy="http://127.0.0.1:8080")
+
+    assert direct is not proxied
+    assert direct.proxies == {}
+    assert proxied.proxies["https"] == "http://127.0.0.1:8080"
+    assert pool.get(proxy=None) is direct
+
+    pool.clear()
+
+
+def test_session_pool_sizes_connection_pool():
+    pool = SessionPool()
+
+    small = pool.get(pool_size=4)
+    adapter = small.get_adapter("https://www.realtor.com")
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block is True
+
+    #: a smaller request reuses the session, a larger one gets a bigger pool
+    assert pool.get(pool_size=2) is small
+    large = pool.get(pool_size=32)
+    assert large is not small
+    assert large.get_adapter("https://www.realtor.com")._pool_maxsize == 32
+
+    pool.clear()
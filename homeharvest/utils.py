@@ -3,6 +3,7 @@ import pandas as pd
 import warnings
 from datetime import datetime
 from .core.scrapers.models import Property, ListingType, Advertisers
+from .dates import format_datetime
 from .exceptions import InvalidListingType, InvalidDate
 
 ordered_properties = [
@@ -43,6 +44,7 @@ ordered_properties = [
     "estimated_value",
     "tax",
     "tax_history",
+    "property_history",
     "new_construction",
     "lot_sqft",
     "price_per_sqft",
@@ -126,8 +128,14 @@ def process_result(result: Property) -> pd.DataFrame:
     # Convert datetime objects to strings for CSV (preserve full datetime including time)
     for date_field in ["list_date", "pending_date", "last_sold_date", "last_status_change_date"]:
         if prop_data.get(date_field):
-            prop_data[date_field] = prop_data[date_field].strftime("%Y-%m-%d %H:%M:%S") if hasattr(prop_data[date_field], 'strftime') else prop_data[date_field]
+            prop_data[date_field] = format_datetime(prop_data[date_field]) if hasattr(prop_data[date_field], 'strftime') else prop_data[date_field]
     
+    if prop_data.get("property_history"):
+        prop_data["property_history"] = [
+            dict(event, date=format_datetime(event["date"]) if event.get("date") else None)
+            for event in prop_data["property_history"]
+        ]
+
     # Convert HttpUrl objects to strings for CSV
     if prop_data.get("property_url"):
         prop_data["property_url"] = str(prop_data["property_url"])